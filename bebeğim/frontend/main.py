@@ -6,6 +6,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 import os
+import json
 
 # Çevresel değişkenleri yükleyin
 load_dotenv()
@@ -14,6 +15,26 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # API URL'leri
 SEARCH_API_URL = "http://localhost:8000/search"
 CHAT_API_URL = "http://localhost:8000/chat"
+CHAT_STREAM_API_URL = "http://localhost:8000/chat/stream"
+
+
+def iter_sse_events(response):
+    """
+    Parses a Server-Sent Events response into (event, data) pairs.
+    """
+    event, data_lines = "message", []
+    # chunk_size=None: gelen veri 512 baytlık blok dolmasını beklemeden satırlara ayrılır, tokenlar anında gösterilir
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
 
 # Sayfa ayarları
 st.set_page_config(page_title="AI Search ve Chat Arayüzü", layout="wide")
@@ -105,15 +126,32 @@ with tab1:
         if chat_question.strip() == "":
             st.warning("Lütfen bir soru girin.")
         else:
-            with st.spinner("Cevap oluşturuluyor..."):
+            with st.spinner("Belgeler aranıyor..."):
                 try:
-                    # FastAPI backend'ine POST isteği gönder
-                    response = requests.post(CHAT_API_URL, json={"question": chat_question})
+                    # FastAPI backend'ine akış (stream) isteği gönder; cevap geldikçe ekrana yazılır
+                    response = requests.post(CHAT_STREAM_API_URL, json={"question": chat_question}, stream=True)
+                except requests.exceptions.RequestException as e:
+                    response = None
+                    st.error(f"API ile bağlantı kurulurken hata oluştu: {e}")
 
+            if response is not None:
+                try:
                     if response.status_code == 200:
-                        answer = response.json().get("answer", "")
                         st.success("Cevap:")
-                        st.markdown(answer)  # Markdown formatında göster
+                        sources_placeholder = st.empty()
+                        answer_placeholder = st.empty()
+                        answer = ""
+                        for event, data in iter_sse_events(response):
+                            if event == "documents":
+                                sources_placeholder.caption("Kaynaklar: " + ", ".join(
+                                    f"{doc['pdf_name']} - Sayfa {doc['page_number']}" for doc in data
+                                ))
+                            elif event == "token":
+                                answer += data["content"]
+                                answer_placeholder.markdown(answer + "▌")
+                            elif event == "error":
+                                st.error(data.get("detail", "Bilinmeyen hata"))
+                        answer_placeholder.markdown(answer)  # Markdown formatında göster
                         # Geçmişi güncelle
                         if "history" not in st.session_state:
                             st.session_state.history = []
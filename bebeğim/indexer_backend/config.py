@@ -43,6 +43,13 @@ openai.api_version = AZURE_OPENAI_CONFIG['api_version']
 
 encoding = tiktoken.encoding_for_model("gpt-4o")
 
+# Embedding request packing limits
+EMBEDDING_BATCH_CONFIG = {
+    'max_items': int(os.getenv('EMBEDDING_BATCH_MAX_ITEMS', 16)),
+    'max_tokens': int(os.getenv('EMBEDDING_BATCH_MAX_TOKENS', 8000)),
+    'max_item_tokens': 8191
+}
+
 EMAIL_CONFIG = {
     'smtp_server': os.getenv('SMTP_SERVER'),
     'smtp_port': os.getenv('SMTP_PORT'),
@@ -57,6 +64,113 @@ PORT = "8000"
 HOST = "0.0.0.0"
 CONCURRENCY_LIMIT = 50
 
+# Azure OpenAI quotas per deployment, used by the shared RateLimiter
+OPENAI_RATE_LIMITS = {
+    'gpt': {
+        'requests_per_minute': int(os.getenv('GPT_REQUESTS_PER_MINUTE', 300)),
+        'tokens_per_minute': int(os.getenv('GPT_TOKENS_PER_MINUTE', 150000)),
+        'max_concurrency': int(os.getenv('GPT_MAX_CONCURRENCY', 16))
+    },
+    'ada': {
+        'requests_per_minute': int(os.getenv('ADA_REQUESTS_PER_MINUTE', 720)),
+        'tokens_per_minute': int(os.getenv('ADA_TOKENS_PER_MINUTE', 120000)),
+        'max_concurrency': int(os.getenv('ADA_MAX_CONCURRENCY', 8))
+    }
+}
+
+OPENAI_RETRY_CONFIG = {
+    'max_retries': int(os.getenv('OPENAI_MAX_RETRIES', 6)),
+    'base_delay': 1.0,
+    'max_delay': 60.0
+}
+
+# Indexing Pipeline Configuration
+PIPELINE_CONFIG = {
+    # Aynı anda ayrıştırılan PDF sayısı; küçük PDF'lerde süreç havuzunu doldurabilmek için çekirdek sayısı kadar
+    'parse_workers': int(os.getenv('PIPELINE_PARSE_WORKERS', os.cpu_count() or 2)),
+    'extract_processes': int(os.getenv('PIPELINE_EXTRACT_PROCESSES', os.cpu_count() or 1)),
+    'extract_pages_per_task': int(os.getenv('PIPELINE_EXTRACT_PAGES_PER_TASK', 16)),
+    'cleanup_workers': int(os.getenv('PIPELINE_CLEANUP_WORKERS', 8)),
+    'chunk_workers': int(os.getenv('PIPELINE_CHUNK_WORKERS', 1)),
+    'embed_workers': int(os.getenv('PIPELINE_EMBED_WORKERS', 4)),
+    'embed_batch_size': int(os.getenv('PIPELINE_EMBED_BATCH_SIZE', 16)),
+    'upload_workers': int(os.getenv('PIPELINE_UPLOAD_WORKERS', 2)),
+    'queue_size': int(os.getenv('PIPELINE_QUEUE_SIZE', 32))
+}
+
+# Per-stage metrics: summary report written after every run, Prometheus endpoint while running (0: off)
+METRICS_CONFIG = {
+    'report_path': os.getenv('INDEXER_METRICS_REPORT', 'indexer_metrics.json'),
+    'port': int(os.getenv('INDEXER_METRICS_PORT', 0))
+}
+
+# "upload" or "merge_or_upload"; document keys are deterministic so merge_or_upload makes re-indexing idempotent
+INDEXER_UPLOAD_MODE = os.getenv('INDEXER_UPLOAD_MODE', 'merge_or_upload')
+
+# Local manifest of already indexed (pdf_name, page_number) pairs; disabled when empty.
+# It is only reused while it matches the endpoint, index name and document count of the index.
+INDEXED_PAGES_MANIFEST = os.getenv('INDEXED_PAGES_MANIFEST', 'indexed_pages.json')
+
+# Persistent cache for GPT cleanup results and embeddings
+CACHE_CONFIG = {
+    'enabled': os.getenv('INDEXER_CACHE_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('INDEXER_CACHE_PATH', 'indexer_cache.sqlite3'),
+    'max_bytes': int(os.getenv('INDEXER_CACHE_MAX_BYTES', 2 * 1024 ** 3)),
+    'embedding_dtype': os.getenv('INDEXER_CACHE_EMBEDDING_DTYPE', 'float32')  # float32, float16 or int8
+}
+
+# File fingerprints (size, mtime, content hash, page hashes) for incremental indexing
+FINGERPRINT_STORE_PATH = os.getenv('FINGERPRINT_STORE_PATH', 'pdf_fingerprints.json')
+
+# Buffered upload limits for Indexer (Azure Cognitive Search allows 1000 documents / 16 MB per request)
+INDEXER_BATCH_CONFIG = {
+    'max_documents': int(os.getenv('INDEXER_BATCH_MAX_DOCUMENTS', 500)),
+    'max_bytes': int(os.getenv('INDEXER_BATCH_MAX_BYTES', 8 * 1024 * 1024)),
+    'flush_interval': float(os.getenv('INDEXER_FLUSH_INTERVAL', 30)),
+    'max_retries': 3,
+    'retry_backoff': 1.0
+}
+
+# HNSW graph parameters of new indexes (Azure AI Search defaults; m 4-10, efConstruction/efSearch 100-1000)
+HNSW_CONFIG = {
+    'm': int(os.getenv('HNSW_M', 4)),
+    'ef_construction': int(os.getenv('HNSW_EF_CONSTRUCTION', 400)),
+    'ef_search': int(os.getenv('HNSW_EF_SEARCH', 500))
+}
+
+# Vector field of new indexes. Compression ("scalar": int8, "binary": 1 bit per dimension) shrinks the
+# in-memory vector index; with rescore the top candidates are rescored with the full precision vectors.
+# stored=False drops the retrievable copy of the vectors (export_index.py and client-side rerank need it).
+# Existing indexes are moved to new settings with: python -m indexer_backend.migrate_index
+VECTOR_INDEX_CONFIG = {
+    'metric': os.getenv('VECTOR_METRIC', 'cosine'),  # cosine, dotProduct or euclidean
+    'compression': os.getenv('VECTOR_COMPRESSION', 'none'),  # none, scalar or binary
+    'rescore': os.getenv('VECTOR_RESCORE', 'true').lower() == 'true',
+    'oversampling': float(os.getenv('VECTOR_OVERSAMPLING', 4)),
+    'stored': os.getenv('VECTOR_STORED', 'true').lower() == 'true'
+}
+
+# Text analyzer of the searchable fields of new indexes (hybrid keyword search).
+# Analyzers of an existing index cannot be changed; the index has to be recreated.
+SEARCH_ANALYZER = os.getenv('SEARCH_ANALYZER', 'tr.microsoft')
+
+# Sub-page chunking: every cleaned page is indexed as token-bounded, overlapping chunks
+CHUNKING_CONFIG = {
+    'enabled': os.getenv('CHUNKING_ENABLED', 'true').lower() == 'true',
+    'max_tokens': int(os.getenv('CHUNK_MAX_TOKENS', 512)),
+    'overlap_tokens': int(os.getenv('CHUNK_OVERLAP_TOKENS', 64)),
+    'min_tokens': int(os.getenv('CHUNK_MIN_TOKENS', 32))
+}
+
+# Local page cleanup; only pages whose quality score is below the threshold are cleaned with GPT
+LOCAL_CLEANUP_CONFIG = {
+    'enabled': os.getenv('LOCAL_CLEANUP_ENABLED', 'true').lower() == 'true',
+    'quality_threshold': float(os.getenv('LOCAL_CLEANUP_QUALITY_THRESHOLD', 0.85)),
+    'boilerplate_sample_pages': int(os.getenv('LOCAL_CLEANUP_BOILERPLATE_SAMPLE_PAGES', 10)),
+    'boilerplate_edge_lines': 2,
+    'boilerplate_min_share': 0.6
+}
+
 # Logging Configuration
 logger = logging.getLogger('PoC')
 formatter = logging.Formatter('%(asctime)s - %(levelname)s: %(message)s', "%Y-%m-%d %H:%M:%S")
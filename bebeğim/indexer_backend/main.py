@@ -2,10 +2,16 @@
 
 import os
 
+from indexer_backend import config
 from indexer_backend.src.embedder.PDFEmbedder import PDFEmbedder
 from indexer_backend.src.embedder.embedder import Embedder
+from indexer_backend.utils.cache import ContentCache
+from indexer_backend.utils.fingerprints import FingerprintStore
 from indexer_backend.utils.indexer import Indexer
+from indexer_backend.utils.metrics import metrics
 from indexer_backend.utils.openAI import OpenAIClient
+from indexer_backend.utils.pdf_extraction import PDFTextExtractor
+from indexer_backend.utils.rate_limiter import RateLimiter
 from indexer_backend.utils.search import AISearcher
 
 
@@ -13,23 +19,39 @@ def main():
     # PDF'lerin bulunduğu dizini belirtin
     pdf_directory = "/home/baki/Masaüstü/bebeğim/indexer_backend/Bebeğim_pdf"  # PDF dosyalarının bulunduğu dizini buraya girin
 
+    # Uzun çalışmalar sırasında aşama metrikleri Prometheus ile izlenebilir (config.METRICS_CONFIG)
+    if config.METRICS_CONFIG["port"]:
+        metrics.start_http_server()
+
+    # GPT temizleme ve embedding sonuçları için kalıcı önbellek (config.CACHE_CONFIG ile kapatılabilir)
+    cache = ContentCache()
+
     # OpenAIClient ve Embedder örneklerini oluşturuyoruz
-    openai_client = OpenAIClient(engine="gpt-4o")  # GPT-4 motorunu kullanarak metin işleyeceğiz
-    embedder = Embedder()
+    # İstekler dağıtım kotalarına göre sınırlanır, 429 hatalarında geri çekilip yeniden denenir
+    openai_client = OpenAIClient(engine="gpt-4o", cache=cache,
+                                 rate_limiter=RateLimiter.from_config("gpt"))  # GPT-4 motorunu kullanarak metin işleyeceğiz
+    embedder = Embedder(cache=cache, rate_limiter=RateLimiter.from_config("ada"))
 
     # Azure Cognitive Search ile sayfaların indekslenip indekslenmediğini kontrol etmek için AISearcher kullanıyoruz
     ai_searcher = AISearcher()
 
-    # Azure Cognitive Search'e her sayfayı anında indekslemek için Indexer kullanıyoruz
-    indexer = Indexer([])  # Indexer başlatılır (boş listesi sadece başlatmak için)
+    # Azure Cognitive Search'e sayfaları toplu partiler halinde yüklemek için tamponlu Indexer kullanıyoruz
+    # PDF metinleri tüm CPU çekirdeklerinde ayrı süreçlerde çıkarılır
+    text_extractor = PDFTextExtractor(workers=config.PIPELINE_CONFIG["extract_processes"],
+                                      pages_per_task=config.PIPELINE_CONFIG["extract_pages_per_task"])
 
-    # PDFEmbedder sınıfı ile PDF'leri işleyip sayfa sayfa embedding yapacağız ve anında indeksleyeceğiz
-    pdf_embedder = PDFEmbedder(pdf_directory, openai_client, embedder, ai_searcher, indexer)
+    with Indexer([], buffered=True) as indexer, text_extractor:  # Kapanışta tamponda kalan belgeler de yüklenir
+        # PDFEmbedder sınıfı ile PDF'leri işleyip sayfa sayfa embedding yapacağız ve indeksleyeceğiz
+        # Değişmeyen PDF'ler parmak izleri sayesinde ayrıştırılmadan atlanır
+        pdf_embedder = PDFEmbedder(pdf_directory, openai_client, embedder, ai_searcher, indexer,
+                                   fingerprint_store=FingerprintStore(), text_extractor=text_extractor)
 
-    # PDF'lerin sayfa bazında işlenmesi ve her sayfanın anında indekslenmesi
-    pdf_embedder.process_pdf_and_embed_by_page()
+        # PDF'lerin sayfa bazında işlenmesi ve indekslenmesi
+        pdf_embedder.process_pdf_and_embed_by_page()
 
     print("Tüm PDF sayfaları işlendi ve indekslendi!")
+    print(f"Önbellek istatistikleri: {cache.stats()}")
+    cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+# migrate_index.py
+#
+# Mevcut arama indeksini, PDF'leri yeniden işlemeden ve embedding üretmeden yeni vektör ayarlarıyla
+# (sıkıştırma, stored, benzerlik metriği) yeni bir indekse kopyalar.
+# Kullanım: python -m indexer_backend.migrate_index <hedef_indeks> --compression scalar --no-stored --alias pdf-index
+#
+# Azure AI Search'te indeks yeniden adlandırılamaz. Arama servisi bir takma ad (alias) üzerinden
+# sorgulanıyorsa --alias takma adı kopyalama bittikten sonra yeni indekse çevirir. Eski indeks silinmez.
+
+import argparse
+
+from azure.search.documents.indexes.models import SearchAlias
+
+from indexer_backend import config
+from indexer_backend.utils.indexer import Indexer, VECTOR_COMPRESSIONS, VECTOR_METRICS, describe_vector_schema
+
+
+def main():
+    vector_config = config.VECTOR_INDEX_CONFIG
+    parser = argparse.ArgumentParser(description="Copy a search index into a new index with different vector settings.")
+    parser.add_argument("target", help="Name of the new index.")
+    parser.add_argument("--source", default=config.COGNITIVE_SEARCH_CONFIG["index_name"],
+                        help="Index to copy from.")
+    parser.add_argument("--metric", choices=VECTOR_METRICS, default=vector_config["metric"])
+    parser.add_argument("--compression", choices=VECTOR_COMPRESSIONS, default=vector_config["compression"])
+    parser.add_argument("--rescore", action=argparse.BooleanOptionalAction, default=vector_config["rescore"],
+                        help="Rescore compressed search candidates with the full precision vectors.")
+    parser.add_argument("--oversampling", type=float, default=vector_config["oversampling"])
+    parser.add_argument("--stored", action=argparse.BooleanOptionalAction, default=vector_config["stored"],
+                        help="Keep a retrievable copy of the vectors (needed by export_index.py and rerank mode).")
+    parser.add_argument("--alias", help="Alias to point at the new index once the copy is complete.")
+    args = parser.parse_args()
+
+    if args.target == args.source:
+        parser.error("The target index must differ from the source index.")
+
+    indexer = Indexer([], buffered=True, index_name=args.target, vector_config={
+        "metric": args.metric,
+        "compression": args.compression,
+        "rescore": args.rescore,
+        "oversampling": args.oversampling,
+        "stored": args.stored
+    })
+    source_schema = describe_vector_schema(indexer.index_client.get_index(args.source))
+    config.app_logger.info(f"Migrating {args.source} {source_schema} to {args.target} {indexer.vector_config}")
+
+    with indexer:
+        copied = indexer.copy_documents_from(args.source)
+    if indexer.failed_documents:
+        config.app_logger.error(f"{len(indexer.failed_documents)} of {copied} documents could not be copied; "
+                                f"the alias is not changed.")
+        return
+    config.app_logger.info(f"Copied {copied} documents from {args.source} to {args.target}")
+
+    if args.alias:
+        indexer.index_client.create_or_update_alias(SearchAlias(name=args.alias, indexes=[args.target]))
+        config.app_logger.info(f"Alias {args.alias} now points to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 import os
+import threading
+import time
+from collections import Counter
 from indexer_backend import config
 from indexer_backend.src.embedder.embedder import Embedder
+from indexer_backend.utils.chunking import TextChunker
+from indexer_backend.utils.indexer import compute_content_hash, make_document_id
+from indexer_backend.utils.metrics import metrics
+from indexer_backend.utils.pipeline import StagedPipeline
+from indexer_backend.utils.text_cleanup import TextCleaner
 import PyPDF2
 from tqdm import tqdm  # tqdm kütüphanesi ilerleme çubuğu için eklendi
 
@@ -9,10 +17,12 @@ class PDFEmbedder:
     """
     A class to process PDFs, extract content from each page, and generate embeddings page by page.
     It stores each page's embedding and content in a simple dictionary format, and indexes each page
-    after it is processed.
+    after it is processed. With a chunker, every page is indexed as several token-bounded chunks.
     """
 
-    def __init__(self, pdf_directory, openai_client, embedder, ai_searcher, indexer):
+    def __init__(self, pdf_directory, openai_client, embedder, ai_searcher, indexer, pipeline_config=None,
+                 skip_indexed_check=False, manifest_path=None, fingerprint_store=None, text_extractor=None,
+                 chunker=None, text_cleaner=None):
         """
         Initializes the PDFEmbedder with the directory containing PDFs, an instance of OpenAIClient, and an Embedder.
 
@@ -22,22 +32,71 @@ class PDFEmbedder:
             embedder (Embedder): Instance of the Embedder for generating text embeddings.
             ai_searcher (AISearcher): Instance of the AISearcher to check if a page is already indexed.
             indexer (Indexer): Instance of the Indexer to index each processed page.
+            pipeline_config (dict, optional): Worker counts per stage and queue size.
+                Defaults to config.PIPELINE_CONFIG.
+            skip_indexed_check (bool, optional): If True, pages are not probed in the search index before
+                processing. Document keys are deterministic, so with a merge_or_upload Indexer re-processed
+                pages overwrite themselves instead of creating duplicates. Defaults to False.
+            manifest_path (str, optional): Local manifest of indexed pages reused across runs.
+                Defaults to config.INDEXED_PAGES_MANIFEST.
+            fingerprint_store (FingerprintStore, optional): Enables incremental indexing. Unchanged PDFs are
+                skipped without parsing, only changed pages are re-processed and deleted PDFs are removed
+                from the index. Defaults to None (every PDF is processed).
+            text_extractor (PDFTextExtractor, optional): Process pool used to extract page text on all CPU
+                cores. Defaults to None (text is extracted on the parse threads).
+            chunker (TextChunker, optional): Splits every cleaned page into overlapping chunks that are embedded
+                and indexed as separate documents. Defaults to a TextChunker if config.CHUNKING_CONFIG["enabled"],
+                otherwise every page is indexed as one document.
+            text_cleaner (TextCleaner, optional): Cleans pages locally and sends only pages whose quality score
+                is below the threshold to GPT. Defaults to a TextCleaner if config.LOCAL_CLEANUP_CONFIG["enabled"],
+                otherwise every page is cleaned with GPT.
         """
         self.pdf_directory = pdf_directory
         self.openai_client = openai_client
         self.embedder = embedder
         self.ai_searcher = ai_searcher
         self.indexer = indexer
+        self.pipeline_config = {**config.PIPELINE_CONFIG, **(pipeline_config or {})}
+        self.skip_indexed_check = skip_indexed_check
+        self.manifest_path = manifest_path if manifest_path is not None else config.INDEXED_PAGES_MANIFEST
+        self.fingerprint_store = fingerprint_store
+        self.text_extractor = text_extractor
+        if chunker is None and config.CHUNKING_CONFIG["enabled"]:
+            chunker = TextChunker()
+        self.chunker = chunker
+        if text_cleaner is None and config.LOCAL_CLEANUP_CONFIG["enabled"]:
+            text_cleaner = TextCleaner()
+        self.text_cleaner = text_cleaner
+        self.cleanup_counts = Counter()
+        self.indexed_pages = None
+        self._indexed_pages_lock = threading.Lock()
+        self._pending_fingerprints = {}
+        self._failed_pdfs = set()
+        self._failed_pages = set()
+        self._pending_chunks = {}
+        self._state_lock = threading.Lock()
 
-    def get_total_page_count(self):
+    def list_pdf_files(self):
         """
-        Computes the total number of pages across all PDFs in the directory.
+        Lists the PDF files in the directory.
+
+        Returns:
+            list: The PDF file names.
+        """
+        return [pdf_file for pdf_file in os.listdir(self.pdf_directory) if pdf_file.endswith('.pdf')]
+
+    def get_total_page_count(self, pdf_files=None):
+        """
+        Computes the total number of pages across the given PDFs.
+
+        Args:
+            pdf_files (list, optional): The PDF file names to count. Defaults to every PDF in the directory.
 
         Returns:
             int: Total number of pages.
         """
         total_pages = 0
-        for pdf_file in os.listdir(self.pdf_directory):
+        for pdf_file in (pdf_files if pdf_files is not None else self.list_pdf_files()):
             if pdf_file.endswith('.pdf'):
                 pdf_path = os.path.join(self.pdf_directory, pdf_file)
                 try:
@@ -52,6 +111,9 @@ class PDFEmbedder:
         """
         Checks if the given page of a PDF is already indexed in Azure Cognitive Search.
 
+        Uses the in-memory set loaded by load_indexed_pages when available, and falls back to
+        a search query per page otherwise.
+
         Args:
             pdf_name (str): The name of the PDF file.
             page_number (int): The page number to check.
@@ -59,70 +121,392 @@ class PDFEmbedder:
         Returns:
             bool: True if the page is already indexed, False otherwise.
         """
+        if self.indexed_pages is not None:
+            return (pdf_name, page_number) in self.indexed_pages
+
         # Azure Cognitive Search'te o PDF sayfasının zaten indekslenip indekslenmediğini kontrol et
         return self.ai_searcher.is_page_indexed(pdf_name, page_number)
 
+    def load_indexed_pages(self):
+        """
+        Loads the set of already indexed pages with one bulk lookup (or from the local manifest).
+        """
+        self.indexed_pages = self.ai_searcher.get_indexed_pages(manifest_path=self.manifest_path or None)
+
+    def save_indexed_pages(self):
+        """
+        Persists the indexed pages, including the ones uploaded in this run, to the local manifest.
+        """
+        if not self.manifest_path or self.indexed_pages is None:
+            return
+
+        # Yüklenemeyen belgeler (ya da bir parçası işlenemeyen sayfalar) bir sonraki çalıştırmada tekrar denensin
+        for document in getattr(self.indexer, "failed_documents", []):
+            self.indexed_pages.discard((document["pdf_name"], document["page_number"]))
+        self.indexed_pages -= self._failed_pages
+        self.ai_searcher.save_manifest(self.indexed_pages, self.manifest_path)
+
     def process_pdf_and_embed_by_page(self):
         """
         Processes all PDFs in the directory, extracts and cleans the content of each page,
         checks if it's already indexed, generates embeddings, and indexes the page immediately.
 
+        The work runs as a staged pipeline (parse -> cleanup -> chunking -> embedding -> upload) where every
+        stage has its own worker pool and the stages are connected with bounded queues, so network
+        waits overlap while memory usage stays flat. At the end the per-stage metrics are written as a
+        summary report (see PipelineMetrics.write_report).
+        """
+        metrics.reset()
+        if not self.skip_indexed_check:
+            self.load_indexed_pages()  # İndekslenmiş sayfalar tek seferde alınır
+
+        pdf_files = self.list_pdf_files()
+        if self.fingerprint_store is not None:
+            self.remove_deleted_pdfs(pdf_files)
+            pdf_files = self.get_changed_pdf_files(pdf_files)
+
+        # tqdm ilerleme çubuğu başlatılıyor; toplam sayfa sayısı her PDF açıldıkça artırılır
+        self._progress_bar = tqdm(total=0, desc="Processing PDFs", unit="page")
+        self._progress_lock = threading.Lock()
+
+        pipeline = StagedPipeline(queue_size=self.pipeline_config['queue_size'])
+        pipeline.add_stage("parse", self._parse_stage, self.pipeline_config['parse_workers'])
+        pipeline.add_stage("cleanup", self._cleanup_stage, self.pipeline_config['cleanup_workers'])
+        pipeline.add_stage("chunk", self._chunk_stage, self.pipeline_config['chunk_workers'])
+        pipeline.add_stage("embed", self._embed_stage, self.pipeline_config['embed_workers'],
+                           batch_size=self.pipeline_config['embed_batch_size'])
+        pipeline.add_stage("upload", self._upload_stage, self.pipeline_config['upload_workers'])
+
+        try:
+            pipeline.run(pdf_files)
+        finally:
+            self._progress_bar.close()  # İlerleme çubuğunu kapat
+
+        if getattr(self.indexer, "buffered", False):
+            self.indexer.flush()  # Manifest yazılmadan önce tampondaki belgeler yüklenir
+        for document in getattr(self.indexer, "failed_documents", []):
+            self._failed_pdfs.add(document["pdf_name"])
+        self.save_indexed_pages()
+        self.save_fingerprints()
+        config.app_logger.info(
+            f"Pages cleaned locally: {self.cleanup_counts['local']}, with GPT: {self.cleanup_counts['gpt']}"
+        )
+        # Yerel ve GPT temizliği aynı iş parçacıklarında çalıştığından meşguliyet havuz başına hesaplanır
+        metrics.write_report(workers={
+            "parse": (self.pipeline_config['parse_workers'], ["pdf_parse"]),
+            "cleanup": (self.pipeline_config['cleanup_workers'], ["local_cleanup", "gpt_rate_limit", "gpt_cleanup"]),
+            "chunk": (self.pipeline_config['chunk_workers'], ["chunking"]),
+            "embed": (self.pipeline_config['embed_workers'], ["ada_rate_limit", "embedding"]),
+            "upload": (self.pipeline_config['upload_workers'], ["upload"])
+        })
+
+    def get_changed_pdf_files(self, pdf_files):
+        """
+        Filters out the PDFs whose fingerprint shows they are unchanged since the last run.
+
+        Args:
+            pdf_files (list): The PDF file names in the directory.
+
         Returns:
-            list: A list of dictionaries where each dictionary contains pdf_name, page_number, content, and embedding.
+            list: The PDF file names that are new or modified.
         """
-        total_pages = self.get_total_page_count()  # Toplam sayfa sayısını hesapla
+        changed_files = []
+        for pdf_file in pdf_files:
+            pdf_path = os.path.join(self.pdf_directory, pdf_file)
+            try:
+                if self.fingerprint_store.is_unchanged(pdf_file, pdf_path):
+                    continue
+            except OSError as e:
+                config.app_logger.error(f"Error checking fingerprint of {pdf_file}: {str(e)}")
+            changed_files.append(pdf_file)
+        return changed_files
 
-        # tqdm ilerleme çubuğu başlatılıyor
-        progress_bar = tqdm(total=total_pages, desc="Processing PDFs", unit="page")
+    def remove_deleted_pdfs(self, pdf_files):
+        """
+        Removes the pages of PDFs that no longer exist in the directory from the search index.
 
-        for pdf_file in os.listdir(self.pdf_directory):
-            if pdf_file.endswith('.pdf'):
-                pdf_path = os.path.join(self.pdf_directory, pdf_file)
-                raw_text_by_page = self.extract_text_by_page(pdf_path)
-
-                # Her sayfa için işlem yapılıyor
-                for page_number, raw_text in raw_text_by_page.items():
-                    if raw_text:
-                        # Sayfa zaten indekslenmişse atla
-                        if self.is_page_already_indexed(pdf_file, page_number):
-                            progress_bar.update(1)  # İlerleme çubuğunu güncelle
-                            continue
-
-                        # Sayfa indekslenmemişse işlem yap
-                        cleaned_text = self.openai_client.extract_text_using_gpt(raw_text)
-                        embedding = self.embedder.embed_text(cleaned_text)
-
-                        if embedding:
-                            # Sayfayı indeksle
-                            document = {
-                                "pdf_name": pdf_file,
-                                "page_number": page_number,
-                                "content": cleaned_text,
-                                "embedding": embedding
-                            }
-                            self.indexer.ingest_document(document)  # Her sayfayı direkt indeksle
-
-                    # İlerleme çubuğunda bir sayfa işlemi tamamlandığında ilerleme kaydediliyor
-                    progress_bar.update(1)
-
-        progress_bar.close()  # İlerleme çubuğunu kapat
+        Args:
+            pdf_files (list): The PDF file names currently in the directory.
+        """
+        existing_files = set(pdf_files)
+        for pdf_name in self.fingerprint_store.pdf_names():
+            if pdf_name in existing_files:
+                continue
+            if self.indexer.delete_stale_pages(pdf_name):
+                self.fingerprint_store.remove(pdf_name)
+                if self.indexed_pages is not None:
+                    self.indexed_pages = {page for page in self.indexed_pages if page[0] != pdf_name}
 
-    def extract_text_by_page(self, pdf_path):
+    def save_fingerprints(self):
         """
-        Extracts raw text from each page of a PDF file using PyPDF2.
+        Stores the fingerprints of the PDFs processed in this run.
+
+        PDFs with a page that failed to clean, embed or upload keep their previous fingerprint,
+        so they are processed again on the next run.
+        """
+        if self.fingerprint_store is None:
+            return
+
+        for pdf_name, fingerprint in self._pending_fingerprints.items():
+            if pdf_name not in self._failed_pdfs:
+                self.fingerprint_store.update(pdf_name, fingerprint)
+        self._pending_fingerprints = {}
+        self.fingerprint_store.save()
+
+    def _mark_failed(self, page):
+        """
+        Records that a page of a PDF could not be indexed in this run.
+        """
+        with self._state_lock:
+            self._failed_pdfs.add(page["pdf_name"])
+            if "page_number" in page:
+                self._failed_pages.add((page["pdf_name"], page["page_number"]))
+
+    def _add_to_total(self, page_count):
+        """
+        Increases the progress bar total when a PDF is opened, so PDFs are never parsed just to be counted.
+        """
+        with self._progress_lock:
+            self._progress_bar.total += page_count
+            self._progress_bar.refresh()
+
+    def _advance_progress(self, count=1):
+        """
+        Advances the shared progress bar from any worker thread.
+        """
+        with self._progress_lock:
+            self._progress_bar.update(count)
+
+    def _finish_chunk(self, chunk):
+        """
+        Records that a chunk left the pipeline; the progress bar advances once all chunks of its page are done.
+        """
+        key = (chunk["pdf_name"], chunk["page_number"])
+        with self._progress_lock:
+            self._pending_chunks[key] -= 1
+            if self._pending_chunks[key]:
+                return
+            del self._pending_chunks[key]
+            self._progress_bar.update(1)
+
+    def _parse_stage(self, pdf_file, emit):
+        """
+        Pipeline stage: extracts the raw text of every page of a PDF and emits one item per page.
+        """
+        pdf_path = os.path.join(self.pdf_directory, pdf_file)
+
+        previous = self.fingerprint_store.get(pdf_file) if self.fingerprint_store is not None else None
+        previous_hashes = previous["page_hashes"] if previous else None
+
+        page_counts = []
+
+        def on_open(page_count):
+            page_counts.append(page_count)
+            self._add_to_total(page_count)
+
+        # Üst ve alt bilgi satırları ilk sayfalardan öğrenilir; o ana kadar okunan sayfalar bekletilir
+        boilerplate = None if self.text_cleaner is not None else frozenset()
+        sample_texts, held_pages = [], []
+
+        page_hashes = {}
+        # Sayfa çıkarma süresi ölçülür; sonraki aşamaların kuyruğunu beklemek hariç tutulur
+        read_start = time.perf_counter()
+        for _, page_number, raw_text in self.iter_pages(pdf_path, on_open=on_open):
+            metrics.observe("pdf_parse", time.perf_counter() - read_start)
+            content_hash = compute_content_hash(raw_text)  # Belge anahtarı ham metinden türetilir
+            page_hashes[page_number] = content_hash
+            if boilerplate is None:
+                sample_texts.append(raw_text)
+
+            # Değişmemiş sayfalar ve boş sayfalar yeniden işlenmez
+            if not raw_text or (previous_hashes is not None and previous_hashes.get(str(page_number)) == content_hash):
+                self._advance_progress()
+            else:
+                held_pages.append({
+                    "pdf_name": pdf_file,
+                    "page_number": page_number,
+                    "raw_text": raw_text,
+                    "content_hash": content_hash,
+                    "changed": previous_hashes is not None
+                })
+
+            if boilerplate is None and len(sample_texts) >= config.LOCAL_CLEANUP_CONFIG["boilerplate_sample_pages"]:
+                boilerplate = self.text_cleaner.detect_boilerplate(sample_texts)
+                sample_texts = []
+            if boilerplate is not None:
+                for page in held_pages:
+                    emit({**page, "boilerplate": boilerplate})
+                held_pages = []
+            read_start = time.perf_counter()
+
+        if held_pages:
+            boilerplate = self.text_cleaner.detect_boilerplate(sample_texts)
+            for page in held_pages:
+                emit({**page, "boilerplate": boilerplate})
+
+        if self.fingerprint_store is None or not page_hashes:
+            return
+        if len(page_hashes) != sum(page_counts):
+            # PDF yarım okunduysa eksik sayfalar silinmiş sayılmasın, bir dahaki çalıştırmada yeniden denensin
+            self._mark_failed({"pdf_name": pdf_file})
+            return
+
+        if previous_hashes is not None:
+            # Değişen ya da artık var olmayan sayfaların eski belgeleri indeksten silinir
+            stale_pages = [int(page_number) for page_number, page_hash in previous_hashes.items()
+                           if page_hashes.get(int(page_number)) != page_hash]
+            keep_ids = [make_document_id(pdf_file, page_number, page_hashes[page_number])
+                        for page_number in stale_pages if page_number in page_hashes]
+            if stale_pages and not self.indexer.delete_stale_pages(pdf_file, stale_pages, keep_ids):
+                self._mark_failed({"pdf_name": pdf_file})
+
+        fingerprint = self.fingerprint_store.build(pdf_path, page_hashes)
+        with self._state_lock:
+            self._pending_fingerprints[pdf_file] = fingerprint
+
+    def _cleanup_stage(self, page, emit):
+        """
+        Pipeline stage: skips already indexed pages and cleans the remaining ones, locally when the
+        text cleaner rates the result good enough and with GPT otherwise.
+        """
+        try:
+            # Sayfa zaten indekslenmişse atla (içeriği değişmiş sayfalar hariç)
+            if (not self.skip_indexed_check and not page.get("changed")
+                    and self.is_page_already_indexed(page["pdf_name"], page["page_number"])):
+                self._advance_progress()
+                return
+
+            raw_text = page.pop("raw_text")
+            boilerplate = page.pop("boilerplate", frozenset())
+            if not raw_text.strip():
+                self._advance_progress()
+                return
+
+            text = raw_text
+            cleanup = "gpt"
+            if self.text_cleaner is not None:
+                with metrics.time("local_cleanup"):
+                    text = self.text_cleaner.clean(raw_text, boilerplate)
+                    if text and not self.text_cleaner.needs_gpt(text):
+                        cleanup = "local"
+                if not text:
+                    # Yerel temizlik sayfanın tüm metnini sildiyse içerik kaybolmasın, ham metin GPT'ye gönderilir
+                    text = raw_text
+
+            if cleanup == "local":
+                page["content"] = text
+            else:
+                page["content"] = self.openai_client.extract_text_using_gpt(text)
+            with self._state_lock:
+                self.cleanup_counts[cleanup] += 1
+        except Exception:
+            self._mark_failed(page)
+            self._advance_progress()
+            raise
+
+        if not page["content"]:
+            # Temizleme başarısız oldu; sayfa hatalı içerikle indekslenmez, bir sonraki çalıştırmada yeniden denenir
+            self._mark_failed(page)
+            self._advance_progress()
+            return
+        emit(page)
+
+    def _chunk_stage(self, page, emit):
+        """
+        Pipeline stage: splits a cleaned page into chunks, or passes it on whole without a chunker.
+        """
+        chunks = []
+        if self.chunker is not None:
+            try:
+                with metrics.time("chunking"):
+                    chunks = self.chunker.split(page["content"])
+            except Exception:
+                self._mark_failed(page)
+                self._advance_progress()
+                raise
+        if not chunks:
+            chunks = [{"chunk_index": None, "content": page["content"], "chunk_start": None, "chunk_end": None}]
+
+        with self._progress_lock:
+            self._pending_chunks[(page["pdf_name"], page["page_number"])] = len(chunks)
+        for chunk in chunks:
+            emit({**page, **chunk})
+
+    def _embed_stage(self, pages, emit):
+        """
+        Pipeline stage: generates the embeddings of a batch of cleaned pages (or chunks) with a single request.
+        """
+        try:
+            embeddings = self.embedder.embed_batch([page["content"] for page in pages])
+        except Exception:
+            for page in pages:
+                self._mark_failed(page)
+                self._finish_chunk(page)
+            raise
+
+        for page, embedding in zip(pages, embeddings):
+            if embedding is None:
+                self._mark_failed(page)
+                self._finish_chunk(page)
+                continue
+            page["embedding"] = embedding
+            emit(page)
+
+    def _upload_stage(self, page, emit):
+        """
+        Pipeline stage: indexes the page in Azure Cognitive Search.
+        """
+        try:
+            self.indexer.ingest_document(page)  # Her sayfayı direkt indeksle
+            if self.indexed_pages is not None:
+                with self._indexed_pages_lock:
+                    self.indexed_pages.add((page["pdf_name"], page["page_number"]))
+        except Exception:
+            self._mark_failed(page)
+            raise
+        finally:
+            # İlerleme çubuğunda bir sayfanın tüm parçaları tamamlandığında ilerleme kaydediliyor
+            self._finish_chunk(page)
+
+    def iter_pages(self, pdf_path, on_open=None):
+        """
+        Lazily yields the raw text of each page of a PDF file using PyPDF2.
+
+        The PDF is opened once and each page's text is extracted only when it is requested, so at most
+        one page of text is held in memory at a time. If a text_extractor is configured, the pages are
+        extracted in its worker processes and streamed back in page order instead.
 
         Args:
             pdf_path (str): Path to the PDF file.
+            on_open (callable, optional): Called with the page count as soon as the PDF is opened.
 
-        Returns:
-            dict: A dictionary where keys are page numbers and values are the extracted raw text from that page.
+        Yields:
+            tuple: (pdf_name, page_number, text) with page numbers starting from 1.
         """
+        pdf_name = os.path.basename(pdf_path)
         try:
+            if self.text_extractor is not None:
+                yield from self.text_extractor.iter_pages(pdf_path, on_open=on_open)
+                return
+
             with open(pdf_path, 'rb') as pdf_file:
                 reader = PyPDF2.PdfReader(pdf_file)
-                text_by_page = {}
-                for page_num in range(len(reader.pages)):
-                    text_by_page[page_num + 1] = reader.pages[page_num].extract_text()  # Sayfa numarası 1'den başlıyor
-                return text_by_page
+                page_count = len(reader.pages)
+                if on_open is not None:
+                    on_open(page_count)
+                for page_num in range(page_count):
+                    yield pdf_name, page_num + 1, reader.pages[page_num].extract_text()  # Sayfa numarası 1'den başlıyor
         except Exception as e:
-            return {}
+            config.app_logger.error(f"Error reading {pdf_path}: {str(e)}")
+
+    def extract_text_by_page(self, pdf_path):
+        """
+        Extracts raw text from each page of a PDF file using PyPDF2.
+
+        Args:
+            pdf_path (str): Path to the PDF file.
+
+        Returns:
+            dict: A dictionary where keys are page numbers and values are the extracted raw text from that page.
+        """
+        return {page_number: text for _, page_number, text in self.iter_pages(pdf_path)}
@@ -1,10 +1,20 @@
 import openai
 
 import config
+from indexer_backend.utils.metrics import metrics
+from indexer_backend.utils.vectors import to_vector
 
 
 class Embedder:
-    def __init__(self):
+    def __init__(self, cache=None, rate_limiter=None):
+        """
+        Args:
+            cache (ContentCache, optional): Persistent cache for embedding vectors. Defaults to None (no caching).
+            rate_limiter (RateLimiter, optional): Shared rate limiter and retry policy for the embedding
+                deployment. Defaults to None (requests are sent directly).
+        """
+        self.cache = cache
+        self.rate_limiter = rate_limiter
         self._configure_openai()
 
     def _configure_openai(self):
@@ -16,26 +26,142 @@ class Embedder:
         openai.api_base = config.ADA_CONFIG["api_base"]
         openai.api_version = config.ADA_CONFIG["api_version"]
 
-    def embed_text(self, text):
+    def embed_text(self, text, lookup_cache=True):
         """
         Generates an embedding for the input text using the OpenAI API.
 
         Args:
             text (str): The text to be embedded.
+            lookup_cache (bool, optional): Whether to look the text up in the cache first. The new
+                embedding is cached either way. Defaults to True.
 
         Returns:
-            list: The embedding vector.
+            numpy.ndarray: The float32 embedding vector.
         """
+        cache_key = self._cache_key(text)
+        if cache_key is not None and lookup_cache:
+            cached_embedding = self.cache.get_embedding(cache_key)
+            metrics.count_cache("embedding", cached_embedding is not None)
+            if cached_embedding is not None:
+                return cached_embedding
         try:
-            response = openai.Embedding.create(
-                input=text,
-                engine=config.ADA_CONFIG["deployment_name"],
-            )
-            return response['data'][0]['embedding']
+            response = self._create_embedding(text)
+            embedding = to_vector(response['data'][0]['embedding'])
+            if cache_key is not None:
+                self.cache.set_embedding(cache_key, embedding)
+            return embedding
         except openai.error.APIConnectionError as e:
             config.app_logger.error(f"Failed to connect to OpenAI API: {e}")
         except openai.error.APIError as e:
             config.app_logger.error(f"OpenAI API returned an error: {e}")
         except openai.error.RateLimitError as e:
             config.app_logger.error(f"OpenAI API rate limit exceeded: {e}")
-        return None
\ No newline at end of file
+        except openai.error.OpenAIError as e:
+            config.app_logger.error(f"OpenAI API request failed: {e}")
+        return None
+
+    def embed_batch(self, texts):
+        """
+        Generates embeddings for a list of texts with as few API requests as possible.
+
+        The texts are packed into requests using the configured tiktoken encoding so that every
+        request stays under the per-request token and item limits in config.EMBEDDING_BATCH_CONFIG.
+        If a packed request fails, its texts are retried one by one so that a single bad input
+        does not drop the whole batch.
+
+        Args:
+            texts (list): The texts to be embedded.
+
+        Returns:
+            list: The float32 embedding vectors in input order. Items that could not be embedded are None.
+        """
+        embeddings = [None] * len(texts)
+
+        # Önbellekte bulunan metinler API'ye gönderilmez
+        pending = []
+        for i, text in enumerate(texts):
+            cache_key = self._cache_key(text)
+            if cache_key is not None:
+                embeddings[i] = self.cache.get_embedding(cache_key)
+                metrics.count_cache("embedding", embeddings[i] is not None)
+            if embeddings[i] is None:
+                pending.append(i)
+
+        for packed in self._pack_batches([texts[i] for i in pending]):
+            batch = [pending[j] for j in packed]
+            batch_texts = [texts[i] for i in batch]
+            try:
+                response = self._create_embedding(batch_texts)
+                for item in response['data']:
+                    index = batch[item['index']]
+                    embeddings[index] = to_vector(item['embedding'])
+                    cache_key = self._cache_key(texts[index])
+                    if cache_key is not None:
+                        self.cache.set_embedding(cache_key, embeddings[index])
+            except openai.error.OpenAIError as e:
+                config.app_logger.error(f"Batch embedding request failed, retrying items individually: {e}")
+                for i in batch:
+                    # Önbellek yukarıda zaten sorgulandı; yeniden sorgulamak ıskaları iki kez sayardı
+                    embeddings[i] = self.embed_text(texts[i], lookup_cache=False)
+        return embeddings
+
+    def _create_embedding(self, text_input):
+        """
+        Sends an embedding request, through the rate limiter if one is configured. Only the API
+        request is timed as the embedding stage.
+
+        Args:
+            text_input (str or list): A single text or a list of texts.
+
+        Returns:
+            dict: The API response.
+        """
+        kwargs = {"input": text_input, "engine": config.ADA_CONFIG["deployment_name"]}
+        texts = [text_input] if isinstance(text_input, str) else text_input
+        # Yalnızca API isteği ölçülür; hız sınırlayıcının beklemesi kendi aşaması olarak kaydedilir
+        create = metrics.timed("embedding", openai.Embedding.create, items=len(texts))
+        if self.rate_limiter is None:
+            response = create(**kwargs)
+        else:
+            response = self.rate_limiter.call(create, self.rate_limiter.count_tokens(*texts), **kwargs)
+        metrics.count_usage("embedding", response)
+        return response
+
+    def _cache_key(self, text):
+        """
+        Returns the cache key of a text for the configured deployment, or None if caching is off.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.make_key(config.ADA_CONFIG["deployment_name"], "", text)
+
+    def _pack_batches(self, texts):
+        """
+        Groups text indices into requests that respect the configured token and item limits.
+
+        Args:
+            texts (list): The texts to be packed.
+
+        Returns:
+            list: A list of batches, each a list of indices into texts.
+        """
+        max_items = config.EMBEDDING_BATCH_CONFIG["max_items"]
+        max_tokens = config.EMBEDDING_BATCH_CONFIG["max_tokens"]
+        max_item_tokens = config.EMBEDDING_BATCH_CONFIG["max_item_tokens"]
+
+        batches = []
+        current, current_tokens = [], 0
+        for i, text in enumerate(texts):
+            token_count = len(config.encoding.encode(text or ""))
+            if not text or token_count > max_item_tokens:
+                # Boş ya da model sınırını aşan metinler gönderilmez, sonuçları None kalır
+                config.app_logger.error(f"Skipping text at index {i}: {token_count} tokens is not embeddable.")
+                continue
+            if current and (len(current) >= max_items or current_tokens + token_count > max_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += token_count
+        if current:
+            batches.append(current)
+        return batches
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import tiktoken
+
+# Testler Azure ve OpenAI'a bağlanmaz; config yalnızca zorunlu değişkenlerin varlığını bekler
+for name in ("COGNITIVE_SEARCH_API_KEY", "COGNITIVE_SEARCH_ENDPOINT", "COGNITIVE_SEARCH_INDEX_NAME",
+             "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_API_BASE", "ADA_API_VERSION", "ADA_MODEL", "ADA_DEPLOYMENT_NAME"):
+    os.environ.setdefault(name, "https://example.invalid" if name.endswith(("ENDPOINT", "BASE")) else "test")
+
+# config modeli kodlamasını indirir; testler ağsız çalışsın diye her baytı bir jeton sayan yerel bir kodlama kullanılır
+BYTE_ENCODING = tiktoken.Encoding(
+    name="test_bytes",
+    pat_str=r"\S+|\s+",
+    mergeable_ranks={bytes([value]): value for value in range(256)},
+    special_tokens={}
+)
+tiktoken.encoding_for_model = lambda model_name: BYTE_ENCODING
+
+# Modüller hem "indexer_backend.config" hem de (embedder, openAI) doğrudan "config" olarak içe aktarılır
+INDEXER_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(INDEXER_DIRECTORY))
+sys.path.insert(0, INDEXER_DIRECTORY)
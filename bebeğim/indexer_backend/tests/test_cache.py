@@ -0,0 +1,110 @@
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from indexer_backend import config
+from indexer_backend.utils import cache as cache_module
+from indexer_backend.utils.cache import ContentCache
+
+
+@pytest.fixture(autouse=True)
+def ordered_clock(monkeypatch):
+    # Aynı anda yapılan erişimler de kesin bir sırayla kaydedilsin
+    ticks = itertools.count(1)
+
+    class Clock:
+        @staticmethod
+        def time():
+            return float(next(ticks))
+
+    monkeypatch.setattr(cache_module, "time", Clock)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        content_cache = ContentCache(path=str(tmp_path / "cache.sqlite3"), **kwargs)
+        caches.append(content_cache)
+        return content_cache
+
+    yield make
+    for content_cache in caches:
+        content_cache.close()
+
+
+def test_texts_and_embeddings_round_trip(make_cache):
+    content_cache = make_cache(max_bytes=10 ** 6, enabled=True)
+    key = ContentCache.make_key("gpt-4o", "Temizle", "ham metin")
+    vector = np.linspace(-1, 1, config.EMBEDDING_DIMENSION, dtype=np.float32)
+
+    assert content_cache.get_text(key) is None
+    content_cache.set_text(key, "temiz metin")
+    content_cache.set_embedding("vector", vector)
+
+    assert content_cache.get_text(key) == "temiz metin"
+    np.testing.assert_array_equal(content_cache.get_embedding("vector"), vector)
+    assert content_cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+
+def test_int8_embeddings_are_stored_in_a_quarter_of_the_size(make_cache):
+    content_cache = make_cache(max_bytes=10 ** 6, enabled=True, embedding_dtype="int8")
+    vector = np.linspace(-1, 1, config.EMBEDDING_DIMENSION, dtype=np.float32)
+    content_cache.set_embedding("vector", vector)
+
+    np.testing.assert_allclose(content_cache.get_embedding("vector"), vector, atol=1 / 127)
+    assert content_cache._total_size == config.EMBEDDING_DIMENSION + 4
+
+
+def test_keys_depend_on_model_prompt_and_text():
+    key = ContentCache.make_key("gpt-4o", "Temizle", "metin")
+
+    assert key == ContentCache.make_key("gpt-4o", "Temizle", "metin")
+    assert len({key, ContentCache.make_key("ada", "Temizle", "metin"),
+                ContentCache.make_key("gpt-4o", "Özetle", "metin"),
+                ContentCache.make_key("gpt-4o", "Temizlemetin", "")}) == 4
+
+
+def test_least_recently_used_entries_are_evicted(make_cache):
+    content_cache = make_cache(max_bytes=30, enabled=True)
+    for key in ("a", "b", "c"):
+        content_cache.set_text(key, "x" * 10)
+    assert content_cache.get_text("a") == "x" * 10  # "a" en son kullanılan olur
+
+    content_cache.set_text("d", "y" * 10)
+
+    assert content_cache.get_text("b") is None
+    assert [content_cache.get_text(key) for key in ("a", "c", "d")] == ["x" * 10, "x" * 10, "y" * 10]
+    assert content_cache._total_size == 30
+
+
+def test_replacing_an_entry_does_not_count_its_old_size(make_cache):
+    content_cache = make_cache(max_bytes=30, enabled=True)
+    content_cache.set_text("a", "x" * 10)
+    content_cache.set_text("b", "x" * 10)
+    content_cache.set_text("a", "z" * 20)
+
+    assert content_cache._total_size == 30
+    assert content_cache.get_text("b") == "x" * 10
+
+
+def test_size_is_restored_when_the_cache_is_reopened(make_cache):
+    content_cache = make_cache(max_bytes=100, enabled=True)
+    content_cache.set_text("a", "x" * 40)
+    content_cache.close()
+
+    reopened = make_cache(max_bytes=50, enabled=True)
+    reopened.set_text("b", "y" * 20)
+
+    assert reopened.get_text("a") is None and reopened.get_text("b") == "y" * 20
+
+
+def test_disabled_cache_misses_and_creates_no_file(make_cache, tmp_path):
+    content_cache = make_cache(max_bytes=100, enabled=False)
+    content_cache.set_text("a", "metin")
+
+    assert content_cache.get_text("a") is None
+    assert not os.path.exists(tmp_path / "cache.sqlite3")
@@ -0,0 +1,91 @@
+import pytest
+
+from indexer_backend.utils.chunking import TextChunker
+
+# Test kodlamasında her bayt bir jetondur, yani jeton sayısı ASCII metnin uzunluğudur
+SENTENCES = " ".join(f"Cumle {index:02d} burada biter." for index in range(12))
+
+
+def assert_valid_chunks(chunker, text, chunks):
+    assert [chunk["chunk_index"] for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert chunk["content"] == text[chunk["chunk_start"]:chunk["chunk_end"]]
+        assert chunker.count_tokens(chunk["content"]) <= chunker.max_tokens
+    assert chunks[0]["chunk_start"] == 0 and chunks[-1]["chunk_end"] == len(text.rstrip())
+
+
+def test_empty_text_has_no_chunks():
+    assert TextChunker(50, 10, 5).split("  \n\n ") == []
+
+
+def test_overlap_must_be_smaller_than_the_chunk():
+    with pytest.raises(ValueError):
+        TextChunker(max_tokens=20, overlap_tokens=20, min_tokens=0)
+
+
+def test_short_text_is_one_chunk():
+    text = "Tek bir kisa cumle."
+
+    assert TextChunker(50, 10, 5).split(text) == [
+        {"chunk_index": 0, "content": text, "chunk_start": 0, "chunk_end": len(text)}
+    ]
+
+
+def test_chunks_end_at_sentences_and_repeat_the_previous_sentence():
+    chunker = TextChunker(max_tokens=80, overlap_tokens=30, min_tokens=0)
+
+    chunks = chunker.split(SENTENCES)
+
+    assert len(chunks) > 2
+    assert_valid_chunks(chunker, SENTENCES, chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk["content"].startswith("Cumle") and chunk["content"].endswith("biter.")
+        # Önceki parçanın son cümlesi tekrarlanır
+        last_sentence = previous["content"][previous["content"].rindex("Cumle"):]
+        assert chunk["content"].startswith(last_sentence)
+
+
+def test_long_sentence_is_split_at_words_with_word_level_overlap():
+    text = " ".join(f"kelime{index:03d}" for index in range(60))  # tek cümle, 599 jeton
+    chunker = TextChunker(max_tokens=100, overlap_tokens=25, min_tokens=0)
+
+    chunks = chunker.split(text)
+
+    assert len(chunks) > 5
+    assert_valid_chunks(chunker, text, chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        overlap = text[chunk["chunk_start"]:previous["chunk_end"]]
+        assert chunk["chunk_start"] < previous["chunk_end"]
+        assert chunker.count_tokens(overlap) <= 25
+        assert overlap.split()[0].startswith("kelime")  # örtüşme kelime sınırında başlar
+
+
+def test_sentence_longer_than_the_overlap_falls_back_to_words():
+    text = "Kisa. " + "uzun " * 20 + "son. Bir cumle daha burada."
+    chunker = TextChunker(max_tokens=110, overlap_tokens=12, min_tokens=0)
+
+    chunks = chunker.split(text)
+
+    assert len(chunks) == 2
+    assert_valid_chunks(chunker, text, chunks)
+    assert chunks[1]["chunk_start"] < chunks[0]["chunk_end"]
+
+
+def test_short_trailing_chunk_is_never_merged_beyond_the_limit():
+    text = "A" * 30 + ". " + "B" * 30 + ". Son."
+    chunker = TextChunker(max_tokens=64, overlap_tokens=0, min_tokens=4)
+
+    chunks = chunker.split(text)
+
+    assert [chunk["content"] for chunk in chunks] == ["A" * 30 + ". " + "B" * 30 + ".", "Son."]
+    assert_valid_chunks(chunker, text, chunks)
+
+
+def test_short_trailing_chunk_is_extended_with_the_previous_sentences():
+    text = "A" * 30 + ". " + "B" * 30 + ". Son."
+    chunker = TextChunker(max_tokens=64, overlap_tokens=0, min_tokens=20)
+
+    chunks = chunker.split(text)
+
+    assert [chunk["content"] for chunk in chunks] == ["A" * 30 + ". " + "B" * 30 + ".", "B" * 30 + ". Son."]
+    assert_valid_chunks(chunker, text, chunks)
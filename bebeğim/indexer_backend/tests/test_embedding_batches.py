@@ -0,0 +1,37 @@
+import pytest
+
+import config
+from indexer_backend.src.embedder.embedder import Embedder
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_items", 3)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_tokens", 20)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_item_tokens", 12)
+    return Embedder()
+
+
+def test_batches_respect_the_item_limit(embedder):
+    assert embedder._pack_batches(["a"] * 7) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batches_respect_the_token_limit(embedder):
+    # Test kodlamasında her bayt bir jetondur: 8 + 8 + 8 jeton iki isteğe bölünür
+    texts = ["x" * 8, "y" * 8, "z" * 8, "w" * 4]
+
+    batches = embedder._pack_batches(texts)
+
+    assert batches == [[0, 1], [2, 3]]
+    for batch in batches:
+        assert sum(len(texts[i]) for i in batch) <= 20
+
+
+def test_empty_and_oversized_texts_are_skipped(embedder):
+    texts = ["ilk", "", None, "x" * 13, "son"]
+
+    assert embedder._pack_batches(texts) == [[0, 4]]
+
+
+def test_text_at_the_item_limit_is_kept(embedder):
+    assert embedder._pack_batches(["x" * 12, "y" * 12]) == [[0], [1]]
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from indexer_backend.utils.fingerprints import FingerprintStore
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "belge.pdf"
+    path.write_bytes(b"%PDF-1.4 surum 1")
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path, pdf_path):
+    fingerprint_store = FingerprintStore(path=str(tmp_path / "fingerprints.json"))
+    fingerprint_store.update("belge.pdf", fingerprint_store.build(pdf_path, {1: "a", 2: "b"}))
+    return fingerprint_store
+
+
+def touch(path, offset=10):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + offset))
+
+
+def test_build_records_file_state_and_page_hashes(store, pdf_path):
+    fingerprint = store.get("belge.pdf")
+
+    assert fingerprint["size"] == os.path.getsize(pdf_path)
+    assert fingerprint["content_hash"] == FingerprintStore.compute_file_hash(pdf_path)
+    assert fingerprint["page_count"] == 2
+    assert fingerprint["page_hashes"] == {"1": "a", "2": "b"}
+
+
+def test_unknown_pdf_is_not_unchanged(store, pdf_path):
+    assert not store.is_unchanged("başka.pdf", pdf_path)
+
+
+def test_untouched_file_is_unchanged_without_hashing(store, pdf_path, monkeypatch):
+    def fail(path):
+        raise AssertionError("hash should not be computed")
+
+    monkeypatch.setattr(FingerprintStore, "compute_file_hash", staticmethod(fail))
+
+    assert store.is_unchanged("belge.pdf", pdf_path)
+
+
+def test_touched_file_with_same_content_is_unchanged(store, pdf_path):
+    touch(pdf_path)
+
+    assert store.is_unchanged("belge.pdf", pdf_path)
+    assert store.get("belge.pdf")["mtime"] == os.stat(pdf_path).st_mtime
+
+
+def test_modified_file_is_changed(store, pdf_path):
+    with open(pdf_path, "wb") as pdf_file:
+        pdf_file.write(b"%PDF-1.4 surum 2")
+    touch(pdf_path)
+
+    assert not store.is_unchanged("belge.pdf", pdf_path)
+
+    with open(pdf_path, "ab") as pdf_file:
+        pdf_file.write(b" ek sayfa")
+
+    assert not store.is_unchanged("belge.pdf", pdf_path)
+
+
+def test_fingerprints_survive_save_and_reload(store, tmp_path, pdf_path):
+    store.save()
+
+    reloaded = FingerprintStore(path=store.path)
+
+    assert reloaded.pdf_names() == ["belge.pdf"]
+    assert reloaded.get("belge.pdf") == store.get("belge.pdf")
+    assert reloaded.is_unchanged("belge.pdf", pdf_path)
+    assert not os.path.exists(f"{store.path}.tmp")
+
+
+def test_removed_pdf_is_dropped_from_the_store(store):
+    store.remove("belge.pdf")
+    store.remove("belge.pdf")
+    store.save()
+
+    assert store.get("belge.pdf") is None
+    assert FingerprintStore(path=store.path).pdf_names() == []
+
+
+def test_corrupt_store_starts_empty(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    path.write_text("{bozuk", encoding="utf-8")
+
+    assert FingerprintStore(path=str(path)).pdf_names() == []
@@ -0,0 +1,152 @@
+import threading
+
+import openai
+import pytest
+
+from indexer_backend.utils import rate_limiter
+from indexer_backend.utils.rate_limiter import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """
+    Stands in for the time module: sleep() advances the clock instead of waiting.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake_clock)
+    return fake_clock
+
+
+def test_token_bucket_waits_for_the_refill(clock):
+    bucket = TokenBucket(per_minute=60)  # saniyede bir jeton
+
+    bucket.acquire(60)
+    assert clock.sleeps == []
+
+    bucket.acquire(3)
+    assert clock.sleeps == [pytest.approx(3.0)]
+
+
+def test_token_bucket_caps_requests_above_the_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    bucket.acquire(500)
+    assert clock.sleeps == []
+    assert bucket.tokens == 0
+
+
+def test_concurrency_limit_halves_on_throttling_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, min_limit=2)
+
+    for expected in (4, 2, 2):
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == expected
+
+    # Limit, limit kadar başarılı istekten sonra bir artar
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 3
+
+
+def test_concurrency_limit_blocks_until_a_slot_is_released():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    limiter.release()
+    assert acquired.wait(1)
+    thread.join()
+    assert limiter.in_flight == 1
+
+
+def make_limiter(max_retries=3):
+    return RateLimiter(requests_per_minute=6000, tokens_per_minute=10 ** 6, max_concurrency=4,
+                       max_retries=max_retries, base_delay=1.0, max_delay=60.0)
+
+
+def failing_then_ok(errors):
+    calls = []
+
+    def func(**kwargs):
+        calls.append(kwargs)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return {"ok": True}
+
+    return func, calls
+
+
+def test_retry_after_header_sets_the_delay_and_pauses_callers(clock):
+    limiter = make_limiter()
+    func, calls = failing_then_ok([
+        openai.error.RateLimitError("429", headers={"retry-after": "7"}),
+        openai.error.RateLimitError("429", headers={"retry-after-ms": "1500"}),
+    ])
+
+    assert limiter.call(func, 10, input="x") == {"ok": True}
+
+    assert len(calls) == 3 and calls[0] == {"input": "x"}
+    retry_sleeps = [seconds for seconds in clock.sleeps if seconds in (7.0, 1.5)]
+    assert retry_sleeps == [7.0, 1.5]
+    assert limiter.concurrency.limit == 2  # iki 429 sınırı 4'ten 1'e indirir, başarılı istek bir artırır
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_retry_after_is_capped_at_the_maximum_delay(clock):
+    limiter = make_limiter()
+    func, _ = failing_then_ok([openai.error.RateLimitError("429", headers={"retry-after": "3600"})])
+
+    limiter.call(func, 10)
+
+    assert 60.0 in clock.sleeps and 3600.0 not in clock.sleeps
+
+
+def test_backoff_without_headers_is_exponential_with_jitter(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    limiter = make_limiter()
+    func, _ = failing_then_ok([openai.error.Timeout("timeout")] * 3)
+
+    limiter.call(func, 10)
+
+    assert [seconds for seconds in clock.sleeps if seconds >= 1.0] == [1.0, 2.0, 4.0]
+
+
+def test_client_errors_are_not_retried(clock):
+    limiter = make_limiter()
+    func, calls = failing_then_ok([openai.error.APIError("bad request", http_status=400)])
+
+    with pytest.raises(openai.error.APIError):
+        limiter.call(func, 10)
+    assert len(calls) == 1
+
+
+def test_retries_are_exhausted(clock):
+    limiter = make_limiter(max_retries=2)
+    func, calls = failing_then_ok([openai.error.ServiceUnavailableError("503")] * 5)
+
+    with pytest.raises(openai.error.ServiceUnavailableError):
+        limiter.call(func, 10)
+    assert len(calls) == 3
+    assert limiter.concurrency.in_flight == 0
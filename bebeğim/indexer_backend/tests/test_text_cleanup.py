@@ -0,0 +1,70 @@
+import pytest
+
+from indexer_backend.utils.text_cleanup import TextCleaner
+
+PROSE = ("Bu kılavuz cihazın kurulumunu ve bakımını anlatır. Kullanmadan önce güvenlik uyarılarını "
+         "dikkatle okuyunuz. Cihaz yalnızca topraklı prize takılmalıdır.")
+
+
+@pytest.fixture
+def cleaner():
+    return TextCleaner(quality_threshold=0.85, edge_lines=2, min_share=0.6)
+
+
+def page(number, body):
+    return f"ACME Kullanım Kılavuzu\nRevizyon 3\n{body}\nGizlilik: şirket içi\nSayfa {number}"
+
+
+def test_clean_prose_is_indexed_without_gpt(cleaner):
+    assert cleaner.quality_score(PROSE) > 0.95
+    assert not cleaner.needs_gpt(PROSE)
+
+
+@pytest.mark.parametrize("text", [
+    "Model AB-1234/X ve yedek parça XR-77.5 için servis@acme.com.tr adresine yazınız; gerilim 220-240V.",
+    "Çift-taraflı bant, 3.5mm jak, USB-C kablo ve e-posta: destek@ornek.com kutuda yer alır.",
+])
+def test_compound_tokens_count_as_valid(cleaner, text):
+    assert cleaner.quality_score(text) > 0.95
+    assert not cleaner.needs_gpt(text)
+
+
+@pytest.mark.parametrize("text", [
+    "b u   m e t i n   h a r f   h a r f   a y r ı l m ı ş   b i r   m e t i n d i r",
+    "Buyazıdakelimelerbirbirineyapışmışvebitişikolarakçıkarılmışbirsatırdır ve devamı",
+    "Metin �� bozuk � karakterler �� içeriyor �",
+    "% $ # @ ! ^ & * ( ) { } [ ] | \\ ~ ` ' < > ? / = +",
+    "",
+])
+def test_garbled_text_is_sent_to_gpt(cleaner, text):
+    assert cleaner.quality_score(text) < 0.85
+    assert cleaner.needs_gpt(text)
+
+
+def test_mojibake_is_repaired():
+    assert TextCleaner.normalize_unicode("Ýþletme yönetimi ve ðeliþim") == "İşletme yönetimi ve ğelişim"
+
+
+def test_repeated_headers_and_footers_are_removed(cleaner):
+    pages = [page(number, f"Bölüm {number} açıklaması.\nİkinci satır burada.\nÜçüncü satır.")
+             for number in range(1, 6)]
+
+    boilerplate = cleaner.detect_boilerplate(pages)
+    text = cleaner.clean(pages[2], boilerplate)
+
+    assert "ACME" not in text and "Sayfa" not in text and "Gizlilik" not in text
+    assert text == "Bölüm 3 açıklaması.\n\nİkinci satır burada.\n\nÜçüncü satır."
+
+
+def test_short_pages_keep_their_lines(cleaner):
+    pages = ["ACME Kullanım Kılavuzu\nNotlar"] * 5
+
+    boilerplate = cleaner.detect_boilerplate(pages)
+
+    assert cleaner.clean(pages[0], boilerplate) == "ACME Kullanım Kılavuzu Notlar"
+
+
+def test_broken_lines_and_hyphenation_are_joined(cleaner):
+    text = "Cihazın kuru-\nlumu iki adım-\ndan oluşur ve\nkısa sürer.\nSonraki cümle."
+
+    assert cleaner.clean(text) == "Cihazın kurulumu iki adımdan oluşur ve kısa sürer.\n\nSonraki cümle."
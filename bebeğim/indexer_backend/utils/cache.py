@@ -0,0 +1,164 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from indexer_backend import config
+from indexer_backend.utils.vectors import dequantize, quantize
+
+
+class ContentCache:
+    """
+    A persistent, size-bounded on-disk cache for GPT cleanup results and embedding vectors.
+
+    Entries are stored in SQLite and keyed by a hash of the model/deployment, the system prompt and
+    the input text, so identical pages across re-runs and duplicated PDFs are only paid for once.
+    When the stored values exceed max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path=None, max_bytes=None, enabled=None, embedding_dtype=None):
+        """
+        Initializes the cache and creates the SQLite table if needed.
+
+        Args:
+            path (str, optional): Path of the SQLite database file. Defaults to config.CACHE_CONFIG["path"].
+            max_bytes (int, optional): Maximum total size of the stored values. Defaults to config.CACHE_CONFIG["max_bytes"].
+            enabled (bool, optional): If False, every lookup misses and nothing is stored. Defaults to config.CACHE_CONFIG["enabled"].
+            embedding_dtype (str, optional): Storage format of new embedding entries, "float32", "float16" or "int8".
+                Entries of every format can be read. Defaults to config.CACHE_CONFIG["embedding_dtype"].
+        """
+        self.path = path or config.CACHE_CONFIG["path"]
+        self.max_bytes = max_bytes if max_bytes is not None else config.CACHE_CONFIG["max_bytes"]
+        self.enabled = config.CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self.embedding_dtype = embedding_dtype or config.CACHE_CONFIG["embedding_dtype"]
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._total_size = 0
+
+        if self.enabled:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+            self._connection.commit()
+            self._total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(model, system_prompt, text):
+        """
+        Builds a cache key from the model/deployment, the system prompt and the input text.
+
+        Returns:
+            str: The hex SHA-256 digest identifying the request.
+        """
+        digest = hashlib.sha256()
+        for part in (model, system_prompt, text):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get_text(self, key):
+        """
+        Returns the cached text for the key, or None on a miss.
+        """
+        value = self._get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set_text(self, key, text):
+        """
+        Stores a text value under the key.
+        """
+        self._set(key, text.encode("utf-8"))
+
+    def get_embedding(self, key):
+        """
+        Returns the cached embedding vector for the key as a float32 NumPy array, or None on a miss.
+        """
+        value = self._get(key)
+        if value is None:
+            return None
+        try:
+            return dequantize(value)
+        except ValueError as e:
+            config.app_logger.error(f"Error decoding cached embedding: {str(e)}")
+            return None
+
+    def set_embedding(self, key, embedding):
+        """
+        Stores an embedding vector under the key, packed in the configured embedding dtype.
+        """
+        self._set(key, quantize(embedding, self.embedding_dtype))
+
+    def stats(self):
+        """
+        Returns the hit/miss counters of the cache.
+
+        Returns:
+            dict: hits, misses and hit_rate.
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+    def close(self):
+        """
+        Closes the underlying SQLite connection.
+        """
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+    def _get(self, key):
+        if not self.enabled or self._connection is None:
+            return None
+        try:
+            with self._lock:
+                row = self._connection.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self._connection.execute("UPDATE cache SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._connection.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            config.app_logger.error(f"Error reading from cache: {str(e)}")
+            return None
+
+    def _set(self, key, value):
+        if not self.enabled or self._connection is None:
+            return
+        try:
+            with self._lock:
+                row = self._connection.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+                self._total_size += len(value) - (row[0] if row else 0)
+                self._evict()
+                self._connection.commit()
+        except sqlite3.Error as e:
+            config.app_logger.error(f"Error writing to cache: {str(e)}")
+
+    def _evict(self):
+        # Toplam boyut sınırı aşıldığında en uzun süredir kullanılmayan kayıtlar silinir
+        if self._total_size <= self.max_bytes:
+            return
+        excess = self._total_size - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in self._connection.execute("SELECT key, size FROM cache ORDER BY last_access"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._connection.executemany("DELETE FROM cache WHERE key = ?", stale_keys)
+        self._total_size -= freed
@@ -0,0 +1,160 @@
+import re
+
+from indexer_backend import config
+
+# Paragraf sonları ve cümle sonları doğal bölme noktalarıdır
+SEGMENT_BOUNDARY = re.compile(r"\n\s*\n|(?<=[.!?…:;])\s+")
+WORD_PATTERN = re.compile(r"\S+")
+
+
+class TextChunker:
+    """
+    Splits page text into token-bounded, overlapping chunks along sentence and paragraph boundaries.
+
+    The text is cut into sentences (paragraph breaks always end a sentence), sentences are packed into
+    chunks of at most max_tokens tokens and every chunk repeats the trailing sentences of the previous
+    one, up to overlap_tokens, so a statement spanning a chunk border stays retrievable; when no whole
+    sentence fits, the trailing words are repeated instead. Sentences longer than max_tokens are split
+    at word boundaries. Tokens are counted with the configured
+    tiktoken encoding. Every chunk keeps its character offsets in the page text.
+    """
+
+    def __init__(self, max_tokens=None, overlap_tokens=None, min_tokens=None):
+        """
+        Args:
+            max_tokens (int, optional): Maximum tokens of a chunk. Defaults to config.CHUNKING_CONFIG["max_tokens"].
+            overlap_tokens (int, optional): Tokens repeated from the previous chunk.
+                Defaults to config.CHUNKING_CONFIG["overlap_tokens"].
+            min_tokens (int, optional): A trailing chunk shorter than this is merged into the previous one
+                if the result fits max_tokens, otherwise it is extended with the preceding sentences.
+                Defaults to config.CHUNKING_CONFIG["min_tokens"].
+        """
+        chunking_config = config.CHUNKING_CONFIG
+        self.max_tokens = max_tokens if max_tokens is not None else chunking_config["max_tokens"]
+        self.overlap_tokens = overlap_tokens if overlap_tokens is not None else chunking_config["overlap_tokens"]
+        self.min_tokens = min_tokens if min_tokens is not None else chunking_config["min_tokens"]
+        if self.overlap_tokens >= self.max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+
+    @staticmethod
+    def count_tokens(text):
+        return len(config.encoding.encode(text))
+
+    def split(self, text):
+        """
+        Splits a page text into chunks.
+
+        Args:
+            text (str): The (cleaned) page text.
+
+        Returns:
+            list: Dictionaries with chunk_index, content, chunk_start and chunk_end, where
+                  content == text[chunk_start:chunk_end].
+        """
+        segments = self._segments(text)
+        if not segments:
+            return []
+
+        spans = []  # (start, end, tokens) per chunk
+        current = []
+        current_tokens = 0
+        for segment in segments:
+            if current and current_tokens + segment[2] > self.max_tokens:
+                spans.append((current[0][0], current[-1][1], current_tokens))
+                current = self._overlap(text, current, min(self.overlap_tokens, self.max_tokens - segment[2]))
+                current_tokens = sum(previous[2] for previous in current)
+            current.append(segment)
+            current_tokens += segment[2]
+        spans.append((current[0][0], current[-1][1], current_tokens))
+
+        # Çok kısa son parça, sınırı aşmıyorsa bir öncekiyle birleştirilir; aşıyorsa önceki parçanın
+        # son cümleleriyle geriye doğru uzatılır
+        if len(spans) > 1 and spans[-1][2] < self.min_tokens:
+            merged_tokens = self.count_tokens(text[spans[-2][0]:spans[-1][1]])
+            if merged_tokens <= self.max_tokens:
+                last = spans.pop()
+                spans[-1] = (spans[-1][0], last[1], merged_tokens)
+            else:
+                spans[-1] = self._extend_backward(text, segments, spans[-1])
+
+        return [
+            {"chunk_index": index, "content": text[start:end], "chunk_start": start, "chunk_end": end}
+            for index, (start, end, _) in enumerate(spans)
+        ]
+
+    def _extend_backward(self, text, segments, span):
+        """
+        Extends a short trailing chunk with the preceding sentences until it holds min_tokens tokens,
+        without exceeding max_tokens.
+        """
+        start, end, tokens = span
+        for segment in reversed([segment for segment in segments if segment[1] <= start]):
+            if tokens >= self.min_tokens:
+                break
+            extended_tokens = self.count_tokens(text[segment[0]:end])
+            if extended_tokens > self.max_tokens:
+                break
+            start, tokens = segment[0], extended_tokens
+        return start, end, tokens
+
+    def _overlap(self, text, segments, budget):
+        """
+        Returns the trailing spans of a chunk that are repeated at the start of the next one, at most
+        budget tokens: whole sentences where they fit, otherwise the trailing words of the last sentence.
+        """
+        overlap, overlap_tokens = [], 0
+        for previous in reversed(segments):
+            if overlap_tokens + previous[2] > budget:
+                break
+            overlap.insert(0, previous)
+            overlap_tokens += previous[2]
+        if overlap or budget <= 0:
+            return overlap
+
+        # Son cümle örtüşmeye sığmıyorsa örtüşme kelime düzeyinde kurulur
+        start, end, _ = segments[-1]
+        tail_start, tail_tokens = None, 0
+        for word in reversed(list(WORD_PATTERN.finditer(text, start, end))):
+            word_tokens = self.count_tokens(" " + word.group())
+            if tail_tokens + word_tokens > budget:
+                break
+            tail_start = word.start()
+            tail_tokens += word_tokens
+        return [(tail_start, end, tail_tokens)] if tail_start is not None else []
+
+    def _segments(self, text):
+        """
+        Returns the (start, end, tokens) spans of the sentences of a text, splitting sentences that
+        exceed max_tokens at word boundaries.
+        """
+        segments = []
+        position = 0
+        for boundary in list(SEGMENT_BOUNDARY.finditer(text)) + [None]:
+            end = boundary.start() if boundary else len(text)
+            sentence = text[position:end]
+            start = position + len(sentence) - len(sentence.lstrip())
+            end = position + len(sentence.rstrip())
+            position = boundary.end() if boundary else len(text)
+            if start >= end:
+                continue
+
+            tokens = self.count_tokens(text[start:end])
+            if tokens <= self.max_tokens:
+                segments.append((start, end, tokens))
+                continue
+
+            # Tek başına sınırı aşan cümle kelime sınırlarından bölünür; parçalar örtüşmeye yer bırakır
+            piece_limit = self.max_tokens - self.overlap_tokens
+            piece_start, piece_end, piece_tokens = None, None, 0
+            for word in WORD_PATTERN.finditer(text, start, end):
+                word_tokens = self.count_tokens(" " + word.group())
+                if piece_start is not None and piece_tokens + word_tokens > piece_limit:
+                    segments.append((piece_start, piece_end, piece_tokens))
+                    piece_start, piece_tokens = None, 0
+                if piece_start is None:
+                    piece_start = word.start()
+                piece_end = word.end()
+                piece_tokens += word_tokens
+            if piece_start is not None:
+                segments.append((piece_start, piece_end, piece_tokens))
+        return segments
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+
+from indexer_backend import config
+
+
+class FingerprintStore:
+    """
+    A local store of PDF file fingerprints used for incremental indexing.
+
+    For every indexed PDF it records the path, size, modification time, a hash of the file content,
+    the page count and a hash of each page's raw text. On the next run unchanged files can be skipped
+    without being parsed, changed files can be narrowed down to their changed pages, and files that
+    disappeared from the directory can be removed from the search index.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initializes the store and loads the existing fingerprints from disk.
+
+        Args:
+            path (str, optional): Path of the JSON fingerprint file. Defaults to config.FINGERPRINT_STORE_PATH.
+        """
+        self.path = path or config.FINGERPRINT_STORE_PATH
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as store_file:
+                    self._fingerprints = json.load(store_file)
+            except Exception as e:
+                config.app_logger.error(f"Error reading fingerprint store {self.path}: {str(e)}")
+
+    @staticmethod
+    def compute_file_hash(pdf_path):
+        """
+        Computes the SHA-256 hash of a file's content.
+
+        Args:
+            pdf_path (str): Path to the file.
+
+        Returns:
+            str: The hex digest.
+        """
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, pdf_name):
+        """
+        Returns the stored fingerprint of a PDF, or None if it has never been indexed.
+        """
+        with self._lock:
+            return self._fingerprints.get(pdf_name)
+
+    def pdf_names(self):
+        """
+        Returns the names of all PDFs with a stored fingerprint.
+        """
+        with self._lock:
+            return list(self._fingerprints)
+
+    def is_unchanged(self, pdf_name, pdf_path):
+        """
+        Checks whether a PDF is unchanged since its fingerprint was stored.
+
+        Size and modification time are compared first; the content hash is only computed when they
+        differ, so an untouched file is recognized without reading it.
+
+        Args:
+            pdf_name (str): The name of the PDF file.
+            pdf_path (str): Path to the PDF file.
+
+        Returns:
+            bool: True if the file content is identical to the stored fingerprint.
+        """
+        fingerprint = self.get(pdf_name)
+        if fingerprint is None:
+            return False
+
+        stat = os.stat(pdf_path)
+        if stat.st_size == fingerprint["size"] and stat.st_mtime == fingerprint["mtime"]:
+            return True
+        if stat.st_size != fingerprint["size"]:
+            return False
+
+        if self.compute_file_hash(pdf_path) == fingerprint["content_hash"]:
+            # Dosya yalnızca dokunulmuş, içerik aynı; bir dahaki sefere hash hesaplanmasın
+            with self._lock:
+                fingerprint["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def build(self, pdf_path, page_hashes):
+        """
+        Builds a fingerprint for a PDF from its current file state and page hashes.
+
+        Args:
+            pdf_path (str): Path to the PDF file.
+            page_hashes (dict): Mapping of page number to the hash of that page's raw text.
+
+        Returns:
+            dict: The fingerprint.
+        """
+        stat = os.stat(pdf_path)
+        return {
+            "path": pdf_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "content_hash": self.compute_file_hash(pdf_path),
+            "page_count": len(page_hashes),
+            "page_hashes": {str(page_number): page_hash for page_number, page_hash in page_hashes.items()}
+        }
+
+    def update(self, pdf_name, fingerprint):
+        """
+        Stores the fingerprint of a PDF.
+        """
+        with self._lock:
+            self._fingerprints[pdf_name] = fingerprint
+
+    def remove(self, pdf_name):
+        """
+        Removes the fingerprint of a PDF.
+        """
+        with self._lock:
+            self._fingerprints.pop(pdf_name, None)
+
+    def save(self):
+        """
+        Writes the fingerprints to disk.
+        """
+        try:
+            with self._lock:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as store_file:
+                    json.dump(self._fingerprints, store_file, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            config.app_logger.error(f"Error writing fingerprint store {self.path}: {str(e)}")
@@ -1,7 +1,11 @@
+import hashlib
+import json
+import threading
+import time
+
 from azure.search.documents.indexes import SearchIndexClient
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
-from uuid import uuid4
 from azure.search.documents.indexes.models import (
     SearchableField,
     SearchField,
@@ -10,9 +14,193 @@ from azure.search.documents.indexes.models import (
     SearchIndex,
     VectorSearch,
     HnswAlgorithmConfiguration,
+    HnswParameters,
     VectorSearchProfile,
+    ScalarQuantizationCompression,
+    ScalarQuantizationParameters,
+    BinaryQuantizationCompression,
+    RescoringOptions,
 )
 from indexer_backend import config
+from indexer_backend.utils.metrics import metrics
+from indexer_backend.utils.vectors import JSON_BYTES_PER_VALUE, to_list, to_vector
+
+UPLOAD_MODES = ("upload", "merge_or_upload")
+VECTOR_METRICS = ("cosine", "dotProduct", "euclidean")
+VECTOR_COMPRESSIONS = ("none", "scalar", "binary")
+COMPRESSION_KINDS = {"scalarQuantization": "scalar", "binaryQuantization": "binary"}
+
+VECTOR_PROFILE_NAME = "default_vector_search_profile"
+HNSW_ALGORITHM_NAME = "default_hnsw_algorithm_config"
+COMPRESSION_NAME = "default_vector_compression"
+
+
+def compute_content_hash(text):
+    """
+    Computes a stable hash of a page's text.
+
+    Args:
+        text (str): The page text.
+
+    Returns:
+        str: The hex SHA-256 digest of the text.
+    """
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def make_document_id(pdf_name, page_number, content_hash, chunk_index=None):
+    """
+    Builds a deterministic document key from the PDF name, page number and content hash.
+
+    The same page with the same content always maps to the same key, so re-indexing it
+    overwrites the existing document instead of creating a duplicate. Azure Cognitive Search
+    keys may only contain letters, digits, '_', '-' and '=', hence the PDF name is hashed too.
+    Chunks of a page get the page key with the chunk index appended.
+
+    Args:
+        pdf_name (str): The name of the PDF file.
+        page_number (int): The page number of the PDF.
+        content_hash (str): The hash of the page text, see compute_content_hash.
+        chunk_index (int, optional): Index of the chunk within the page. Defaults to None (whole page).
+
+    Returns:
+        str: The document key.
+    """
+    pdf_hash = hashlib.sha256(pdf_name.encode("utf-8")).hexdigest()[:16]
+    page_id = f"{pdf_hash}-{page_number}-{content_hash[:16]}"
+    return page_id if chunk_index is None else f"{page_id}-{chunk_index}"
+
+
+def page_document_id(document_id):
+    """
+    Returns the page key of a document key built by make_document_id, dropping the chunk index.
+    """
+    return "-".join(document_id.split("-")[:3])
+
+
+def build_chunk_fields():
+    """
+    Returns the index fields that locate a chunk within its page: its index and character offsets.
+    """
+    return [
+        SimpleField(name="chunk_index", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
+        SimpleField(name="chunk_start", type=SearchFieldDataType.Int32),
+        SimpleField(name="chunk_end", type=SearchFieldDataType.Int32)
+    ]
+
+
+def build_vector_field(vector_config):
+    """
+    Returns the pdf_vector field of a new index.
+
+    Args:
+        vector_config (dict): Settings in the format of config.VECTOR_INDEX_CONFIG.
+
+    Returns:
+        SearchField: The vector field.
+    """
+    return SearchField(
+        name="pdf_vector",
+        type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+        searchable=True,
+        # stored=False olan bir alan sorgu sonuçlarında döndürülemez
+        retrievable=vector_config["stored"],
+        stored=vector_config["stored"],
+        vector_search_dimensions=config.EMBEDDING_DIMENSION,
+        vector_search_profile_name=VECTOR_PROFILE_NAME,
+    )
+
+
+def build_vector_search(vector_config):
+    """
+    Returns the vector search configuration of a new index: an HNSW graph with the parameters of
+    config.HNSW_CONFIG and the chosen similarity metric, optionally over scalar (int8) or binary
+    quantized vectors.
+
+    With rescoring, the full precision vectors are kept in the vector index and the oversampled
+    candidates of the quantized search are rescored with them; without rescoring they are discarded.
+
+    Args:
+        vector_config (dict): Settings in the format of config.VECTOR_INDEX_CONFIG.
+
+    Returns:
+        VectorSearch: The vector search configuration.
+    """
+    if vector_config["metric"] not in VECTOR_METRICS:
+        raise ValueError(f"Unknown vector metric '{vector_config['metric']}', expected one of {VECTOR_METRICS}")
+    if vector_config["compression"] not in VECTOR_COMPRESSIONS:
+        raise ValueError(f"Unknown vector compression '{vector_config['compression']}', "
+                         f"expected one of {VECTOR_COMPRESSIONS}")
+
+    compressions = []
+    if vector_config["compression"] != "none":
+        rescore = vector_config["rescore"]
+        rescoring_options = RescoringOptions(
+            enable_rescoring=rescore,
+            default_oversampling=vector_config["oversampling"] if rescore else None,
+            rescore_storage_method="preserveOriginals" if rescore else "discardOriginals"
+        )
+        if vector_config["compression"] == "scalar":
+            compressions.append(ScalarQuantizationCompression(
+                compression_name=COMPRESSION_NAME,
+                parameters=ScalarQuantizationParameters(quantized_data_type="int8"),
+                rescoring_options=rescoring_options
+            ))
+        else:
+            compressions.append(BinaryQuantizationCompression(
+                compression_name=COMPRESSION_NAME,
+                rescoring_options=rescoring_options
+            ))
+
+    return VectorSearch(
+        profiles=[
+            VectorSearchProfile(
+                name=VECTOR_PROFILE_NAME,
+                algorithm_configuration_name=HNSW_ALGORITHM_NAME,
+                compression_name=COMPRESSION_NAME if compressions else None
+            )
+        ],
+        algorithms=[
+            HnswAlgorithmConfiguration(
+                name=HNSW_ALGORITHM_NAME,
+                parameters=HnswParameters(
+                    m=config.HNSW_CONFIG["m"],
+                    ef_construction=config.HNSW_CONFIG["ef_construction"],
+                    ef_search=config.HNSW_CONFIG["ef_search"],
+                    metric=vector_config["metric"]
+                )
+            )
+        ],
+        compressions=compressions or None
+    )
+
+
+def describe_vector_schema(index):
+    """
+    Reads the vector settings of an existing index back in the format of config.VECTOR_INDEX_CONFIG.
+
+    Args:
+        index (SearchIndex): The index definition.
+
+    Returns:
+        dict: metric, compression, rescore and stored of the pdf_vector field.
+    """
+    field = next(field for field in index.fields if field.name == "pdf_vector")
+    vector_search = index.vector_search
+    profile = next(profile for profile in vector_search.profiles if profile.name == field.vector_search_profile_name)
+    algorithm = next(algorithm for algorithm in vector_search.algorithms
+                     if algorithm.name == profile.algorithm_configuration_name)
+    compression = next((compression for compression in vector_search.compressions or []
+                        if compression.compression_name == profile.compression_name), None)
+    rescoring_options = compression.rescoring_options if compression is not None else None
+    metric = getattr(algorithm.parameters, "metric", None) or "cosine"
+    return {
+        "metric": getattr(metric, "value", metric),
+        "compression": COMPRESSION_KINDS.get(compression.kind, compression.kind) if compression is not None else "none",
+        "rescore": bool(rescoring_options and rescoring_options.enable_rescoring),
+        "stored": field.stored is not False and field.retrievable is not False
+    }
+
 
 class Indexer:
     """
@@ -22,21 +210,52 @@ class Indexer:
     ingestion of embeddings, and verification of document indexing within Azure Cognitive Search.
     """
 
-    def __init__(self, pdf_page_data):
+    def __init__(self, pdf_page_data, buffered=False, batch_config=None, upload_mode=None, index_name=None,
+                 vector_config=None):
         """
         Initializes the Indexer with PDF page data and sets up Azure Search clients.
 
         Args:
             pdf_page_data (list): A list of dictionaries containing PDF name, page number, content, and embedding.
+            buffered (bool, optional): If True, ingest_document buffers documents and uploads them in
+                size- and byte-bounded batches instead of one request per document. Call close() (or use
+                the Indexer as a context manager) to flush the remaining documents. Defaults to False.
+            batch_config (dict, optional): Overrides for config.INDEXER_BATCH_CONFIG.
+            upload_mode (str, optional): "upload" or "merge_or_upload". Since document keys are deterministic,
+                "merge_or_upload" makes re-indexing idempotent. Defaults to config.INDEXER_UPLOAD_MODE.
+            index_name (str, optional): The target index. Defaults to config.COGNITIVE_SEARCH_CONFIG["index_name"].
+            vector_config (dict, optional): Overrides for config.VECTOR_INDEX_CONFIG, used when the index is created.
         """
+        upload_mode = upload_mode or config.INDEXER_UPLOAD_MODE
+        if upload_mode not in UPLOAD_MODES:
+            raise ValueError(f"Unknown upload mode '{upload_mode}', expected one of {UPLOAD_MODES}")
+
         self.pdf_page_data = pdf_page_data
+        self.upload_mode = upload_mode
+        self.buffered = buffered
+        self.batch_config = {**config.INDEXER_BATCH_CONFIG, **(batch_config or {})}
+        self.index_name = index_name or config.COGNITIVE_SEARCH_CONFIG["index_name"]
+        self.vector_config = {**config.VECTOR_INDEX_CONFIG, **(vector_config or {})}
+        self.failed_documents = []
+
+        self._index_ready = False
+        self._index_lock = threading.Lock()
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._buffer_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flush_thread = None
         self.index_client = SearchIndexClient(
             endpoint=config.COGNITIVE_SEARCH_CONFIG["endpoint"],
             credential=AzureKeyCredential(config.COGNITIVE_SEARCH_CONFIG["api_key"])
         )
-        self.search_client = SearchClient(
+        self.search_client = self._search_client(self.index_name)
+
+    @staticmethod
+    def _search_client(index_name):
+        return SearchClient(
             endpoint=config.COGNITIVE_SEARCH_CONFIG["endpoint"],
-            index_name=config.COGNITIVE_SEARCH_CONFIG["index_name"],
+            index_name=index_name,
             credential=AzureKeyCredential(config.COGNITIVE_SEARCH_CONFIG["api_key"])
         )
 
@@ -49,7 +268,7 @@ class Indexer:
         """
         try:
             index_names = list(self.index_client.list_index_names())
-            return config.COGNITIVE_SEARCH_CONFIG["index_name"] in index_names
+            return self.index_name in index_names
         except Exception as e:
             config.app_logger.error(f"Error checking index existence: {str(e)}")
             return False
@@ -59,9 +278,15 @@ class Indexer:
         Creates a search index in Azure Cognitive Search if it does not already exist.
 
         The index includes fields for PDF ID, PDF name, page number, embedding vector, and page content.
-        It also configures vector search capabilities using the HNSW algorithm.
+        It also configures vector search capabilities using the HNSW algorithm with the
+        parameters of config.HNSW_CONFIG, the metric, compression and storage settings of
+        vector_config (see build_vector_search), and the Turkish text analyzer of config.SEARCH_ANALYZER
+        for the keyword part of hybrid search.
         """
-        if not self.does_index_exist():
+        if self.does_index_exist():
+            self._add_missing_fields()
+            self._index_ready = True
+        else:
             try:
                 fields = [
                     SimpleField(
@@ -76,7 +301,8 @@ class Indexer:
                         type=SearchFieldDataType.String,
                         searchable=True,
                         filterable=True,
-                        sortable=True
+                        sortable=True,
+                        analyzer_name=config.SEARCH_ANALYZER
                     ),
                     SearchField(
                         name="page_number",
@@ -84,51 +310,73 @@ class Indexer:
                         filterable=True,
                         sortable=True
                     ),
-                    SearchField(
-                        name="pdf_vector",
-                        type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-                        searchable=True,
-                        vector_search_dimensions=config.EMBEDDING_DIMENSION,
-                        vector_search_profile_name="default_vector_search_profile",
-                    ),
+                    build_vector_field(self.vector_config),
                     SearchableField(
                         name="content",
                         type=SearchFieldDataType.String,
-                        searchable=True
-                    )
+                        searchable=True,
+                        analyzer_name=config.SEARCH_ANALYZER
+                    ),
+                    *build_chunk_fields()
                 ]
 
                 search_index = SearchIndex(
-                    name=config.COGNITIVE_SEARCH_CONFIG["index_name"],
+                    name=self.index_name,
                     fields=fields,
-                    vector_search=VectorSearch(
-                        profiles=[
-                            VectorSearchProfile(
-                                name="default_vector_search_profile",
-                                algorithm_configuration_name="default_hnsw_algorithm_config"
-                            )
-                        ],
-                        algorithms=[
-                            HnswAlgorithmConfiguration(
-                                name="default_hnsw_algorithm_config",
-                            )
-                        ]
-                    )
+                    vector_search=build_vector_search(self.vector_config)
                 )
                 self.index_client.create_index(search_index)
-                config.app_logger.info("Search Index is created successfully!")
+                self._index_ready = True
+                config.app_logger.info(f"Search Index {self.index_name} is created successfully!")
             except Exception as e:
                 config.app_logger.error(f"Error creating index: {str(e)}")
 
-    def prepare_document(self, pdf_name, page_number, embedding, content):
+    def _add_missing_fields(self):
+        """
+        Adds the chunk fields to an index created before chunking was introduced.
+
+        New fields can be added to an existing Azure Cognitive Search index without rebuilding it; the
+        vector settings cannot, so a mismatch with vector_config is only reported.
+        """
+        try:
+            index = self.index_client.get_index(self.index_name)
+            existing = {field.name for field in index.fields}
+            missing = [field for field in build_chunk_fields() if field.name not in existing]
+            if missing:
+                index.fields.extend(missing)
+                self.index_client.create_or_update_index(index)
+                config.app_logger.info(f"Added fields {[field.name for field in missing]} to the search index.")
+        except Exception as e:
+            config.app_logger.error(f"Error updating index fields: {str(e)}")
+            return
+
+        try:
+            schema = describe_vector_schema(index)
+        except (StopIteration, AttributeError) as e:
+            config.app_logger.error(f"Error reading vector settings of index {self.index_name}: {str(e)}")
+            return
+        # Sıkıştırma yoksa yeniden puanlama ayarı anlamsızdır
+        changed = [key for key, value in schema.items()
+                   if self.vector_config[key] != value and (key != "rescore" or schema["compression"] != "none")]
+        if changed:
+            config.app_logger.warning(
+                f"Vector settings {changed} of index {self.index_name} differ from the configuration; "
+                f"run python -m indexer_backend.migrate_index to rebuild it."
+            )
+
+    def prepare_document(self, pdf_name, page_number, embedding, content, content_hash=None, chunk=None):
         """
         Prepares a document dictionary for indexing into Azure Cognitive Search.
 
         Args:
             pdf_name (str): The name of the PDF file.
             page_number (int): The page number of the PDF.
-            embedding (list): The embedding vector representing the PDF page.
+            embedding (list or numpy.ndarray): The embedding vector representing the PDF page.
+                It is kept as a float32 array until the document is sent.
             content (str): The cleaned content of the PDF page.
+            content_hash (str, optional): Hash of the raw page text used for the document key.
+                Defaults to the hash of content.
+            chunk (dict, optional): chunk_index, chunk_start and chunk_end if content is a chunk of the page.
 
         Returns:
             dict or None: A dictionary representing the document ready for indexing,
@@ -140,13 +388,17 @@ class Indexer:
                     f"Embedding dimension mismatch: Expected {config.EMBEDDING_DIMENSION}, got {len(embedding)}"
                 )
 
+            chunk_index = chunk["chunk_index"] if chunk else None
             document = {
-                "id": str(uuid4()),
+                "id": make_document_id(pdf_name, page_number, content_hash or compute_content_hash(content),
+                                       chunk_index),
                 "pdf_name": pdf_name,
                 "page_number": page_number,
-                "pdf_vector": embedding,
+                "pdf_vector": to_vector(embedding),
                 "content": content
             }
+            if chunk:
+                document.update({key: chunk[key] for key in ("chunk_index", "chunk_start", "chunk_end")})
             return document
         except Exception as e:
             config.app_logger.error(f"Error preparing document for {pdf_name}, page {page_number}: {str(e)}")
@@ -164,7 +416,7 @@ class Indexer:
         Logs the outcome of the ingestion process.
         """
         # Create the index if it does not exist
-        self.create_index()
+        self.ensure_index()
 
         documents = []
         for page_data in self.pdf_page_data:
@@ -174,29 +426,39 @@ class Indexer:
             content = page_data['content']
 
             # Prepare and collect document for indexing
-            document = self.prepare_document(pdf_name, page_number, embedding, content)
+            document = self.prepare_document(pdf_name, page_number, embedding, content,
+                                             page_data.get('content_hash'), self._chunk_of(page_data))
             if document:
                 documents.append(document)
 
         if documents:
             try:
-                self.search_client.upload_documents(documents=documents)
+                self._send_documents(documents)
                 config.app_logger.info(f"{len(documents)} documents indexed successfully!")
             except Exception as e:
                 config.app_logger.error(f"Error during document ingestion: {str(e)}")
         else:
             config.app_logger.info("No documents to index.")
 
+    def ensure_index(self):
+        """
+        Creates or validates the search index once per Indexer instead of once per document.
+        """
+        with self._index_lock:
+            if not self._index_ready:
+                self.create_index()
+
     def ingest_document(self, document):
         """
         Ingests a single document (page) into Azure Cognitive Search.
 
+        In buffered mode the document is only added to the upload buffer; it is sent with the next
+        batch when the buffer is full, when the flush timer fires, or on close().
+
         Args:
             document (dict): The document to be indexed, containing pdf_name, page_number, content, and embedding.
         """
-        self.create_index()
-
-        documents = []
+        self.ensure_index()
 
         pdf_name = document['pdf_name']
         page_number = document['page_number']
@@ -204,14 +466,255 @@ class Indexer:
         content = document['content']
 
         # Prepare and collect document for indexing
-        document = self.prepare_document(pdf_name, page_number, embedding, content)
-        if document:
-            documents.append(document)
+        document = self.prepare_document(pdf_name, page_number, embedding, content,
+                                         document.get('content_hash'), self._chunk_of(document))
+        if not document:
+            config.app_logger.info("No documents to index.")
+            return
 
-        if documents:
+        if self.buffered:
+            self._add_to_buffer(document)
+            return
+
+        try:
+            results = self._send_documents([document])
+            if not all(result.succeeded for result in results):
+                self.failed_documents.append(document)
+        except Exception as e:
+            config.app_logger.error(f"Error during document ingestion: {str(e)}")
+            self.failed_documents.append(document)
+
+    @staticmethod
+    def _chunk_of(page_data):
+        """
+        Returns the chunk position of a page item, or None if the item is a whole page.
+        """
+        if page_data.get('chunk_index') is None:
+            return None
+        return {key: page_data[key] for key in ("chunk_index", "chunk_start", "chunk_end")}
+
+    def _add_to_buffer(self, document):
+        """
+        Adds a prepared document to the upload buffer and flushes it once a batch limit is reached.
+
+        Args:
+            document (dict): A document returned by prepare_document.
+        """
+        self._start_flush_timer()
+        # Vektör JSON'a çevrilmeden boyutu tahmin edilir
+        document_bytes = (len(json.dumps({key: value for key, value in document.items() if key != "pdf_vector"}))
+                          + len(document["pdf_vector"]) * JSON_BYTES_PER_VALUE)
+
+        with self._buffer_lock:
+            # Bayt sınırı aşılacaksa önce mevcut tamponu ayrı bir parti olarak gönder
+            batch = None
+            if self._buffer and self._buffer_bytes + document_bytes > self.batch_config["max_bytes"]:
+                batch = self._take_buffer()
+            self._buffer.append(document)
+            self._buffer_bytes += document_bytes
+            if len(self._buffer) >= self.batch_config["max_documents"]:
+                batch = (batch or []) + self._take_buffer()
+
+        if batch:
+            self._upload_batch(batch)
+
+    def _take_buffer(self):
+        """
+        Empties the buffer and returns its documents. Must be called with the buffer lock held.
+
+        Returns:
+            list: The buffered documents.
+        """
+        batch = self._buffer
+        self._buffer = []
+        self._buffer_bytes = 0
+        return batch
+
+    def _start_flush_timer(self):
+        """
+        Starts the background thread that flushes the buffer every flush_interval seconds.
+        """
+        if self._flush_thread is not None or not self.batch_config["flush_interval"]:
+            return
+        with self._buffer_lock:
+            if self._flush_thread is None:
+                self._stop_event.clear()
+                self._flush_thread = threading.Thread(target=self._flush_periodically, name="indexer-flush",
+                                                      daemon=True)
+                self._flush_thread.start()
+
+    def _flush_periodically(self):
+        """
+        Background loop of the flush timer.
+        """
+        while not self._stop_event.wait(self.batch_config["flush_interval"]):
+            self.flush()
+
+    def flush(self):
+        """
+        Uploads every buffered document.
+        """
+        with self._buffer_lock:
+            batch = self._take_buffer()
+        if batch:
+            self._upload_batch(batch)
+
+    def close(self):
+        """
+        Stops the flush timer and uploads the remaining buffered documents.
+        """
+        self._stop_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+        if self.failed_documents:
+            config.app_logger.error(f"{len(self.failed_documents)} documents could not be indexed.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def delete_stale_pages(self, pdf_name, page_numbers=None, keep_ids=()):
+        """
+        Removes outdated documents of a PDF from the search index.
+
+        The document keys are looked up with a single filtered query per PDF, so documents indexed
+        with older key formats are removed as well.
+
+        Args:
+            pdf_name (str): The name of the PDF file.
+            page_numbers (iterable, optional): Only documents of these pages are removed. Defaults to None (all pages).
+            keep_ids (iterable, optional): Document keys that must be kept, e.g. the new versions of changed pages.
+                The chunks of a kept page key are kept as well.
+
+        Returns:
+            bool: True if the stale documents were removed, False if an error occurred.
+        """
+        try:
+            safe_pdf_name = pdf_name.replace("'", "''")
+            results = self.search_client.search(
+                search_text="*",
+                filter=f"pdf_name eq '{safe_pdf_name}'",
+                select=["id", "page_number"]
+            )
+            page_numbers = set(page_numbers) if page_numbers is not None else None
+            keep_ids = set(keep_ids)
+            stale_ids = [
+                result["id"] for result in results
+                if (page_numbers is None or result["page_number"] in page_numbers)
+                and page_document_id(result["id"]) not in keep_ids
+            ]
+
+            max_documents = self.batch_config["max_documents"]
+            for start in range(0, len(stale_ids), max_documents):
+                batch = stale_ids[start:start + max_documents]
+                self.search_client.delete_documents(documents=[{"id": document_id} for document_id in batch])
+            if stale_ids:
+                config.app_logger.info(f"{len(stale_ids)} stale documents of {pdf_name} removed from the index.")
+            return True
+        except Exception as e:
+            config.app_logger.error(f"Error removing stale documents of {pdf_name}: {str(e)}")
+            return False
+
+    def copy_documents_from(self, source_index_name, page_size=1000):
+        """
+        Copies every document of another index, embeddings included, into this index.
+
+        Used to move an index to a new schema (e.g. vector compression) without extracting and
+        embedding the PDFs again. The source is read in pages ordered by document key, so the copy is
+        not limited by the skip limit of the search API. The vectors of the source index must be
+        retrievable. Documents are uploaded in buffered batches; failed documents are collected in
+        failed_documents.
+
+        Args:
+            source_index_name (str): The index to copy from.
+            page_size (int, optional): Documents read per request. Defaults to 1000.
+
+        Returns:
+            int: The number of copied documents.
+        """
+        source_index = self.index_client.get_index(source_index_name)
+        if not describe_vector_schema(source_index)["stored"]:
+            raise ValueError(f"The vectors of index {source_index_name} are not retrievable; "
+                             f"the PDFs have to be indexed again.")
+
+        self.ensure_index()
+        target_fields = {field.name for field in self.index_client.get_index(self.index_name).fields}
+        select = [field.name for field in source_index.fields if field.name in target_fields]
+        source_client = self._search_client(source_index_name)
+
+        copied, last_id = 0, None
+        while True:
+            safe_last_id = last_id.replace("'", "''") if last_id is not None else None
+            results = list(source_client.search(
+                search_text="*",
+                filter=f"id gt '{safe_last_id}'" if last_id is not None else None,
+                order_by=["id asc"],
+                select=select,
+                top=page_size
+            ))
+            for result in results:
+                document = {key: value for key, value in result.items() if not key.startswith("@")}
+                document["pdf_vector"] = to_vector(document["pdf_vector"])
+                self._add_to_buffer(document)
+            copied += len(results)
+            if len(results) < page_size:
+                break
+            last_id = results[-1]["id"]
+            config.app_logger.info(f"Copied {copied} documents from {source_index_name}")
+
+        self.flush()
+        return copied
+
+    def _send_documents(self, documents):
+        """
+        Sends documents to the search index using the configured upload mode.
+
+        Args:
+            documents (list): Prepared documents.
+
+        Returns:
+            list: The per-document IndexingResult objects.
+        """
+        # Vektörler yalnızca SDK'ya verilirken listeye çevrilir
+        documents = [{**document, "pdf_vector": to_list(document["pdf_vector"])} for document in documents]
+        with metrics.time("upload", items=len(documents)):
+            if self.upload_mode == "merge_or_upload":
+                return self.search_client.merge_or_upload_documents(documents=documents)
+            return self.search_client.upload_documents(documents=documents)
+
+    def _upload_batch(self, documents):
+        """
+        Uploads a batch of documents and retries only the documents that failed.
+
+        Azure Cognitive Search reports a result per document, so a partially failed batch is retried
+        with just the failed keys, using exponential backoff between attempts.
+
+        Args:
+            documents (list): Prepared documents to upload.
+        """
+        pending = documents
+        max_retries = self.batch_config["max_retries"]
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(self.batch_config["retry_backoff"] * (2 ** (attempt - 1)))
             try:
-                self.search_client.upload_documents(documents=documents)
+                results = self._send_documents(pending)
+                failed_keys = {result.key for result in results if not result.succeeded}
+                for result in results:
+                    if not result.succeeded:
+                        config.app_logger.error(
+                            f"Document {result.key} failed to index ({result.status_code}): {result.error_message}"
+                        )
             except Exception as e:
-                config.app_logger.error(f"Error during document ingestion: {str(e)}")
-        else:
-            config.app_logger.info("No documents to index.")
\ No newline at end of file
+                config.app_logger.error(f"Error during batch ingestion of {len(pending)} documents: {str(e)}")
+                failed_keys = {document["id"] for document in pending}
+
+            pending = [document for document in pending if document["id"] in failed_keys]
+            if not pending:
+                return
+
+        self.failed_documents.extend(pending)
@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+from indexer_backend import config
+
+try:
+    import prometheus_client
+except ImportError:  # Prometheus dışa aktarımı isteğe bağlıdır
+    prometheus_client = None
+
+
+class PipelineMetrics:
+    """
+    Collects per-stage latencies and token, item and cache counters of an indexing run.
+
+    Stages are timed with the time() context manager or timed(), e.g. pdf_parse, local_cleanup,
+    gpt_cleanup, embedding and upload; the OpenAI stages measure only the API calls and the rate
+    limiters record their waiting as stages of their own. At the end of a run write_report() logs a
+    summary table and writes it as JSON: calls, items, latency percentiles and throughput per stage,
+    and with the worker pools of the pipeline the busy share of every pool, so the bottleneck can be
+    read off directly. When prometheus_client is installed the same values are exported as Prometheus
+    histograms and counters, and start_http_server() makes a long run scrapable while it is running.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = defaultdict(list)
+        self._items = Counter()
+        self._tokens = Counter()
+        self._cache = Counter()
+        self._started = time.perf_counter()
+
+        self._prometheus = None
+        if prometheus_client is not None:
+            self._prometheus = {
+                "latency": prometheus_client.Histogram(
+                    "indexer_stage_duration_seconds", "Latency of the indexing pipeline stages.", ["stage"],
+                    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+                ),
+                "items": prometheus_client.Counter(
+                    "indexer_stage_items_total", "Pages, chunks or documents processed per stage.", ["stage"]
+                ),
+                "tokens": prometheus_client.Counter(
+                    "indexer_tokens_total", "Tokens sent to (in) and received from (out) OpenAI per stage.",
+                    ["stage", "direction"]
+                ),
+                "cache": prometheus_client.Counter(
+                    "indexer_cache_lookups_total", "Cache lookups per cache and result.", ["cache", "result"]
+                ),
+            }
+
+    @contextmanager
+    def time(self, stage, items=1):
+        """
+        Measures the duration of the enclosed block as one call of the stage, also when it raises.
+
+        Args:
+            stage (str): The stage name.
+            items (int, optional): Pages, chunks or documents handled by the call. Defaults to 1.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, items)
+
+    def timed(self, stage, func, items=1):
+        """
+        Wraps a function so every call of it is measured as one call of the stage.
+        """
+        def timed_func(*args, **kwargs):
+            with self.time(stage, items):
+                return func(*args, **kwargs)
+        return timed_func
+
+    def observe(self, stage, seconds, items=1):
+        """
+        Records one call of a stage.
+        """
+        with self._lock:
+            self._durations[stage].append(seconds)
+            self._items[stage] += items
+        if self._prometheus is not None:
+            self._prometheus["latency"].labels(stage).observe(seconds)
+            self._prometheus["items"].labels(stage).inc(items)
+
+    def count_tokens(self, stage, tokens_in=0, tokens_out=0):
+        """
+        Adds prompt (in) and generated (out) tokens to the counters of a stage.
+        """
+        with self._lock:
+            self._tokens[(stage, "in")] += tokens_in
+            self._tokens[(stage, "out")] += tokens_out
+        if self._prometheus is not None:
+            if tokens_in:
+                self._prometheus["tokens"].labels(stage, "in").inc(tokens_in)
+            if tokens_out:
+                self._prometheus["tokens"].labels(stage, "out").inc(tokens_out)
+
+    def count_usage(self, stage, response):
+        """
+        Adds the token usage reported in an OpenAI response to the counters of a stage.
+        """
+        usage = response.get("usage") or {}
+        self.count_tokens(stage, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+    def count_cache(self, cache, hit):
+        """
+        Counts a cache lookup as a hit or a miss.
+        """
+        result = "hit" if hit else "miss"
+        with self._lock:
+            self._cache[(cache, result)] += 1
+        if self._prometheus is not None:
+            self._prometheus["cache"].labels(cache, result).inc()
+
+    def reset(self):
+        """
+        Clears the collected values and restarts the wall clock of the run. Prometheus counters keep counting.
+        """
+        with self._lock:
+            self._durations.clear()
+            self._items.clear()
+            self._tokens.clear()
+            self._cache.clear()
+            self._started = time.perf_counter()
+
+    def summary(self, workers=None):
+        """
+        Summarizes the run so far.
+
+        Args:
+            workers (dict, optional): Worker pools of the pipeline as {pool: (worker threads, stages)}.
+                If given, every pool reports its busy share, the summed time of the stages run by its
+                threads divided by the wall time of the threads; the pool with the highest share is the
+                bottleneck.
+
+        Returns:
+            dict: wall_seconds, stages (calls, items, total/mean/p50/p95/max latency, items_per_second,
+                  tokens_in and tokens_out), pools (workers, stages, busy_share), caches (hits, misses,
+                  hit_rate) and bottleneck.
+        """
+        workers = workers or {}
+        with self._lock:
+            wall_seconds = time.perf_counter() - self._started
+            durations = {stage: np.asarray(values) for stage, values in self._durations.items()}
+            items = dict(self._items)
+            tokens = dict(self._tokens)
+            cache = dict(self._cache)
+
+        stages = {}
+        for stage in sorted(set(durations) | {stage for stage, _ in tokens}):
+            values = durations.get(stage, np.zeros(0))
+            stats = {
+                "calls": len(values),
+                "items": items.get(stage, 0),
+                "total_seconds": round(float(values.sum()), 3),
+                "mean_ms": round(float(values.mean()) * 1000, 2) if len(values) else 0.0,
+                "p50_ms": round(float(np.percentile(values, 50)) * 1000, 2) if len(values) else 0.0,
+                "p95_ms": round(float(np.percentile(values, 95)) * 1000, 2) if len(values) else 0.0,
+                "max_ms": round(float(values.max()) * 1000, 2) if len(values) else 0.0,
+                "items_per_second": round(items.get(stage, 0) / wall_seconds, 2) if wall_seconds else 0.0,
+                "tokens_in": tokens.get((stage, "in"), 0),
+                "tokens_out": tokens.get((stage, "out"), 0)
+            }
+            stages[stage] = stats
+
+        # Aynı iş parçacıklarını paylaşan aşamaların süreleri toplanır, yoksa her biri tüm havuza bölünür
+        pools = {}
+        for pool, (count, pool_stages) in workers.items():
+            busy_seconds = sum(stages[stage]["total_seconds"] for stage in pool_stages if stage in stages)
+            pools[pool] = {
+                "workers": count,
+                "stages": list(pool_stages),
+                "busy_share": round(busy_seconds / (wall_seconds * count), 3) if wall_seconds and count else 0.0
+            }
+
+        caches = {}
+        for name in sorted({name for name, _ in cache}):
+            hits, misses = cache.get((name, "hit"), 0), cache.get((name, "miss"), 0)
+            caches[name] = {"hits": hits, "misses": misses,
+                            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0}
+
+        busy = {pool: stats["busy_share"] for pool, stats in pools.items()}
+        return {
+            "wall_seconds": round(wall_seconds, 3),
+            "stages": stages,
+            "pools": pools,
+            "caches": caches,
+            "bottleneck": max(busy, key=busy.get) if busy else None
+        }
+
+    def write_report(self, path=None, workers=None):
+        """
+        Logs the summary of the run as a table and writes it as JSON.
+
+        Args:
+            path (str, optional): Report file. Defaults to config.METRICS_CONFIG["report_path"]; empty disables the file.
+            workers (dict, optional): Worker pools of the pipeline, see summary().
+
+        Returns:
+            dict: The summary.
+        """
+        path = path if path is not None else config.METRICS_CONFIG["report_path"]
+        summary = self.summary(workers)
+
+        lines = [f"Indexing finished in {summary['wall_seconds']:.1f}s",
+                 f"{'stage':<16}{'calls':>8}{'items':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+                 f"{'items/s':>10}{'tok in':>10}{'tok out':>10}"]
+        for stage, stats in summary["stages"].items():
+            lines.append(f"{stage:<16}{stats['calls']:>8}{stats['items']:>8}{stats['total_seconds']:>10.1f}"
+                         f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['items_per_second']:>10.2f}"
+                         f"{stats['tokens_in']:>10}{stats['tokens_out']:>10}")
+        for pool, stats in summary["pools"].items():
+            lines.append(f"pool {pool}: {stats['workers']} workers {stats['busy_share']:.0%} busy "
+                         f"({', '.join(stats['stages'])})")
+        for name, stats in summary["caches"].items():
+            lines.append(f"cache {name}: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+        if summary["bottleneck"]:
+            lines.append(f"Bottleneck: {summary['bottleneck']}")
+        config.app_logger.info("\n".join(lines))
+
+        if path:
+            try:
+                with open(path, "w", encoding="utf-8") as report_file:
+                    json.dump(summary, report_file, indent=2)
+            except OSError as e:
+                config.app_logger.error(f"Error writing metrics report {path}: {str(e)}")
+        return summary
+
+    def start_http_server(self, port=None):
+        """
+        Serves the Prometheus metrics of the running process on the given port.
+
+        Args:
+            port (int, optional): Defaults to config.METRICS_CONFIG["port"].
+
+        Returns:
+            bool: True if the server was started.
+        """
+        port = port if port is not None else config.METRICS_CONFIG["port"]
+        if prometheus_client is None:
+            config.app_logger.warning("prometheus_client is not installed, metrics are only written to the report")
+            return False
+        prometheus_client.start_http_server(port)
+        config.app_logger.info(f"Serving indexer metrics on port {port}")
+        return True
+
+
+# Süreç genelinde paylaşılan ölçüm nesnesi, app_logger gibi kullanılır
+metrics = PipelineMetrics()
@@ -1,5 +1,6 @@
 import openai
 import config
+from indexer_backend.utils.metrics import metrics
 
 
 class OpenAIClient:
@@ -10,14 +11,42 @@ class OpenAIClient:
     and clean/extract meaningful text from raw PDF content using OpenAI's GPT models.
     """
 
-    def __init__(self, engine):
+    def __init__(self, engine, cache=None, rate_limiter=None):
         """
         Initializes the OpenAIClient with the specified OpenAI engine.
 
         Args:
             engine (str): The OpenAI engine/model to be used for generating completions.
+            cache (ContentCache, optional): Persistent cache for cleaned PDF text. Defaults to None (no caching).
+            rate_limiter (RateLimiter, optional): Shared rate limiter and retry policy for the deployment.
+                Defaults to None (requests are sent directly).
         """
         self.engine = engine
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+
+    def _create_chat_completion(self, messages, max_tokens, stage=None, **kwargs):
+        """
+        Sends a ChatCompletion request, through the rate limiter if one is configured.
+
+        Args:
+            messages (list): The chat messages.
+            max_tokens (int): The maximum number of tokens to generate.
+            stage (str, optional): Metrics stage timing the API request. Defaults to None (not timed).
+
+        Returns:
+            dict: The API response.
+        """
+        kwargs.update(engine=self.engine, messages=messages, max_tokens=max_tokens)
+        create = openai.ChatCompletion.create
+        if stage is not None:
+            create = metrics.timed(stage, create)  # Yalnızca API isteği ölçülür, hız sınırlayıcı beklemesi hariç
+        if self.rate_limiter is None:
+            return create(**kwargs)
+
+        # Kota hesabı için istem jetonlarına üretilebilecek en fazla jeton sayısı eklenir
+        token_count = self.rate_limiter.count_tokens(*[message["content"] for message in messages]) + max_tokens
+        return self.rate_limiter.call(create, token_count, **kwargs)
 
     def compare_texts(self, input_text, system_message):
         """
@@ -33,8 +62,7 @@ class OpenAIClient:
             str: The comparison result generated by the OpenAI model. Returns an error message if an exception occurs.
         """
         try:
-            response = openai.ChatCompletion.create(
-                engine=self.engine,
+            response = self._create_chat_completion(
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": input_text}
@@ -62,8 +90,7 @@ class OpenAIClient:
         """
         system_message = "Extract the contact information (email, phone number, address) from the following text."
         try:
-            response = openai.ChatCompletion.create(
-                engine=self.engine,
+            response = self._create_chat_completion(
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": cv_text}
@@ -87,20 +114,31 @@ class OpenAIClient:
             pdf_raw_text (str): The raw text content extracted from a PDF file.
 
         Returns:
-            str: The cleaned and meaningful text extracted from the PDF. Returns an error message if an exception occurs.
+            str or None: The cleaned and meaningful text extracted from the PDF. Returns None if the request
+                         fails, so an error message is never indexed as page content.
         """
         system_message = "Clean and extract the meaningful text from the following PDF content."
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.engine, system_message, pdf_raw_text)
+            cached_text = self.cache.get_text(cache_key)
+            metrics.count_cache("gpt_cleanup", cached_text is not None)
+            if cached_text is not None:
+                return cached_text
         try:
-            response = openai.ChatCompletion.create(
-                engine=self.engine,
+            response = self._create_chat_completion(
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": pdf_raw_text}
                 ],
-                max_tokens=2000
+                max_tokens=2000,
+                stage="gpt_cleanup"
             )
+            metrics.count_usage("gpt_cleanup", response)
             cleaned_text = response['choices'][0]['message']['content']
+            if cache_key is not None:
+                self.cache.set_text(cache_key, cleaned_text)  # Hata mesajları önbelleğe alınmaz
             return cleaned_text
         except Exception as e:
             config.app_logger.error(f"Error extracting text using GPT: {str(e)}")
-            return "Error extracting text."
+            return None
@@ -0,0 +1,153 @@
+import math
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+# Her işçi sürecinde açık tutulan PDF okuyucu sayısı; aynı anda ayrıştırılan PDF sayısı kadar yeterlidir
+READER_CACHE_SIZE = 4
+
+_readers = OrderedDict()  # (yol, mtime, boyut) -> (dosya, PdfReader), süreç başına
+
+
+def count_pages(pdf_path):
+    """
+    Returns the number of pages of a PDF without extracting any text.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+
+    Returns:
+        int: The page count.
+    """
+    with open(pdf_path, 'rb') as pdf_file:
+        return len(PyPDF2.PdfReader(pdf_file).pages)
+
+
+def _get_reader(pdf_path):
+    """
+    Returns a PdfReader of the PDF, parsing it only on the first request in this process.
+
+    The readers of the most recently used PDFs stay open, so the range tasks of a PDF that land in
+    the same worker process do not parse the document structure again. A changed file gets a new reader.
+    """
+    stat = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+    if key in _readers:
+        _readers.move_to_end(key)
+        return _readers[key][1]
+
+    pdf_file = open(pdf_path, 'rb')
+    try:
+        reader = PyPDF2.PdfReader(pdf_file)
+    except Exception:
+        pdf_file.close()
+        raise
+    _readers[key] = (pdf_file, reader)
+    while len(_readers) > READER_CACHE_SIZE:
+        _, (old_file, _) = _readers.popitem(last=False)
+        old_file.close()
+    return reader
+
+
+def cached_page_count(pdf_path):
+    """
+    Returns the page count of a PDF through the reader cache, so the worker process that counts the
+    pages does not parse the PDF again for its first range task.
+    """
+    return len(_get_reader(pdf_path).pages)
+
+
+def extract_page_range(pdf_path, start, end):
+    """
+    Extracts the raw text of the pages in [start, end) of a PDF.
+
+    This function runs inside the worker processes, so it only depends on PyPDF2. The parsed PDF is
+    cached per process, see _get_reader.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        start (int): Zero-based index of the first page.
+        end (int): Zero-based index after the last page.
+
+    Returns:
+        list: The raw text of each page in the range.
+    """
+    reader = _get_reader(pdf_path)
+    return [reader.pages[page_num].extract_text() for page_num in range(start, end)]
+
+
+class PDFTextExtractor:
+    """
+    Extracts PDF page text in a pool of worker processes.
+
+    PyPDF2's extract_text is pure Python and CPU-bound, so running it on threads only uses a single
+    core. This class splits each PDF into page ranges, extracts them in parallel processes and streams
+    the page texts back in page order, keeping only a bounded number of ranges in flight. PDFs with
+    fewer than workers * pages_per_task pages are split into smaller ranges, so a short PDF is still
+    spread over all processes.
+    """
+
+    def __init__(self, workers=None, pages_per_task=16):
+        """
+        Initializes the process pool.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to the number of CPU cores.
+            pages_per_task (int, optional): Number of pages extracted by one task. Defaults to 16.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, int(pages_per_task))
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def iter_pages(self, pdf_path, on_open=None):
+        """
+        Yields the raw text of each page of a PDF in page order.
+
+        Args:
+            pdf_path (str): Path to the PDF file.
+            on_open (callable, optional): Called with the page count before any page is yielded.
+
+        Yields:
+            tuple: (pdf_name, page_number, text) with page numbers starting from 1.
+        """
+        pdf_name = os.path.basename(pdf_path)
+        # Sayfa sayısı da bir işçi süreçte okunur; PDF ana süreçte hiç ayrıştırılmaz
+        page_count = self._executor.submit(cached_page_count, pdf_path).result()
+        if on_open is not None:
+            on_open(page_count)
+
+        # Kısa PDF'lerde görevler küçültülür ki sayfalar tüm süreçlere dağılsın
+        pages_per_task = max(1, min(self.pages_per_task, math.ceil(page_count / self.workers)))
+        ranges = deque(
+            (start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        )
+        in_flight = deque()
+        max_in_flight = self.workers * 2  # Bellek kullanımını sınırlamak için kuyruktaki görev sayısı kısıtlanır
+
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < max_in_flight:
+                    start, end = ranges.popleft()
+                    in_flight.append((start, self._executor.submit(extract_page_range, pdf_path, start, end)))
+
+                start, future = in_flight.popleft()
+                for offset, text in enumerate(future.result()):
+                    yield pdf_name, start + offset + 1, text
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
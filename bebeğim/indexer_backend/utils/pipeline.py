@@ -0,0 +1,159 @@
+import queue
+import threading
+
+from indexer_backend import config
+
+_SENTINEL = object()
+
+
+class PipelineStage:
+    """
+    A single stage of a StagedPipeline.
+
+    Each stage owns a pool of worker threads that consume items from the stage's input queue,
+    process them with the stage function, and emit zero or more items to the next stage.
+    """
+
+    def __init__(self, name, func, workers, batch_size=None):
+        """
+        Initializes the stage.
+
+        Args:
+            name (str): The name of the stage, used in log messages.
+            func (callable): Called as func(item, emit) for every item; emit(output) forwards to the next stage.
+            workers (int): Number of worker threads running this stage.
+            batch_size (int, optional): If set, func receives a list of up to batch_size items that were
+                already waiting in the queue instead of a single item.
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size)) if batch_size else None
+
+
+class StagedPipeline:
+    """
+    A thread-based pipeline that connects stages with bounded queues.
+
+    Because every queue has a maximum size, a slow stage blocks the stages in front of it
+    (backpressure), so the number of in-flight items and therefore memory usage stays flat
+    regardless of the input size.
+    """
+
+    def __init__(self, queue_size=32):
+        """
+        Initializes an empty pipeline.
+
+        Args:
+            queue_size (int, optional): Maximum number of items waiting between two stages. Defaults to 32.
+        """
+        self.queue_size = max(1, int(queue_size))
+        self.stages = []
+
+    def add_stage(self, name, func, workers=1, batch_size=None):
+        """
+        Appends a stage to the end of the pipeline.
+
+        Args:
+            name (str): The name of the stage.
+            func (callable): Called as func(item, emit) for every item, or func(items, emit) for batched stages.
+            workers (int, optional): Number of worker threads for this stage. Defaults to 1.
+            batch_size (int, optional): Maximum number of items handed to func at once. Defaults to None (no batching).
+
+        Returns:
+            StagedPipeline: The pipeline itself, so calls can be chained.
+        """
+        self.stages.append(PipelineStage(name, func, workers, batch_size))
+        return self
+
+    def run(self, items):
+        """
+        Feeds the given items into the first stage and blocks until every stage has drained.
+
+        Args:
+            items (iterable): The input items for the first stage.
+        """
+        if not self.stages:
+            return
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            in_queue = queues[index]
+            next_queue = queues[index + 1] if index + 1 < len(self.stages) else None
+            next_workers = self.stages[index + 1].workers if next_queue is not None else 0
+            threads.extend(self._start_stage(stage, in_queue, next_queue, next_workers))
+
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            # İlk aşamanın tüm işçilerine bitiş sinyali gönder
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_SENTINEL)
+
+        for thread in threads:
+            thread.join()
+
+    def _start_stage(self, stage, in_queue, next_queue, next_workers):
+        """
+        Starts the worker threads of a stage.
+
+        The last worker of a stage to finish forwards one sentinel per worker of the next stage,
+        so the shutdown propagates through the pipeline in order.
+
+        Returns:
+            list: The started threads.
+        """
+        lock = threading.Lock()
+        remaining = [stage.workers]
+
+        def emit(output):
+            if next_queue is not None:
+                next_queue.put(output)
+
+        def next_batch():
+            # İlk öğeyi bekle, ardından kuyrukta hazır bekleyenleri batch_size'a kadar topla
+            item = in_queue.get()
+            if item is _SENTINEL:
+                return [], True
+            batch = [item]
+            while len(batch) < stage.batch_size:
+                try:
+                    item = in_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _SENTINEL:
+                    return batch, True
+                batch.append(item)
+            return batch, False
+
+        def worker():
+            finished = False
+            while not finished:
+                if stage.batch_size:
+                    work, finished = next_batch()
+                    if not work:
+                        break
+                else:
+                    work = in_queue.get()
+                    if work is _SENTINEL:
+                        break
+                try:
+                    stage.func(work, emit)
+                except Exception as e:
+                    config.app_logger.error(f"Error in pipeline stage '{stage.name}': {str(e)}")
+
+            with lock:
+                remaining[0] -= 1
+                is_last = remaining[0] == 0
+            if is_last and next_queue is not None:
+                for _ in range(next_workers):
+                    next_queue.put(_SENTINEL)
+
+        threads = []
+        for i in range(stage.workers):
+            thread = threading.Thread(target=worker, name=f"{stage.name}-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+
+import openai
+
+from indexer_backend import config
+from indexer_backend.utils.metrics import metrics
+
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+    openai.error.TryAgain,
+    openai.error.APIError,
+)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that refills continuously at a per-minute rate.
+    """
+
+    def __init__(self, per_minute):
+        """
+        Args:
+            per_minute (int): Bucket capacity and refill rate per minute.
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount):
+        """
+        Blocks until the given amount is available and takes it from the bucket.
+
+        Args:
+            amount (int): The amount to take. Amounts above the capacity are capped at the capacity.
+        """
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of in-flight requests and adapts the limit to observed throttling.
+
+    The limit is halved on every 429 response and grows by one after a full window of successful
+    requests (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """
+    A shared rate limiter and retry policy for Azure OpenAI calls.
+
+    Every call first takes one request and its estimated tokens from per-minute token buckets, then
+    waits for a slot of the adaptive concurrency limiter. Throttled and transient failures are retried
+    with exponential backoff and jitter, honoring the Retry-After header; a 429 also pauses all callers
+    sharing the limiter so the quota can recover. The time a call spends waiting, outside the API
+    request itself, is recorded as the wait_stage of the pipeline metrics.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_concurrency, max_retries=6,
+                 base_delay=1.0, max_delay=60.0, wait_stage=None):
+        """
+        Args:
+            requests_per_minute (int): Request quota of the deployment.
+            tokens_per_minute (int): Token quota of the deployment.
+            max_concurrency (int): Upper bound for concurrent requests.
+            max_retries (int, optional): Retries after the first attempt. Defaults to 6.
+            base_delay (float, optional): Initial backoff in seconds. Defaults to 1.0.
+            max_delay (float, optional): Maximum backoff in seconds. Defaults to 60.0.
+            wait_stage (str, optional): Metrics stage of the waiting time. Defaults to None (not recorded).
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.wait_stage = wait_stage
+        self._paused_until = 0.0
+        self._pause_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, name):
+        """
+        Creates a limiter from an entry of config.OPENAI_RATE_LIMITS.
+
+        Args:
+            name (str): The entry name, e.g. "gpt" or "ada".
+
+        Returns:
+            RateLimiter: The configured limiter.
+        """
+        limits = config.OPENAI_RATE_LIMITS[name]
+        return cls(
+            requests_per_minute=limits["requests_per_minute"],
+            tokens_per_minute=limits["tokens_per_minute"],
+            max_concurrency=limits["max_concurrency"],
+            max_retries=config.OPENAI_RETRY_CONFIG["max_retries"],
+            base_delay=config.OPENAI_RETRY_CONFIG["base_delay"],
+            max_delay=config.OPENAI_RETRY_CONFIG["max_delay"],
+            wait_stage=f"{name}_rate_limit",
+        )
+
+    @staticmethod
+    def count_tokens(*texts):
+        """
+        Counts the tokens of the given texts with the configured tiktoken encoding.
+
+        Returns:
+            int: The total token count.
+        """
+        return sum(len(config.encoding.encode(text or "")) for text in texts)
+
+    def call(self, func, token_count, **kwargs):
+        """
+        Calls an OpenAI API function under the rate limits, retrying throttled and transient errors.
+
+        Args:
+            func (callable): The API function, e.g. openai.ChatCompletion.create.
+            token_count (int): Estimated tokens consumed by the request (prompt plus max output).
+            **kwargs: Arguments passed to func.
+
+        Returns:
+            The API response.
+
+        Raises:
+            openai.error.OpenAIError: If the request fails with a non-retryable error or retries are exhausted.
+        """
+        start, request_seconds = time.perf_counter(), 0.0
+        try:
+            for attempt in range(self.max_retries + 1):
+                self._wait_if_paused()
+                self.request_bucket.acquire(1)
+                self.token_bucket.acquire(token_count)
+
+                self.concurrency.acquire()
+                throttled = False
+                request_start = time.perf_counter()
+                try:
+                    return func(**kwargs)
+                except RETRYABLE_ERRORS as e:
+                    throttled = isinstance(e, openai.error.RateLimitError)
+                    if attempt == self.max_retries or not self._is_retryable(e):
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                    if throttled:
+                        self._pause(delay)
+                    config.app_logger.warning(
+                        f"OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1}/{self.max_retries})"
+                    )
+                finally:
+                    request_seconds += time.perf_counter() - request_start
+                    self.concurrency.release(throttled)
+                time.sleep(delay)
+        finally:
+            if self.wait_stage is not None:
+                # İsteklerin dışında geçen süre kota, eşzamanlılık ve yeniden deneme beklemesidir
+                metrics.observe(self.wait_stage, time.perf_counter() - start - request_seconds)
+
+    @staticmethod
+    def _is_retryable(error):
+        # APIError yalnızca sunucu taraflı (5xx) hatalarda tekrar denenir
+        if type(error) is openai.error.APIError:
+            return error.http_status is None or error.http_status >= 500
+        return True
+
+    def _retry_delay(self, error, attempt):
+        """
+        Returns the Retry-After delay of the error if present, otherwise exponential backoff with jitter.
+        """
+        headers = getattr(error, "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return min(self.max_delay, float(headers["retry-after-ms"]) / 1000.0)
+            if headers.get("retry-after"):
+                return min(self.max_delay, float(headers["retry-after"]))
+        except (TypeError, ValueError):
+            pass
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(backoff / 2, backoff)
+
+    def _pause(self, delay):
+        with self._pause_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _wait_if_paused(self):
+        remaining = self._paused_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
@@ -1,7 +1,11 @@
+import json
+import os
+
 from azure.search.documents import SearchClient
 from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
 from search_backend import config
+from indexer_backend.utils.vectors import to_list
 
 class AISearcher:
     """
@@ -42,7 +46,7 @@ class AISearcher:
         try:
             # Create a VectorizedQuery to search for similar vectors in the "pdf_vector" field
             vector_query = VectorizedQuery(
-                vector=question_embedding,
+                vector=to_list(question_embedding),
                 k_nearest_neighbors=top_k,
                 fields="pdf_vector",
                 exhaustive=True  # Set to True for exact nearest neighbor search
@@ -96,3 +100,124 @@ class AISearcher:
         except Exception as e:
             config.app_logger.error(f"Error checking if page is indexed: {str(e)}")
             return False
+
+    def get_document_count(self):
+        """
+        Returns the number of documents in the index, or None if it cannot be read.
+        """
+        try:
+            return self.search_client.get_document_count()
+        except Exception as e:
+            config.app_logger.error(f"Error retrieving document count: {str(e)}")
+            return None
+
+    @staticmethod
+    def manifest_source():
+        """
+        Identifies the index a manifest was written for.
+        """
+        return {
+            "endpoint": config.COGNITIVE_SEARCH_CONFIG["endpoint"],
+            "index_name": config.COGNITIVE_SEARCH_CONFIG["index_name"]
+        }
+
+    def get_indexed_pages(self, manifest_path=None, refresh=False, page_size=1000):
+        """
+        Retrieves every (pdf_name, page_number) pair in the index with a single paged scan.
+
+        Only the id, pdf_name and page_number fields are selected, so the scan is cheap compared to
+        one filtered query per page. The index is read in pages ordered by document key, so large
+        (chunked) indexes are not cut off by the skip limit of the search API. If manifest_path is given, the result is persisted there as a
+        local manifest and reused on the next run instead of scanning the index again, as long as the
+        manifest was written for the same endpoint and index and the document count of the index has
+        not changed since (see load_manifest).
+
+        Args:
+            manifest_path (str, optional): Path of the local JSON manifest file. Defaults to None.
+            refresh (bool, optional): If True, ignores an existing manifest and rescans the index. Defaults to False.
+            page_size (int, optional): Documents read per request. Defaults to 1000.
+
+        Returns:
+            set or None: A set of (pdf_name, page_number) tuples, or None if the index could not be scanned.
+        """
+        if manifest_path and not refresh and os.path.exists(manifest_path):
+            pages = self.load_manifest(manifest_path)
+            if pages is not None:
+                return pages
+
+        pages, last_id = set(), None
+        try:
+            while True:
+                safe_last_id = last_id.replace("'", "''") if last_id is not None else None
+                results = list(self.search_client.search(
+                    search_text="*",
+                    filter=f"id gt '{safe_last_id}'" if last_id is not None else None,
+                    order_by=["id asc"],
+                    select=["id", "pdf_name", "page_number"],
+                    top=page_size
+                ))
+                pages.update((result["pdf_name"], result["page_number"]) for result in results)
+                if len(results) < page_size:
+                    break
+                last_id = results[-1]["id"]
+        except Exception as e:
+            config.app_logger.error(f"Error listing indexed pages: {str(e)}")
+            return None
+
+        if manifest_path:
+            self.save_manifest(pages, manifest_path)
+        return pages
+
+    def load_manifest(self, manifest_path):
+        """
+        Loads an indexed-pages manifest written by save_manifest.
+
+        The manifest is only used if it belongs to the configured endpoint and index and the index still
+        holds the number of documents recorded with it; a recreated, migrated or different index makes it
+        stale, and trusting it would skip pages that are not in the index.
+
+        Args:
+            manifest_path (str): Path of the manifest file.
+
+        Returns:
+            set or None: A set of (pdf_name, page_number) tuples, or None if the file cannot be read or is stale.
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except Exception as e:
+            config.app_logger.error(f"Error reading manifest {manifest_path}: {str(e)}")
+            return None
+
+        # Eski biçimdeki (düz liste) manifestlerin hangi indekse ait olduğu bilinmez
+        if not isinstance(manifest, dict) or manifest.get("source") != self.manifest_source():
+            config.app_logger.info(f"Manifest {manifest_path} belongs to another index, rescanning the index")
+            return None
+        document_count = self.get_document_count()
+        if document_count is None or manifest.get("document_count") != document_count:
+            config.app_logger.info(f"Manifest {manifest_path} is out of date, rescanning the index")
+            return None
+        return {(pdf_name, page_number) for pdf_name, page_number in manifest["pages"]}
+
+    def save_manifest(self, pages, manifest_path):
+        """
+        Writes the indexed pages to a local JSON manifest file, together with the endpoint, index name
+        and current document count of the index.
+
+        Args:
+            pages (set): A set of (pdf_name, page_number) tuples.
+            manifest_path (str): Path of the manifest file.
+        """
+        try:
+            manifest = {
+                "source": self.manifest_source(),
+                "document_count": self.get_document_count(),
+                "pages": sorted(pages)
+            }
+            # Yarım kalmış bir dosya bırakmamak için önce geçici dosyaya yazıyoruz
+            temp_path = f"{manifest_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file, ensure_ascii=False)
+            os.replace(temp_path, manifest_path)
+        except Exception as e:
+            config.app_logger.error(f"Error writing manifest {manifest_path}: {str(e)}")
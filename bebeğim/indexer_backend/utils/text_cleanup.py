@@ -0,0 +1,182 @@
+import re
+import string
+import unicodedata
+from collections import Counter
+
+from indexer_backend import config
+
+# Windows-1252 olarak okunmuş Windows-1254 (Türkçe) karakterleri
+TURKISH_MOJIBAKE = str.maketrans({"ý": "ı", "Ý": "İ", "þ": "ş", "Þ": "Ş", "ð": "ğ", "Ð": "Ğ"})
+TURKISH_LETTERS = set("ıİşŞğĞ")
+INVISIBLE_CHARACTERS = dict.fromkeys(map(ord, "\u00ad\u200b\u200c\u200d\ufeff"))  # yumuşak tire, sıfır genişlikli karakterler
+SPACE_CHARACTERS = dict.fromkeys(map(ord, "\u00a0\u2007\u202f\t\f\v"), " ")
+PUNCTUATION = string.punctuation + "“”‘’«»…–—•·"
+
+HYPHENATED_BREAK = re.compile(r"(\w)-[ \t]*\n[ \t]*(\w)")
+SENTENCE_END = re.compile(r"[.!?…:;]\s*$")
+NUMBER_LIKE = re.compile(r"^[\d.,:/%+\-]+$")
+# Tireli kelimeler, e-posta adresleri ve ürün kodları (ör. "AB-1234/X", "destek@firma.com.tr")
+COMPOUND_WORD = re.compile(r"^\w+(?:[-./@+]\w+)+$")
+
+
+def normalize_line(line):
+    """
+    Returns the form of a line used to recognize repeated headers and footers: digits (page numbers,
+    dates) are masked, whitespace is collapsed and case is folded.
+    """
+    return re.sub(r"\s+", " ", re.sub(r"\d+", "#", line)).strip().casefold()
+
+
+class TextCleaner:
+    """
+    A local, deterministic replacement for GPT cleanup of well-extracted pages.
+
+    The cleaner normalizes Unicode (NFKC, Turkish dotted i, Windows-1254 mojibake), removes headers
+    and footers that repeat across the pages of a PDF, repairs words hyphenated across lines and
+    joins lines that were broken inside a sentence. quality_score estimates how readable the result
+    is; only pages below the threshold need to be cleaned by GPT.
+    """
+
+    def __init__(self, quality_threshold=None, edge_lines=None, min_share=None):
+        """
+        Args:
+            quality_threshold (float, optional): Minimum quality score of a page that is not sent to GPT.
+                Defaults to config.LOCAL_CLEANUP_CONFIG["quality_threshold"].
+            edge_lines (int, optional): Lines at the top and bottom of a page checked for headers and footers.
+                Defaults to config.LOCAL_CLEANUP_CONFIG["boilerplate_edge_lines"].
+            min_share (float, optional): Share of the pages a line must appear on to count as header or footer.
+                Defaults to config.LOCAL_CLEANUP_CONFIG["boilerplate_min_share"].
+        """
+        cleanup_config = config.LOCAL_CLEANUP_CONFIG
+        self.quality_threshold = (quality_threshold if quality_threshold is not None
+                                  else cleanup_config["quality_threshold"])
+        self.edge_lines = edge_lines if edge_lines is not None else cleanup_config["boilerplate_edge_lines"]
+        self.min_share = min_share if min_share is not None else cleanup_config["boilerplate_min_share"]
+
+    def _edge_indexes(self, lines):
+        """
+        Returns the indexes of the first and last edge_lines non-empty lines of a page.
+
+        Pages with at most 2 * edge_lines non-empty lines have no edges: all of their lines could be
+        taken for header or footer, and the page would be emptied.
+        """
+        indexes = [index for index, line in enumerate(lines) if line.strip()]
+        if len(indexes) <= 2 * self.edge_lines:
+            return []
+        return indexes[:self.edge_lines] + indexes[-self.edge_lines:]
+
+    def detect_boilerplate(self, page_texts):
+        """
+        Finds the header and footer lines repeated across pages of the same PDF.
+
+        Args:
+            page_texts (list): Raw texts of (a sample of) the pages of a PDF.
+
+        Returns:
+            frozenset: Normalized lines (see normalize_line) to strip from the top and bottom of every page.
+        """
+        page_texts = [text for text in page_texts if text and text.strip()]
+        if len(page_texts) < 3:
+            return frozenset()
+
+        counts = Counter()
+        for text in page_texts:
+            lines = self.normalize_unicode(text).splitlines()
+            counts.update({normalize_line(lines[index]) for index in self._edge_indexes(lines)})
+        minimum = max(2, self.min_share * len(page_texts))
+        return frozenset(line for line, count in counts.items() if line and count >= minimum)
+
+    @staticmethod
+    def normalize_unicode(text):
+        """
+        Normalizes Unicode for Turkish text: compatibility characters and ligatures, decomposed dotted i,
+        invisible characters, non-standard spaces and Windows-1254 text decoded as Windows-1252.
+        """
+        text = unicodedata.normalize("NFKC", text)
+        text = text.replace("i\u0307", "i").translate(INVISIBLE_CHARACTERS).translate(SPACE_CHARACTERS)
+        # ı/ş/ğ hiç yokken ý/þ/ð varsa metin yanlış kod sayfasıyla çözülmüştür
+        if not TURKISH_LETTERS.intersection(text) and any(char in text for char in "ýÝþÞðÐ"):
+            text = text.translate(TURKISH_MOJIBAKE)
+        return text
+
+    def clean(self, text, boilerplate=frozenset()):
+        """
+        Cleans the raw text of a page.
+
+        Args:
+            text (str): The raw page text extracted by PyPDF2.
+            boilerplate (frozenset, optional): Header and footer lines returned by detect_boilerplate.
+
+        Returns:
+            str: The cleaned page text, with paragraphs separated by blank lines.
+        """
+        lines = [line.strip() for line in self.normalize_unicode(text).splitlines()]
+
+        if boilerplate:
+            edges = set(self._edge_indexes(lines))
+            lines = [line for index, line in enumerate(lines)
+                     if index not in edges or normalize_line(line) not in boilerplate]
+
+        text = HYPHENATED_BREAK.sub(r"\1\2", "\n".join(lines))
+
+        # Cümle ortasında bölünmüş satırlar birleştirilir, boş satırlar paragraf sınırı olarak kalır
+        paragraphs, current = [], []
+        for line in text.split("\n"):
+            line = re.sub(r" {2,}", " ", line)
+            if not line:
+                if current:
+                    paragraphs.append(" ".join(current))
+                    current = []
+                continue
+            if current and SENTENCE_END.search(current[-1]) and line[:1].isupper():
+                paragraphs.append(" ".join(current))
+                current = []
+            current.append(line)
+        if current:
+            paragraphs.append(" ".join(current))
+        return "\n\n".join(paragraphs)
+
+    @staticmethod
+    def quality_score(text):
+        """
+        Estimates how well a page was extracted, from 0.0 (garbled) to 1.0 (clean prose).
+
+        The score is the share of tokens that look like words, numbers or compound tokens (hyphenated
+        words, e-mail addresses, product codes), reduced for a low share of letters, letter-spaced
+        text ("b u   m e t i n"), glued words, and replacement, private-use or mojibake characters.
+
+        Args:
+            text (str): The (locally cleaned) page text.
+
+        Returns:
+            float: The quality score.
+        """
+        tokens = text.split()
+        if not tokens:
+            return 0.0
+
+        words = [token.strip(PUNCTUATION) for token in tokens]
+        valid = sum(1 for word in words
+                    if not word or NUMBER_LIKE.match(word)
+                    or (len(word) <= 30 and (word.isalnum() or COMPOUND_WORD.match(word))))
+        single_letters = sum(1 for word in words if len(word) == 1 and word.isalpha())
+        long_tokens = sum(1 for word in words if len(word) > 30)
+
+        characters = [char for char in text if not char.isspace()]
+        letters = sum(1 for char in characters if char.isalpha())
+        bad = sum(1 for char in characters
+                  if char == "\ufffd" or "\ue000" <= char <= "\uf8ff" or unicodedata.category(char) == "Cc")
+        bad += len(re.findall(r"Ã.|Ä.|Å.", text))
+
+        score = valid / len(tokens)
+        score *= min(1.0, (letters / len(characters)) / 0.6)
+        score *= 1.0 - min(1.0, max(0.0, single_letters / len(tokens) - 0.1) * 2)
+        score *= 1.0 - min(1.0, long_tokens / len(tokens) * 5)
+        score *= 1.0 - min(1.0, bad / len(characters) * 50)
+        return score
+
+    def needs_gpt(self, text):
+        """
+        Returns True if the locally cleaned text is not good enough to be indexed without GPT cleanup.
+        """
+        return self.quality_score(text) < self.quality_threshold
@@ -0,0 +1,130 @@
+# benchmark_search.py
+#
+# Arama modlarının (exact, approximate, rerank) recall@k ve gecikmesini yerel vektör deposu üzerinde ölçer.
+# Kullanım: python benchmark_search.py --store vector_store --questions sorular.txt --ef-search 50,100,500
+#           python benchmark_search.py --approximate-index ivf --probes 4,8,16
+#           python benchmark_search.py --synthetic 50000   (Azure ve OpenAI olmadan, sentetik veriyle)
+#
+# HNSW ölçümü için hnswlib kurulu olmalıdır (isteğe bağlı, bkz. requirements.txt); kurulu değilse IVF ölçülür.
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import config
+from utils.vector_store import LocalVectorStore
+from utils.vectors import VECTOR_DTYPES
+
+
+def make_synthetic_store(directory, pages, dimension, clusters, dtype=None, seed=0):
+    """
+    Writes a vector store of clustered random vectors, standing in for page embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+
+    def documents():
+        for page in range(pages):
+            vector = centers[page % clusters] + 0.5 * rng.standard_normal(dimension).astype(np.float32)
+            yield {"id": str(page), "pdf_name": "synthetic.pdf", "page_number": page, "content": "",
+                   "pdf_vector": vector}
+
+    LocalVectorStore.write(directory, documents(), dimension=dimension, dtype=dtype)
+
+
+def load_queries(store, questions_path, count, seed=0):
+    """
+    Returns query vectors: embeddings of the questions in questions_path (one per line) if given,
+    otherwise perturbed page vectors of the store.
+    """
+    if questions_path:
+        from src.embedder.embedder import Embedder
+
+        with open(questions_path, "r", encoding="utf-8") as questions_file:
+            questions = [line.strip() for line in questions_file if line.strip()][:count]
+        return [embedding for embedding in Embedder().embed_batch(questions) if embedding is not None]
+
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(store), min(count, len(store)), replace=False)
+    return [store.vectors_at(row) + 0.05 * rng.standard_normal(store.dimension).astype(np.float32)
+            for row in rows]
+
+
+def measure(store, queries, truth, top_k, mode, rerank_candidates=None):
+    """
+    Runs every query in the given mode.
+
+    Returns:
+        tuple: (recall@k against the exact results, p50 latency in ms, p95 latency in ms)
+    """
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = store.search(query, top_k, mode=mode, rerank_candidates=rerank_candidates)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(expected & {result["id"] for result in results})
+    recall = hits / sum(len(expected) for expected in truth)
+    return recall, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall@k and latency of the vector search modes.")
+    parser.add_argument("--store", default=config.LOCAL_VECTOR_STORE_CONFIG["path"],
+                        help="Vector store directory written by export_index.py.")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark a synthetic store with this many pages.")
+    parser.add_argument("--questions", help="Text file with one question per line, embedded as queries.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries.")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query.")
+    parser.add_argument("--ef-search", default=str(config.HNSW_CONFIG["ef_search"]),
+                        help="Comma separated efSearch values swept with the HNSW index.")
+    parser.add_argument("--probes", default=str(config.LOCAL_VECTOR_STORE_CONFIG["ivf_probes"]),
+                        help="Comma separated probe counts swept with the IVF index.")
+    parser.add_argument("--rerank-candidates", type=int, default=config.SEARCH_MODE_CONFIG["rerank_candidates"],
+                        help="Candidates rescored in rerank mode.")
+    parser.add_argument("--approximate-index", choices=["hnsw", "ivf"],
+                        default=config.LOCAL_VECTOR_STORE_CONFIG["approximate_index"])
+    parser.add_argument("--dtype", choices=VECTOR_DTYPES, default=config.LOCAL_VECTOR_STORE_CONFIG["dtype"],
+                        help="Vector storage format of the synthetic store.")
+    args = parser.parse_args()
+
+    directory = args.store
+    if args.synthetic:
+        directory = os.path.join(tempfile.mkdtemp(), "vector_store")
+        make_synthetic_store(directory, args.synthetic, config.EMBEDDING_DIMENSION,
+                             clusters=max(1, args.synthetic // 500), dtype=args.dtype)
+
+    store = LocalVectorStore(directory, approximate_index=args.approximate_index)
+    if store.approximate_index != args.approximate_index:
+        print(f"{args.approximate_index} is not available, measuring the {store.approximate_index} index instead")
+    queries = load_queries(store, args.questions, args.queries)
+    if not queries:
+        print("Sorgu bulunamadı.")
+        return
+
+    start = time.perf_counter()
+    store.ensure_approximate_index()
+    print(f"{store.approximate_index} index ready in {time.perf_counter() - start:.1f}s for {len(store)} {store.dtype} pages")
+
+    truth = [{result["id"] for result in store.search(query, args.top_k, mode="exact")} for query in queries]
+
+    param = "ef" if store.approximate_index == "hnsw" else "probes"
+    print(f"{'mode':<14}{param:>8}{f'recall@{args.top_k}':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    recall, p50, p95 = measure(store, queries, truth, args.top_k, "exact")
+    print(f"{'exact':<14}{'-':>8}{recall:>12.3f}{p50:>10.2f}{p95:>10.2f}")
+
+    sweep = args.ef_search if store.approximate_index == "hnsw" else args.probes
+    for value in [int(value) for value in sweep.split(",") if value.strip()]:
+        if store.approximate_index == "hnsw":
+            store.ef_search = value
+        else:
+            store.ivf_probes = value
+        for mode in ("approximate", "rerank"):
+            recall, p50, p95 = measure(store, queries, truth, args.top_k, mode, args.rerank_candidates)
+            print(f"{mode:<14}{value:>8}{recall:>12.3f}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
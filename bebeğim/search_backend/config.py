@@ -43,6 +43,13 @@ openai.api_version = AZURE_OPENAI_CONFIG['api_version']
 
 encoding = tiktoken.encoding_for_model("gpt-4o")
 
+# Embedding request packing limits
+EMBEDDING_BATCH_CONFIG = {
+    'max_items': int(os.getenv('EMBEDDING_BATCH_MAX_ITEMS', 16)),
+    'max_tokens': int(os.getenv('EMBEDDING_BATCH_MAX_TOKENS', 8000)),
+    'max_item_tokens': 8191
+}
+
 EMAIL_CONFIG = {
     'smtp_server': os.getenv('SMTP_SERVER'),
     'smtp_port': os.getenv('SMTP_PORT'),
@@ -53,6 +60,85 @@ EMAIL_CONFIG = {
 }
 
 
+# Question embedding cache (in-process LRU + TTL, optional SQLite file shared between workers)
+QUERY_EMBEDDING_CACHE_CONFIG = {
+    'max_entries': int(os.getenv('QUERY_EMBEDDING_CACHE_MAX_ENTRIES', 4096)),
+    'ttl_seconds': float(os.getenv('QUERY_EMBEDDING_CACHE_TTL', 24 * 60 * 60)),
+    'shared_path': os.getenv('QUERY_EMBEDDING_CACHE_SHARED_PATH') or None,
+    'dtype': os.getenv('QUERY_EMBEDDING_CACHE_DTYPE', 'float32')  # float32, float16 or int8
+}
+
+
+# Semantic answer cache for /chat
+SEMANTIC_CACHE_CONFIG = {
+    'enabled': os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true',
+    'similarity_threshold': float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.95)),
+    'max_entries': int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', 1000)),
+    'ttl_seconds': float(os.getenv('SEMANTIC_CACHE_TTL', 60 * 60)),
+    'index_check_interval': float(os.getenv('SEMANTIC_CACHE_INDEX_CHECK_INTERVAL', 60))
+}
+
+
+# /search/batch limits
+BATCH_SEARCH_CONFIG = {
+    'max_questions': int(os.getenv('BATCH_SEARCH_MAX_QUESTIONS', 1000)),
+    'max_concurrency': int(os.getenv('BATCH_SEARCH_MAX_CONCURRENCY', 16)),
+    'max_top_k': int(os.getenv('BATCH_SEARCH_MAX_TOP_K', 100))
+}
+
+
+# Token budget for the /chat prompt context
+CONTEXT_CONFIG = {
+    'max_tokens': int(os.getenv('CHAT_CONTEXT_MAX_TOKENS', 6000)),
+    'dedup_threshold': float(os.getenv('CHAT_CONTEXT_DEDUP_THRESHOLD', 0.8)),
+    'min_page_tokens': int(os.getenv('CHAT_CONTEXT_MIN_PAGE_TOKENS', 50))
+}
+
+
+# Retrieval backend: "azure" (Azure AI Search) or "local" (LocalVectorStore loaded from an index export)
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'azure')
+
+LOCAL_VECTOR_STORE_CONFIG = {
+    'path': os.getenv('LOCAL_VECTOR_STORE_PATH', 'vector_store'),
+    'approximate_index': os.getenv('LOCAL_VECTOR_STORE_APPROXIMATE_INDEX', 'hnsw'),  # hnsw (needs hnswlib) or ivf
+    'ivf_lists': int(os.getenv('LOCAL_VECTOR_STORE_IVF_LISTS', 0)),  # 0: sqrt(page count)
+    'ivf_probes': int(os.getenv('LOCAL_VECTOR_STORE_IVF_PROBES', 8)),
+    'dtype': os.getenv('LOCAL_VECTOR_STORE_DTYPE', 'float32')  # float32, float16 or int8 (used by export_index.py)
+}
+
+# HNSW graph parameters, used for new Azure indexes and the local HNSW index
+HNSW_CONFIG = {
+    'm': int(os.getenv('HNSW_M', 4)),
+    'ef_construction': int(os.getenv('HNSW_EF_CONSTRUCTION', 400)),
+    'ef_search': int(os.getenv('HNSW_EF_SEARCH', 500))
+}
+
+# Vector field settings of the Azure index (see VECTOR_INDEX_CONFIG of the indexer). When the vectors are
+# not stored, rerank mode leaves rescoring of compressed vectors to the service instead of the client.
+VECTOR_INDEX_CONFIG = {
+    'compression': os.getenv('VECTOR_COMPRESSION', 'none'),  # none, scalar or binary
+    'rescore': os.getenv('VECTOR_RESCORE', 'true').lower() == 'true',
+    'oversampling': float(os.getenv('VECTOR_OVERSAMPLING', 4)),
+    'stored': os.getenv('VECTOR_STORED', 'true').lower() == 'true'
+}
+
+# Vector search modes: exact (exhaustive), approximate (HNSW), rerank (HNSW candidates rescored exactly)
+# or hybrid (keyword + exact vector search)
+SEARCH_MODE_CONFIG = {
+    'default_mode': os.getenv('SEARCH_MODE', 'exact'),
+    'rerank_candidates': int(os.getenv('SEARCH_RERANK_CANDIDATES', 50))
+}
+
+# Hybrid (BM25 keyword + vector) search fused with reciprocal rank fusion
+HYBRID_SEARCH_CONFIG = {
+    'candidates': int(os.getenv('HYBRID_SEARCH_CANDIDATES', 50)),  # results taken from each ranking
+    'rrf_k': int(os.getenv('HYBRID_SEARCH_RRF_K', 60)),
+    'vector_weight': float(os.getenv('HYBRID_SEARCH_VECTOR_WEIGHT', 1.0)),
+    'keyword_weight': float(os.getenv('HYBRID_SEARCH_KEYWORD_WEIGHT', 1.0)),
+    'prefix_length': int(os.getenv('HYBRID_SEARCH_PREFIX_LENGTH', 5))  # Turkish prefix stemming of the local BM25 index
+}
+
+
 PORT = "8000"
 HOST = "0.0.0.0"
 CONCURRENCY_LIMIT = 50
@@ -0,0 +1,70 @@
+# export_index.py
+#
+# Azure AI Search indeksindeki tüm sayfaları yerel vektör deposuna (LocalVectorStore) aktarır.
+# Kullanım: python export_index.py [hedef_dizin] [--dtype float32|float16|int8]
+
+import argparse
+
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents import SearchClient
+
+import config
+from utils.vector_store import LocalVectorStore
+from utils.vectors import VECTOR_DTYPES
+
+
+def iter_index_documents(search_client, page_size=1000):
+    """
+    Yields every document of the index together with its embedding.
+
+    The index is read in pages ordered by document key, so the export is not limited by the skip
+    limit of the search API.
+
+    Args:
+        search_client (SearchClient): Client of the index to export.
+        page_size (int, optional): Documents read per request. Defaults to 1000.
+
+    Yields:
+        dict: id, pdf_name, page_number, content and pdf_vector of a page.
+    """
+    exported, last_id = 0, None
+    while True:
+        safe_last_id = last_id.replace("'", "''") if last_id is not None else None
+        results = list(search_client.search(
+            search_text="*",
+            filter=f"id gt '{safe_last_id}'" if last_id is not None else None,
+            order_by=["id asc"],
+            select=["id", "pdf_name", "page_number", "content", "pdf_vector"],
+            top=page_size
+        ))
+        yield from results
+        exported += len(results)
+        if len(results) < page_size:
+            break
+        last_id = results[-1]["id"]
+        config.app_logger.info(f"Exported {exported} pages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the search index into a local vector store.")
+    parser.add_argument("directory", nargs="?", default=config.LOCAL_VECTOR_STORE_CONFIG["path"],
+                        help="Target directory of the vector store.")
+    parser.add_argument("--dtype", choices=VECTOR_DTYPES, default=config.LOCAL_VECTOR_STORE_CONFIG["dtype"],
+                        help="Storage format of the vectors; float16 and int8 halve and quarter the store size.")
+    args = parser.parse_args()
+
+    if not config.VECTOR_INDEX_CONFIG["stored"]:
+        config.app_logger.error("The vectors of the index are not stored (VECTOR_STORED=false) and cannot be exported.")
+        return
+
+    with SearchClient(
+        endpoint=config.COGNITIVE_SEARCH_CONFIG["endpoint"],
+        index_name=config.COGNITIVE_SEARCH_CONFIG["index_name"],
+        credential=AzureKeyCredential(config.COGNITIVE_SEARCH_CONFIG["api_key"])
+    ) as search_client:
+        count = LocalVectorStore.write(args.directory, iter_index_documents(search_client), dtype=args.dtype)
+    config.app_logger.info(f"Exported {count} pages to {args.directory} as {args.dtype}")
+
+
+if __name__ == "__main__":
+    main()
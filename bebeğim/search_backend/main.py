@@ -1,16 +1,46 @@
 # search_backend.py
 
+import asyncio
+import json
 import os
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+import numpy as np
+import openai
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, constr
+from typing import List, Literal, Optional
+import config
 from src.embedder.embedder import Embedder
-from utils.openAI import OpenAIClient
+from utils.openAI import OpenAIClient, ERROR_RESPONSE
 from utils.search import AISearcher
+from utils.embedding_cache import QueryEmbeddingCache
+from utils.answer_cache import SemanticAnswerCache
+from utils.context_builder import ContextBuilder
+from utils.metrics import count_cache, render_metrics, track
 from fastapi.middleware.cors import CORSMiddleware
 from utils.system_messages import SYSTEM_MESSAGES_PDF
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # OpenAI çağrıları için uygulama boyunca tek bir bağlantı havuzu kullanılır
+    app.state.openai_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=config.CONCURRENCY_LIMIT)
+    )
+    try:
+        yield
+    finally:
+        # Uygulama hata ile kapansa da bağlantı havuzları kapatılır
+        await app.state.openai_session.close()
+        await ai_searcher.aclose()
+        embedding_cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS Ayarları
 app.add_middleware(
@@ -22,8 +52,12 @@ app.add_middleware(
 )
 
 
+SearchMode = Literal["exact", "approximate", "rerank", "hybrid"]
+
+
 class Query(BaseModel):
     question: str
+    search_mode: Optional[SearchMode] = None
 
 
 class SearchResult(BaseModel):
@@ -35,61 +69,320 @@ class SearchResult(BaseModel):
 
 class ChatRequest(BaseModel):
     question: str
+    search_mode: Optional[SearchMode] = None
+
+
+class BatchSearchRequest(BaseModel):
+    questions: List[constr(min_length=1)]
+    top_k: int = Field(10, ge=1, le=config.BATCH_SEARCH_CONFIG["max_top_k"])
+    stream: bool = False
+    search_mode: Optional[SearchMode] = None
+
+
+class BatchSearchItem(BaseModel):
+    index: int
+    question: str
+    results: List[SearchResult]
+    error: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     answer: str
+    context_tokens: int = 0
+
+
+class AskResponse(BaseModel):
+    results: List[SearchResult]
+    answer: str
+    context_tokens: int = 0
 
 
 # Bileşenlerin Başlatılması
 openai_client = OpenAIClient(engine="gpt-4o")  # GPT-4 motoru kullanılıyor
 embedder = Embedder()
 ai_searcher = AISearcher()
+embedding_cache = QueryEmbeddingCache()
+context_builder = ContextBuilder()
+answer_cache = SemanticAnswerCache() if config.SEMANTIC_CACHE_CONFIG["enabled"] else None
+last_index_check = 0.0
 
 
-def embed_question(question_text: str) -> list:
-    question_embedding = embedder.embed_text(question_text)
+@app.middleware("http")
+async def bind_openai_session(request: Request, call_next):
+    # openai kütüphanesi paylaşılan oturumu bir ContextVar üzerinden okur
+    openai.aiosession.set(request.app.state.openai_session)
+    return await call_next(request)
+
+
+async def embed_question(question_text: str) -> np.ndarray:
+    # Sık tekrarlanan sorular için embedding önbellekten alınır
+    cached_embedding = await embedding_cache.aget(question_text)
+    count_cache("query_embedding", cached_embedding is not None)
+    if cached_embedding is not None:
+        return cached_embedding
+
+    with track("query_embed"):
+        question_embedding = await embedder.aembed_text(question_text)
+    if question_embedding is None:
+        raise HTTPException(status_code=502, detail="Soru için embedding oluşturulamadı.")
+    await embedding_cache.aset(question_text, question_embedding)
     return question_embedding
 
 
+async def refresh_answer_cache():
+    # İndeksteki belge sayısı değiştiyse önbellekteki cevaplar geçersiz sayılır
+    global last_index_check
+    if time.monotonic() - last_index_check < config.SEMANTIC_CACHE_CONFIG["index_check_interval"]:
+        return
+    last_index_check = time.monotonic()
+    document_count = await ai_searcher.aget_document_count()
+    if document_count is not None and document_count != answer_cache.index_version:
+        answer_cache.invalidate(index_version=document_count)
+
+
+async def lookup_cached_answer(question_embedding: np.ndarray, search_results: list):
+    if answer_cache is None:
+        return None
+    await refresh_answer_cache()
+    answer = answer_cache.lookup(question_embedding, [result["id"] for result in search_results])
+    count_cache("answer", answer is not None)
+    return answer
+
+
+def store_answer(question_embedding: np.ndarray, search_results: list, answer: str):
+    if answer_cache is not None and answer and answer != ERROR_RESPONSE:
+        answer_cache.store(question_embedding, [result["id"] for result in search_results], answer)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    stats = {"query_embedding_cache": embedding_cache.stats()}
+    if answer_cache is not None:
+        stats["semantic_answer_cache"] = answer_cache.stats()
+    return stats
+
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus metin biçimi: aşama gecikmeleri, jeton sayıları ve önbellek isabetleri
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.post("/cache/invalidate")
+async def invalidate_cache():
+    if answer_cache is not None:
+        answer_cache.invalidate()
+    return {"status": "ok"}
+
+
+async def embed_questions(questions: List[str]) -> list:
+    # Önbellekte olmayan sorular toplu embedding istekleriyle gönderilir
+    embeddings = [await embedding_cache.aget(question) for question in questions]
+    for embedding in embeddings:
+        count_cache("query_embedding", embedding is not None)
+
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        with track("query_embed"):
+            new_embeddings = await embedder.aembed_batch([questions[i] for i in missing])
+        for i, embedding in zip(missing, new_embeddings):
+            if embedding is not None:
+                embeddings[i] = embedding
+                await embedding_cache.aset(questions[i], embedding)
+    return embeddings
+
+
+async def retrieve(question: str, search_mode: Optional[str] = None):
+    # Soru embed'leniyor
+    question_embedding = await embed_question(question)
+
+    # En yakın 10 sonucu arıyoruz
+    with track("vector_search"):
+        search_results = await ai_searcher.asearch_similar_pdf_pages(
+            question_embedding, top_k=10, mode=search_mode, question=question
+        )
+
+    if not search_results:
+        raise HTTPException(status_code=404, detail="Herhangi bir sonuç bulunamadı.")
+    return question_embedding, search_results
+
+
 @app.post("/search", response_model=List[SearchResult])
-def search(query: Query):
+async def search(query: Query):
     try:
-        question_embedding = embed_question(query.question)
-        search_results = ai_searcher.search_similar_pdf_pages(question_embedding, top_k=10)
-        if not search_results:
-            raise HTTPException(status_code=404, detail="Herhangi bir sonuç bulunamadı.")
+        _, search_results = await retrieve(query.question, query.search_mode)
         return search_results
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/chat", response_model=ChatResponse)
-def chat(chat_request: ChatRequest):
+@app.post("/search/batch", response_model=List[BatchSearchItem])
+async def search_batch(batch_request: BatchSearchRequest):
+    """
+    Runs the vector search for many questions in one request.
+
+    Questions are embedded in batched requests and searched concurrently with a bounded fan-out.
+    Without streaming the items are returned in input order; with stream=true each item is written
+    as a JSON line as soon as its search completes, carrying its input index.
+    """
+    questions = batch_request.questions
+    if len(questions) > config.BATCH_SEARCH_CONFIG["max_questions"]:
+        raise HTTPException(
+            status_code=413,
+            detail=f"En fazla {config.BATCH_SEARCH_CONFIG['max_questions']} soru gönderilebilir."
+        )
+
     try:
-        # Soru embed'leniyor
-        question_embedding = embed_question(chat_request.question)
+        embeddings = await embed_questions(questions)
+    except Exception as e:
+        # Embedding hatası tüm isteği düşürmez; her soru kendi hatasıyla döner
+        config.app_logger.error(f"Error embedding batch questions: {str(e)}")
+        embeddings = [None] * len(questions)
+    semaphore = asyncio.Semaphore(config.BATCH_SEARCH_CONFIG["max_concurrency"])
 
-        # En yakın 5 sonucu arıyoruz
-        search_results = ai_searcher.search_similar_pdf_pages(question_embedding, top_k=10)
+    async def search_one(index: int) -> dict:
+        if embeddings[index] is None:
+            return {"index": index, "question": questions[index], "results": [],
+                    "error": "Soru için embedding oluşturulamadı."}
+        try:
+            async with semaphore:
+                with track("vector_search"):
+                    results = await ai_searcher.asearch_similar_pdf_pages(
+                        embeddings[index], top_k=batch_request.top_k, mode=batch_request.search_mode,
+                        question=questions[index]
+                    )
+        except Exception as e:
+            # Tek bir sorunun arama hatası diğer soruların sonuçlarını etkilemez
+            config.app_logger.error(f"Error searching batch question {index}: {str(e)}")
+            return {"index": index, "question": questions[index], "results": [], "error": "Arama başarısız oldu."}
+        return {"index": index, "question": questions[index], "results": results}
 
-        if not search_results:
-            raise HTTPException(status_code=404, detail="Herhangi bir sonuç bulunamadı.")
+    tasks = [asyncio.create_task(search_one(index)) for index in range(len(questions))]
 
-        # Arama sonuçlarını bir araya getiriyoruz
-        context = "\n\n".join([
-            f"PDF: {result['pdf_name']} - Sayfa {result['page_number']}\n{result['content']}"
-            for result in search_results
-        ])
+    if not batch_request.stream:
+        return await asyncio.gather(*tasks)
+
+    async def item_stream():
+        try:
+            for task in asyncio.as_completed(tasks):
+                item = BatchSearchItem(**await task)
+                yield item.model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(item_stream(), media_type="application/x-ndjson")
+
+
+def build_user_message(question: str, search_results: list):
+    # Belgeler skor sırasına göre, tekrarlar atlanarak jeton bütçesine sığdırılır
+    with track("prompt_build"):
+        context, context_tokens, used_results = context_builder.build(search_results)
+    config.app_logger.info(
+        f"Prompt context: {context_tokens} tokens from {len(used_results)}/{len(search_results)} pages"
+    )
+    return f"Soru: {question}\n\nBelgeler:\n{context}", context_tokens
+
+
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def generate_answer(question: str, question_embedding: np.ndarray, search_results: list):
+    # Benzer bir soru aynı belgelerle yakın zamanda cevaplandıysa GPT çağrılmaz
+    cached_answer = await lookup_cached_answer(question_embedding, search_results)
+    if cached_answer is not None:
+        return cached_answer, 0
+
+    # Arama sonuçlarını bir araya getiriyoruz
+    user_message, context_tokens = build_user_message(question, search_results)
+
+    # GPT-4'ten cevap alıyoruz
+    with track("completion"):
+        answer = await openai_client.agenerate_response(SYSTEM_MESSAGES_PDF, user_message)
+    store_answer(question_embedding, search_results, answer)
+    return answer, context_tokens
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(chat_request: ChatRequest):
+    try:
+        question_embedding, search_results = await retrieve(chat_request.question, chat_request.search_mode)
+        answer, context_tokens = await generate_answer(chat_request.question, question_embedding, search_results)
+        return ChatResponse(answer=answer, context_tokens=context_tokens)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
-        user_message = f"Soru: {chat_request.question}\n\nBelgeler:\n{context}"
+@app.post("/ask", response_model=AskResponse)
+async def ask(chat_request: ChatRequest):
+    """
+    Returns the search results and the generated answer for a question in one round-trip.
 
-        # GPT-4'ten cevap alıyoruz
-        answer = openai_client.generate_response(SYSTEM_MESSAGES_PDF, user_message)
+    The question is embedded and searched once, and the same results feed both the results list
+    and the GPT prompt, instead of calling /search and /chat separately.
+    """
+    try:
+        question_embedding, search_results = await retrieve(chat_request.question, chat_request.search_mode)
+        answer, context_tokens = await generate_answer(chat_request.question, question_embedding, search_results)
+        return AskResponse(results=search_results, answer=answer, context_tokens=context_tokens)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return ChatResponse(answer=answer)
+
+@app.post("/chat/stream")
+async def chat_stream(chat_request: ChatRequest):
+    """
+    Streams the chat answer as Server-Sent Events.
+
+    The retrieved documents are sent first as a "documents" event, followed by one "token" event
+    per generated chunk and a final "done" event. Retrieval errors are returned as regular HTTP errors
+    before the stream starts.
+    """
+    try:
+        question_embedding, search_results = await retrieve(chat_request.question, chat_request.search_mode)
     except HTTPException as he:
         raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    cached_answer = await lookup_cached_answer(question_embedding, search_results)
+    if cached_answer is None:
+        user_message, context_tokens = build_user_message(chat_request.question, search_results)
+
+    async def event_stream():
+        # Önce kaynak belgelerin bilgisi gönderilir, ardından cevap parça parça akar
+        yield format_sse("documents", [
+            {key: result[key] for key in ("pdf_name", "page_number", "similarity_score")}
+            for result in search_results
+        ])
+        if cached_answer is not None:
+            yield format_sse("token", {"content": cached_answer})
+            yield format_sse("done", {"cached": True})
+            return
+
+        tokens = []
+        try:
+            with track("completion"):
+                async for token in openai_client.astream_response(SYSTEM_MESSAGES_PDF, user_message):
+                    tokens.append(token)
+                    yield format_sse("token", {"content": token})
+        except Exception as e:
+            config.app_logger.error(f"Error streaming response: {str(e)}")
+            yield format_sse("error", {"detail": ERROR_RESPONSE})
+            return
+        store_answer(question_embedding, search_results, "".join(tokens))
+        yield format_sse("done", {"context_tokens": context_tokens})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,6 +1,10 @@
+import asyncio
+
 import openai
 
 import config
+from utils.metrics import count_usage
+from utils.vectors import to_vector
 
 
 class Embedder:
@@ -24,18 +28,147 @@ class Embedder:
             text (str): The text to be embedded.
 
         Returns:
-            list: The embedding vector.
+            numpy.ndarray: The float32 embedding vector, or None if the request fails.
         """
         try:
             response = openai.Embedding.create(
                 input=text,
                 engine=config.ADA_CONFIG["deployment_name"],
             )
-            return response['data'][0]['embedding']
+            count_usage("query_embed", response)
+            return to_vector(response['data'][0]['embedding'])
+        except openai.error.APIConnectionError as e:
+            config.app_logger.error(f"Failed to connect to OpenAI API: {e}")
+        except openai.error.APIError as e:
+            config.app_logger.error(f"OpenAI API returned an error: {e}")
+        except openai.error.RateLimitError as e:
+            config.app_logger.error(f"OpenAI API rate limit exceeded: {e}")
+        except openai.error.OpenAIError as e:
+            config.app_logger.error(f"OpenAI API request failed: {e}")
+        return None
+
+    async def aembed_text(self, text):
+        """
+        Asynchronous variant of embed_text that does not block the event loop.
+
+        Args:
+            text (str): The text to be embedded.
+
+        Returns:
+            numpy.ndarray: The float32 embedding vector, or None if the request fails.
+        """
+        try:
+            response = await openai.Embedding.acreate(
+                input=text,
+                engine=config.ADA_CONFIG["deployment_name"],
+            )
+            count_usage("query_embed", response)
+            return to_vector(response['data'][0]['embedding'])
         except openai.error.APIConnectionError as e:
             config.app_logger.error(f"Failed to connect to OpenAI API: {e}")
         except openai.error.APIError as e:
             config.app_logger.error(f"OpenAI API returned an error: {e}")
         except openai.error.RateLimitError as e:
             config.app_logger.error(f"OpenAI API rate limit exceeded: {e}")
-        return None
\ No newline at end of file
+        except openai.error.OpenAIError as e:
+            config.app_logger.error(f"OpenAI API request failed: {e}")
+        return None
+
+    def embed_batch(self, texts):
+        """
+        Generates embeddings for a list of texts with as few API requests as possible.
+
+        The texts are packed into requests using the configured tiktoken encoding so that every
+        request stays under the per-request token and item limits in config.EMBEDDING_BATCH_CONFIG.
+        If a packed request fails, its texts are retried one by one so that a single bad input
+        does not drop the whole batch.
+
+        Args:
+            texts (list): The texts to be embedded.
+
+        Returns:
+            list: The float32 embedding vectors in input order. Items that could not be embedded are None.
+        """
+        embeddings = [None] * len(texts)
+        for batch in self._pack_batches(texts):
+            batch_texts = [texts[i] for i in batch]
+            try:
+                response = openai.Embedding.create(
+                    input=batch_texts,
+                    engine=config.ADA_CONFIG["deployment_name"],
+                )
+                count_usage("query_embed", response)
+                for item in response['data']:
+                    embeddings[batch[item['index']]] = to_vector(item['embedding'])
+            except openai.error.OpenAIError as e:
+                config.app_logger.error(f"Batch embedding request failed, retrying items individually: {e}")
+                for i in batch:
+                    embeddings[i] = self.embed_text(texts[i])
+        return embeddings
+
+    async def aembed_batch(self, texts, max_concurrency=None):
+        """
+        Asynchronous variant of embed_batch; the packed requests are sent concurrently, at most
+        max_concurrency at a time.
+
+        Args:
+            texts (list): The texts to be embedded.
+            max_concurrency (int, optional): Maximum concurrent requests.
+                Defaults to config.BATCH_SEARCH_CONFIG["max_concurrency"].
+
+        Returns:
+            list: The float32 embedding vectors in input order. Items that could not be embedded are None.
+        """
+        embeddings = [None] * len(texts)
+        semaphore = asyncio.Semaphore(max_concurrency or config.BATCH_SEARCH_CONFIG["max_concurrency"])
+
+        async def embed_packed(batch):
+            async with semaphore:
+                try:
+                    response = await openai.Embedding.acreate(
+                        input=[texts[i] for i in batch],
+                        engine=config.ADA_CONFIG["deployment_name"],
+                    )
+                    count_usage("query_embed", response)
+                    for item in response['data']:
+                        embeddings[batch[item['index']]] = to_vector(item['embedding'])
+                    return
+                except openai.error.OpenAIError as e:
+                    config.app_logger.error(f"Batch embedding request failed, retrying items individually: {e}")
+                # aembed_text hatada None döner; hatalı bir soru diğer partilerin sonuçlarını düşürmez
+                for i in batch:
+                    embeddings[i] = await self.aembed_text(texts[i])
+
+        await asyncio.gather(*(embed_packed(batch) for batch in self._pack_batches(texts)))
+        return embeddings
+
+    def _pack_batches(self, texts):
+        """
+        Groups text indices into requests that respect the configured token and item limits.
+
+        Args:
+            texts (list): The texts to be packed.
+
+        Returns:
+            list: A list of batches, each a list of indices into texts.
+        """
+        max_items = config.EMBEDDING_BATCH_CONFIG["max_items"]
+        max_tokens = config.EMBEDDING_BATCH_CONFIG["max_tokens"]
+        max_item_tokens = config.EMBEDDING_BATCH_CONFIG["max_item_tokens"]
+
+        batches = []
+        current, current_tokens = [], 0
+        for i, text in enumerate(texts):
+            token_count = len(config.encoding.encode(text or ""))
+            if not text or token_count > max_item_tokens:
+                # Boş ya da model sınırını aşan metinler gönderilmez, sonuçları None kalır
+                config.app_logger.error(f"Skipping text at index {i}: {token_count} tokens is not embeddable.")
+                continue
+            if current and (len(current) >= max_items or current_tokens + token_count > max_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += token_count
+        if current:
+            batches.append(current)
+        return batches
@@ -0,0 +1,123 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import main
+from utils import answer_cache as answer_cache_module
+from utils.answer_cache import SemanticAnswerCache
+
+QUESTION = [1.0, 0.0, 0.0, 0.0]
+SIMILAR_QUESTION = [0.99, 0.05, 0.0, 0.0]
+OTHER_QUESTION = [0.0, 1.0, 0.0, 0.0]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"time": 1000.0}
+
+    class Clock:
+        @staticmethod
+        def time():
+            return now["time"]
+
+    monkeypatch.setattr(answer_cache_module, "time", Clock)
+    return now
+
+
+def make_cache(**kwargs):
+    options = {"similarity_threshold": 0.95, "max_entries": 2, "ttl_seconds": 60, "dimension": 4}
+    options.update(kwargs)
+    return SemanticAnswerCache(**options)
+
+
+def test_similar_question_with_same_documents_hits(clock):
+    answer_cache = make_cache()
+    answer_cache.store(np.array(QUESTION) * 3, ["d1", "d2"], "cevap")
+
+    assert answer_cache.lookup(SIMILAR_QUESTION, ["d2", "d1"]) == "cevap"
+    assert answer_cache.lookup(OTHER_QUESTION, ["d1", "d2"]) is None
+    assert answer_cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_different_document_set_misses(clock):
+    answer_cache = make_cache()
+    answer_cache.store(QUESTION, ["d1", "d2"], "cevap")
+
+    assert answer_cache.lookup(QUESTION, ["d1"]) is None
+    assert answer_cache.lookup(QUESTION, ["d1", "d2", "d3"]) is None
+    assert answer_cache.lookup(QUESTION, ["d1", "d3"]) is None
+
+
+def test_best_candidate_with_matching_documents_is_used(clock):
+    answer_cache = make_cache()
+    answer_cache.store(QUESTION, ["d1"], "ilk")
+    answer_cache.store(SIMILAR_QUESTION, ["d2"], "ikinci")
+
+    assert answer_cache.lookup(QUESTION, ["d2"]) == "ikinci"
+
+
+def test_expired_answers_miss(clock):
+    answer_cache = make_cache()
+    answer_cache.store(QUESTION, ["d1"], "cevap")
+    clock["time"] += 60
+
+    assert answer_cache.lookup(QUESTION, ["d1"]) is None
+
+
+def test_least_recently_used_answer_is_replaced_when_full(clock):
+    answer_cache = make_cache()
+    answer_cache.store(QUESTION, ["d1"], "ilk")
+    clock["time"] += 1
+    answer_cache.store(OTHER_QUESTION, ["d2"], "ikinci")
+    clock["time"] += 1
+    assert answer_cache.lookup(QUESTION, ["d1"]) == "ilk"  # "ilk" en son kullanılan olur
+
+    clock["time"] += 1
+    answer_cache.store([0.0, 0.0, 1.0, 0.0], ["d3"], "üçüncü")
+
+    assert answer_cache.lookup(OTHER_QUESTION, ["d2"]) is None
+    assert answer_cache.lookup(QUESTION, ["d1"]) == "ilk"
+    assert answer_cache.stats()["entries"] == 2
+
+
+def test_invalidate_drops_every_answer(clock):
+    answer_cache = make_cache()
+    answer_cache.store(QUESTION, ["d1"], "cevap")
+
+    answer_cache.invalidate(index_version=42)
+
+    assert answer_cache.index_version == 42
+    assert answer_cache.lookup(QUESTION, ["d1"]) is None
+    assert answer_cache.stats()["entries"] == 0
+
+
+def test_answers_are_invalidated_when_the_document_count_changes(clock, monkeypatch):
+    answer_cache = make_cache(dimension=2)
+    counts = iter([10, 10, 11])
+
+    async def aget_document_count():
+        return next(counts)
+
+    monkeypatch.setattr(main, "answer_cache", answer_cache)
+    monkeypatch.setattr(main.ai_searcher, "aget_document_count", aget_document_count)
+    monkeypatch.setitem(main.config.SEMANTIC_CACHE_CONFIG, "index_check_interval", 0)
+    monkeypatch.setattr(main, "last_index_check", 0.0)
+    monkeypatch.setattr(main, "count_cache", lambda name, hit: None)
+    results = [{"id": "d1"}]
+
+    assert asyncio.run(main.lookup_cached_answer([1.0, 0.0], results)) is None
+    main.store_answer([1.0, 0.0], results, "cevap")
+    assert asyncio.run(main.lookup_cached_answer([1.0, 0.0], results)) == "cevap"
+    assert asyncio.run(main.lookup_cached_answer([1.0, 0.0], results)) is None
+    assert answer_cache.index_version == 11
+
+
+def test_error_responses_are_not_cached(clock, monkeypatch):
+    answer_cache = make_cache(dimension=2)
+    monkeypatch.setattr(main, "answer_cache", answer_cache)
+
+    main.store_answer([1.0, 0.0], [{"id": "d1"}], main.ERROR_RESPONSE)
+    main.store_answer([1.0, 0.0], [{"id": "d1"}], "")
+
+    assert answer_cache.stats()["entries"] == 0
@@ -0,0 +1,93 @@
+import asyncio
+
+import openai
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+import main
+from src.embedder.embedder import Embedder
+
+BAD_QUESTION = "kötü soru"
+
+
+def fake_acreate(calls=None):
+    """
+    Returns a stand-in for openai.Embedding.acreate that rejects every request containing BAD_QUESTION.
+    """
+    state = {"running": 0, "max_running": 0}
+
+    async def acreate(input, engine):
+        texts = [input] if isinstance(input, str) else input
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        try:
+            await asyncio.sleep(0.01)
+            if calls is not None:
+                calls.append(texts)
+            if BAD_QUESTION in texts:
+                raise openai.error.InvalidRequestError("invalid input", "input")
+            return {"data": [{"index": i, "embedding": [float(len(text)), 1.0]} for i, text in enumerate(texts)],
+                    "usage": {"prompt_tokens": len(texts)}}
+        finally:
+            state["running"] -= 1
+
+    return acreate, state
+
+
+def test_aembed_batch_fails_only_the_bad_question(monkeypatch):
+    acreate, _ = fake_acreate()
+    monkeypatch.setattr(openai.Embedding, "acreate", acreate)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_items", 2)
+    questions = ["birinci", "ikinci", BAD_QUESTION, "dördüncü", "beşinci"]
+
+    embeddings = asyncio.run(Embedder().aembed_batch(questions))
+
+    assert embeddings[2] is None
+    assert all(embeddings[i] is not None for i in (0, 1, 3, 4))
+    assert embeddings[3][0] == len("dördüncü")
+
+
+def test_aembed_batch_bounds_concurrent_requests(monkeypatch):
+    acreate, state = fake_acreate()
+    monkeypatch.setattr(openai.Embedding, "acreate", acreate)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_items", 1)
+
+    embeddings = asyncio.run(Embedder().aembed_batch([f"soru {i}" for i in range(20)], max_concurrency=3))
+
+    assert all(embedding is not None for embedding in embeddings)
+    assert state["max_running"] == 3
+
+
+@pytest.fixture
+def client(monkeypatch):
+    acreate, _ = fake_acreate()
+    monkeypatch.setattr(openai.Embedding, "acreate", acreate)
+
+    async def search(question_embedding, top_k=10, mode=None, question=None):
+        return [{"pdf_name": "a.pdf", "page_number": 1, "content": question, "similarity_score": 1.0}]
+
+    monkeypatch.setattr(main.ai_searcher, "asearch_similar_pdf_pages", search)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_search_batch_reports_the_failed_question_only(client):
+    response = client.post("/search/batch", json={"questions": ["birinci", BAD_QUESTION, "üçüncü"]})
+
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["index"] for item in items] == [0, 1, 2]
+    assert items[1]["results"] == [] and items[1]["error"]
+    assert items[0]["error"] is None and items[0]["results"][0]["content"] == "birinci"
+    assert items[2]["error"] is None and items[2]["results"][0]["content"] == "üçüncü"
+
+
+@pytest.mark.parametrize("payload", [
+    {"questions": ["soru"], "top_k": 0},
+    {"questions": ["soru"], "top_k": -5},
+    {"questions": ["soru"], "top_k": config.BATCH_SEARCH_CONFIG["max_top_k"] + 1},
+    {"questions": ["soru", ""]},
+])
+def test_search_batch_rejects_invalid_requests(client, payload):
+    assert client.post("/search/batch", json=payload).status_code == 422
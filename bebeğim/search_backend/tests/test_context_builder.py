@@ -0,0 +1,114 @@
+from utils.context_builder import ContextBuilder
+
+SENTENCES = ["Birinci cumle burada.", "Ikinci cumle biraz daha uzun.", "Ucuncu cumle en sondadir."]
+
+
+def page(pdf_name, page_number, content, score):
+    return {"pdf_name": pdf_name, "page_number": page_number, "content": content, "similarity_score": score}
+
+
+def header_tokens(result):
+    return ContextBuilder.count_tokens(f"PDF: {result['pdf_name']} - Sayfa {result['page_number']}\n")
+
+
+def words(prefix, count):
+    return " ".join(f"{prefix}{index}" for index in range(count))
+
+
+def test_pages_are_ranked_by_score_and_fit_the_budget():
+    results = [page("a.pdf", 1, words("a", 20), 0.2), page("b.pdf", 2, words("b", 20), 0.9)]
+    builder = ContextBuilder(max_tokens=10 ** 4, dedup_threshold=0.8, min_page_tokens=1)
+
+    context, tokens_used, used_results = builder.build(results)
+
+    assert [result["pdf_name"] for result in used_results] == ["b.pdf", "a.pdf"]
+    assert context.startswith("PDF: b.pdf - Sayfa 2\n")
+    assert tokens_used == builder.count_tokens(context)
+
+
+def test_budget_exactly_filled_keeps_the_whole_page():
+    result = page("a.pdf", 1, " ".join(SENTENCES), 1.0)
+    budget = header_tokens(result) + ContextBuilder.count_tokens(result["content"])
+    builder = ContextBuilder(max_tokens=budget, dedup_threshold=0.8, min_page_tokens=1)
+
+    context, tokens_used, used_results = builder.build([result])
+
+    assert context.endswith(SENTENCES[-1])
+    assert tokens_used == budget
+    assert used_results == [result]
+
+
+def test_page_that_does_not_fit_is_truncated_at_a_sentence_boundary():
+    result = page("a.pdf", 1, " ".join(SENTENCES), 1.0)
+    budget = header_tokens(result) + ContextBuilder.count_tokens(" ".join(SENTENCES[:2])) + 3
+    builder = ContextBuilder(max_tokens=budget, dedup_threshold=0.8, min_page_tokens=1)
+
+    context, tokens_used, _ = builder.build([result])
+
+    assert context.endswith(" ".join(SENTENCES[:2]))
+    assert tokens_used == builder.count_tokens(context) <= budget
+
+
+def test_sentence_longer_than_the_budget_is_cut_at_the_token_limit():
+    result = page("a.pdf", 1, "x" * 100, 1.0)
+    budget = header_tokens(result) + 30
+    builder = ContextBuilder(max_tokens=budget, dedup_threshold=0.8, min_page_tokens=1)
+
+    context, tokens_used, _ = builder.build([result])
+
+    assert context.endswith("\n" + "x" * 30)
+    assert tokens_used == budget
+
+
+def test_page_without_room_for_min_page_tokens_is_left_out():
+    first = page("a.pdf", 1, words("a", 10), 0.9)
+    second = page("b.pdf", 2, words("b", 50), 0.5)
+    first_tokens = header_tokens(first) + ContextBuilder.count_tokens(first["content"])
+    # İkinci sayfa için ayraçtan ve başlıktan sonra yalnızca 20 jeton kalır
+    budget = first_tokens + 2 + header_tokens(second) + 20
+    builder = ContextBuilder(max_tokens=budget, dedup_threshold=0.8, min_page_tokens=25)
+
+    context, tokens_used, used_results = builder.build([first, second])
+
+    assert used_results == [first]
+    assert tokens_used == first_tokens
+    assert "b.pdf" not in context
+
+
+def test_page_cut_to_a_short_sentence_is_left_out():
+    result = page("a.pdf", 1, "x" * 20 + ". " + "y" * 40, 1.0)
+    builder = ContextBuilder(max_tokens=header_tokens(result) + 30, dedup_threshold=0.8, min_page_tokens=25)
+
+    assert builder.build([result]) == ("", 0, [])
+
+
+def test_separators_are_counted_in_the_budget():
+    results = [page("a.pdf", 1, words("a", 10), 0.9), page("b.pdf", 2, words("b", 10), 0.5)]
+    builder = ContextBuilder(max_tokens=10 ** 4, dedup_threshold=0.8, min_page_tokens=1)
+
+    context, tokens_used, used_results = builder.build(results)
+
+    assert len(used_results) == 2
+    assert tokens_used == builder.count_tokens(context)
+    assert context.count("\n\n") == 1
+
+
+def test_overlapping_pages_are_deduplicated():
+    content = words("ortak", 30)
+    results = [
+        page("a.pdf", 1, content, 0.9),
+        page("a_kopya.pdf", 1, content + " ek", 0.8),
+        page("b.pdf", 3, words("farkli", 30), 0.7)
+    ]
+    builder = ContextBuilder(max_tokens=10 ** 4, dedup_threshold=0.8, min_page_tokens=1)
+
+    _, _, used_results = builder.build(results)
+
+    assert [result["pdf_name"] for result in used_results] == ["a.pdf", "b.pdf"]
+
+
+def test_empty_results_and_zero_budget_build_an_empty_context():
+    builder = ContextBuilder(max_tokens=0, dedup_threshold=0.8, min_page_tokens=1)
+
+    assert builder.build([]) == ("", 0, [])
+    assert builder.build([page("a.pdf", 1, words("a", 10), 1.0)]) == ("", 0, [])
@@ -0,0 +1,27 @@
+import pytest
+
+import config
+from src.embedder.embedder import Embedder
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_items", 3)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_tokens", 20)
+    monkeypatch.setitem(config.EMBEDDING_BATCH_CONFIG, "max_item_tokens", 12)
+    return Embedder()
+
+
+def test_batches_respect_the_item_and_token_limits(embedder):
+    # Test kodlamasında her bayt bir jetondur
+    texts = ["a", "b", "c", "d", "x" * 8, "y" * 8, "z" * 8]
+
+    batches = embedder._pack_batches(texts)
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    for batch in batches:
+        assert len(batch) <= 3 and sum(len(texts[i]) for i in batch) <= 20
+
+
+def test_unembeddable_questions_are_left_out(embedder):
+    assert embedder._pack_batches(["soru", "", "x" * 13, "başka"]) == [[0, 3]]
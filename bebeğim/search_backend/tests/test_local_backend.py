@@ -0,0 +1,88 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import config
+from utils.search import AISearcher
+from utils.vector_store import LocalVectorStore
+
+DIMENSION = 16
+PAGES = 300
+
+
+def make_documents(seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((10, DIMENSION)).astype(np.float32)
+    return [
+        {"id": str(page), "pdf_name": f"doc{page % 3}.pdf", "page_number": page,
+         "content": f"sayfa {page} ürün kodu AB-{page}",
+         "pdf_vector": centers[page % 10] + 0.3 * rng.standard_normal(DIMENSION).astype(np.float32)}
+        for page in range(PAGES)
+    ]
+
+
+@pytest.fixture
+def store_directory(tmp_path, monkeypatch):
+    directory = str(tmp_path / "vector_store")
+    documents = make_documents()
+    assert LocalVectorStore.write(directory, documents, dimension=DIMENSION, dtype="float32") == PAGES
+    monkeypatch.setitem(config.LOCAL_VECTOR_STORE_CONFIG, "path", directory)
+    monkeypatch.setitem(config.LOCAL_VECTOR_STORE_CONFIG, "approximate_index", "ivf")
+    return directory, documents
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_exact_search_finds_the_page_itself(tmp_path, dtype):
+    documents = make_documents()
+    directory = str(tmp_path / dtype)
+    LocalVectorStore.write(directory, documents, dimension=DIMENSION, dtype=dtype)
+    store = LocalVectorStore(directory, approximate_index="ivf")
+
+    results = store.search(documents[42]["pdf_vector"], top_k=5, mode="exact")
+
+    assert len(results) == 5
+    assert results[0]["id"] == "42"
+    assert results[0]["pdf_name"] == "doc0.pdf" and results[0]["page_number"] == 42
+    scores = [result["similarity_score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("mode", ["approximate", "rerank"])
+def test_approximate_modes_recall_the_exact_results(store_directory, mode):
+    directory, documents = store_directory
+    store = LocalVectorStore(directory, approximate_index="ivf")
+    store.ivf_probes = 4
+
+    hits = total = 0
+    for document in documents[:30]:
+        expected = {result["id"] for result in store.search(document["pdf_vector"], 10, mode="exact")}
+        found = {result["id"] for result in store.search(document["pdf_vector"], 10, mode=mode,
+                                                         rerank_candidates=50)}
+        hits += len(expected & found)
+        total += len(expected)
+    assert hits / total >= 0.8
+
+
+def test_aisearcher_local_backend(store_directory):
+    _, documents = store_directory
+    ai_searcher = AISearcher(backend="local")
+    query = documents[7]["pdf_vector"]
+
+    results = ai_searcher.search_similar_pdf_pages(query, top_k=3, mode="exact")
+    async_results = asyncio.run(ai_searcher.asearch_similar_pdf_pages(query, top_k=3, mode="exact"))
+
+    assert results[0]["id"] == "7"
+    assert [result["id"] for result in async_results] == [result["id"] for result in results]
+    assert asyncio.run(ai_searcher.aget_document_count()) == PAGES
+    asyncio.run(ai_searcher.aclose())
+
+
+def test_aisearcher_local_hybrid_search(store_directory):
+    _, documents = store_directory
+    ai_searcher = AISearcher(backend="local")
+
+    results = ai_searcher.search_similar_pdf_pages(documents[11]["pdf_vector"], top_k=5, mode="hybrid",
+                                                   question="AB-11")
+
+    assert "11" in {result["id"] for result in results}
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import config
+from utils.search import AISearcher
+
+QUESTION_EMBEDDING = np.ones(4, dtype=np.float32)
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    messages = []
+    monkeypatch.setattr(config.app_logger, "warning", messages.append)
+    return messages
+
+
+def build(monkeypatch, mode, **vector_config):
+    for key, value in vector_config.items():
+        monkeypatch.setitem(config.VECTOR_INDEX_CONFIG, key, value)
+    monkeypatch.setitem(config.SEARCH_MODE_CONFIG, "rerank_candidates", 50)
+    kwargs = AISearcher._build_search_kwargs(QUESTION_EMBEDDING, 5, mode)
+    return kwargs, kwargs["vector_queries"][0]
+
+
+def test_exact_mode_is_exhaustive(monkeypatch, warnings):
+    kwargs, vector_query = build(monkeypatch, "exact", stored=True)
+
+    assert vector_query.exhaustive and vector_query.k_nearest_neighbors == 5
+    assert "pdf_vector" not in kwargs["select"] and not warnings
+
+
+def test_rerank_with_stored_vectors_fetches_candidates(monkeypatch, warnings):
+    kwargs, vector_query = build(monkeypatch, "rerank", stored=True, compression="none")
+
+    assert not vector_query.exhaustive
+    assert vector_query.k_nearest_neighbors == 50 and kwargs["top"] == 50
+    assert "pdf_vector" in kwargs["select"] and not warnings
+
+
+def test_rerank_with_compression_oversamples(monkeypatch, warnings):
+    kwargs, vector_query = build(monkeypatch, "rerank", stored=False, compression="scalar", rescore=True,
+                                 oversampling=4.0)
+
+    assert vector_query.oversampling == 10.0  # 50 aday / top_k 5
+    assert "pdf_vector" not in kwargs["select"] and not warnings
+
+
+@pytest.mark.parametrize("compression, rescore", [("none", True), ("scalar", False)])
+def test_rerank_without_vectors_or_rescoring_warns(monkeypatch, warnings, compression, rescore):
+    kwargs, vector_query = build(monkeypatch, "rerank", stored=False, compression=compression, rescore=rescore)
+
+    assert vector_query.oversampling is None and kwargs["top"] == 5
+    assert len(warnings) == 1 and "approximate" in warnings[0]
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import numpy as np
+
+import config
+
+
+class SemanticAnswerCache:
+    """
+    A bounded cache of generated chat answers looked up by question similarity.
+
+    Each entry stores the normalized question embedding, the IDs of the documents retrieved for it
+    and the generated answer. A new question reuses an answer when its cosine similarity to a cached
+    question is above the threshold and the retrieval returned the same document set, so the answer
+    is still grounded in the same context. Embeddings live in one preallocated float32 matrix, so a
+    lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, similarity_threshold=None, max_entries=None, ttl_seconds=None,
+                 dimension=config.EMBEDDING_DIMENSION):
+        """
+        Args:
+            similarity_threshold (float, optional): Minimum cosine similarity for a hit.
+                Defaults to config.SEMANTIC_CACHE_CONFIG["similarity_threshold"].
+            max_entries (int, optional): Maximum number of answers. Defaults to config.SEMANTIC_CACHE_CONFIG["max_entries"].
+            ttl_seconds (float, optional): Lifetime of an answer. Defaults to config.SEMANTIC_CACHE_CONFIG["ttl_seconds"].
+            dimension (int, optional): Embedding dimension. Defaults to config.EMBEDDING_DIMENSION.
+        """
+        cache_config = config.SEMANTIC_CACHE_CONFIG
+        self.similarity_threshold = (similarity_threshold if similarity_threshold is not None
+                                     else cache_config["similarity_threshold"])
+        self.max_entries = max_entries if max_entries is not None else cache_config["max_entries"]
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else cache_config["ttl_seconds"]
+        self.index_version = None
+        self.hits = 0
+        self.misses = 0
+
+        self._vectors = np.zeros((self.max_entries, dimension), dtype=np.float32)
+        self._entries = [None] * self.max_entries  # (doc_ids, answer, expires_at, last_used)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, question_embedding, doc_ids):
+        """
+        Returns a cached answer for a similar question with the same retrieved documents, or None.
+
+        Args:
+            question_embedding (list or numpy.ndarray): The question embedding.
+            doc_ids (iterable): IDs of the documents retrieved for the question.
+
+        Returns:
+            str or None: The cached answer.
+        """
+        query = self._normalize(question_embedding)
+        doc_ids = frozenset(doc_ids)
+        now = time.time()
+
+        with self._lock:
+            similarities = self._vectors @ query
+            # En benzer sorudan başlayarak eşik üzerindeki adaylar denenir
+            for slot in np.argsort(-similarities):
+                if similarities[slot] < self.similarity_threshold:
+                    break
+                entry = self._entries[slot]
+                if entry is None or entry[2] <= now or entry[0] != doc_ids:
+                    continue
+                self._entries[slot] = (entry[0], entry[1], entry[2], now)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, question_embedding, doc_ids, answer):
+        """
+        Stores an answer, evicting an expired or the least recently used entry when full.
+
+        Args:
+            question_embedding (list or numpy.ndarray): The question embedding.
+            doc_ids (iterable): IDs of the documents the answer was generated from.
+            answer (str): The generated answer.
+        """
+        now = time.time()
+        with self._lock:
+            slot = self._free_slot(now)
+            self._vectors[slot] = self._normalize(question_embedding)
+            self._entries[slot] = (frozenset(doc_ids), answer, now + self.ttl_seconds, now)
+
+    def invalidate(self, index_version=None):
+        """
+        Drops every cached answer, e.g. after the search index changed.
+
+        Args:
+            index_version (optional): The index version the cache is valid for from now on.
+        """
+        with self._lock:
+            self._vectors[:] = 0
+            self._entries = [None] * self.max_entries
+            self.index_version = index_version
+
+    def stats(self):
+        """
+        Returns the size and hit/miss counters of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": sum(entry is not None for entry in self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _free_slot(self, now):
+        # Boş ya da süresi dolmuş bir yer yoksa en uzun süredir kullanılmayan kayıt silinir
+        oldest_slot, oldest_used = 0, None
+        for slot, entry in enumerate(self._entries):
+            if entry is None or entry[2] <= now:
+                return slot
+            if oldest_used is None or entry[3] < oldest_used:
+                oldest_slot, oldest_used = slot, entry[3]
+        return oldest_slot
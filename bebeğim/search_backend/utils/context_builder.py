@@ -0,0 +1,104 @@
+import re
+
+import config
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+
+
+class ContextBuilder:
+    """
+    Assembles the document context of a chat prompt within a token budget.
+
+    Retrieved pages are ranked by similarity score, pages whose content largely overlaps with an
+    already selected page are dropped, and the page that no longer fits completely is truncated at a
+    sentence boundary. Tokens are counted with the configured tiktoken encoding.
+    """
+
+    def __init__(self, max_tokens=None, dedup_threshold=None, min_page_tokens=None):
+        """
+        Args:
+            max_tokens (int, optional): Token budget of the context. Defaults to config.CONTEXT_CONFIG["max_tokens"].
+            dedup_threshold (float, optional): Share of a page's word shingles that may already be present in
+                the context before the page is dropped. Defaults to config.CONTEXT_CONFIG["dedup_threshold"].
+            min_page_tokens (int, optional): A truncated page shorter than this is left out.
+                Defaults to config.CONTEXT_CONFIG["min_page_tokens"].
+        """
+        self.max_tokens = max_tokens if max_tokens is not None else config.CONTEXT_CONFIG["max_tokens"]
+        self.dedup_threshold = (dedup_threshold if dedup_threshold is not None
+                                else config.CONTEXT_CONFIG["dedup_threshold"])
+        self.min_page_tokens = (min_page_tokens if min_page_tokens is not None
+                                else config.CONTEXT_CONFIG["min_page_tokens"])
+
+    @staticmethod
+    def count_tokens(text):
+        return len(config.encoding.encode(text))
+
+    @staticmethod
+    def _shingles(text, size=5):
+        words = re.findall(r"\w+", text.casefold())
+        if len(words) < size:
+            return {tuple(words)} if words else set()
+        return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+    def build(self, search_results):
+        """
+        Builds the context text from the search results.
+
+        Args:
+            search_results (list): Results of AISearcher.search_similar_pdf_pages.
+
+        Returns:
+            tuple: (context, tokens_used, used_results) where used_results are the pages included in the context.
+        """
+        ranked = sorted(search_results, key=lambda result: result.get("similarity_score", 0), reverse=True)
+
+        sections, used_results = [], []
+        seen_shingles = set()
+        tokens_used = 0
+        separator_tokens = self.count_tokens("\n\n")
+
+        for result in ranked:
+            content = result.get("content") or ""
+            shingles = self._shingles(content)
+            # Büyük ölçüde daha önce eklenmiş bir sayfayla örtüşen içerik atlanır
+            if shingles and len(shingles & seen_shingles) / len(shingles) >= self.dedup_threshold:
+                continue
+
+            header = f"PDF: {result['pdf_name']} - Sayfa {result['page_number']}\n"
+            remaining = self.max_tokens - tokens_used - (separator_tokens if sections else 0)
+            header_tokens = self.count_tokens(header)
+            if remaining - header_tokens < self.min_page_tokens:
+                break
+
+            content_tokens = self.count_tokens(content)
+            if header_tokens + content_tokens > remaining:
+                content = self._truncate(content, remaining - header_tokens)
+                content_tokens = self.count_tokens(content)
+                if content_tokens < self.min_page_tokens:
+                    break
+
+            if sections:
+                tokens_used += separator_tokens
+            sections.append(header + content)
+            used_results.append(result)
+            seen_shingles |= shingles
+            tokens_used += header_tokens + content_tokens
+
+        return "\n\n".join(sections), tokens_used, used_results
+
+    def _truncate(self, text, max_tokens):
+        """
+        Truncates text to at most max_tokens, cutting at the last sentence boundary that fits.
+        """
+        kept, tokens = [], 0
+        for sentence in SENTENCE_BOUNDARY.split(text):
+            sentence_tokens = self.count_tokens(sentence) + (1 if kept else 0)
+            if tokens + sentence_tokens > max_tokens:
+                break
+            kept.append(sentence)
+            tokens += sentence_tokens
+
+        if kept:
+            return " ".join(kept)
+        # Tek bir cümle bile sığmıyorsa jeton sınırında kesilir
+        return config.encoding.decode(config.encoding.encode(text)[:max_tokens])
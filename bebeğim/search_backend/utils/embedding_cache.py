@@ -0,0 +1,221 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import config
+from utils.vectors import VECTOR_DTYPES, dequantize, quantize, to_vector
+
+
+def normalize_question(question):
+    """
+    Normalizes a question so that near-identical spellings share a cache entry.
+
+    Applies Unicode NFKC normalization, case folding, whitespace collapsing and strips
+    surrounding punctuation.
+
+    Args:
+        question (str): The raw question text.
+
+    Returns:
+        str: The normalized question.
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" \t\n?!.,;:")
+
+
+class QueryEmbeddingCache:
+    """
+    An in-process LRU cache with TTL for question embeddings.
+
+    Embeddings are kept as float32 NumPy arrays (about 6 KB per 1536-dimensional vector instead of
+    the ~50 KB of a Python list of floats), or scalar quantized to float16 or int8 when dtype is set.
+    An optional SQLite file acts as a shared second level so that several uvicorn workers on the same
+    host can reuse each other's entries.
+    """
+
+    def __init__(self, max_entries=None, ttl_seconds=None, shared_path=None, dtype=None):
+        """
+        Args:
+            max_entries (int, optional): Maximum number of in-process entries.
+                Defaults to config.QUERY_EMBEDDING_CACHE_CONFIG["max_entries"].
+            ttl_seconds (float, optional): Lifetime of an entry. Defaults to config.QUERY_EMBEDDING_CACHE_CONFIG["ttl_seconds"].
+            shared_path (str, optional): SQLite file shared between workers.
+                Defaults to config.QUERY_EMBEDDING_CACHE_CONFIG["shared_path"]; None disables the shared level.
+            dtype (str, optional): Storage format of the entries in both levels, "float32", "float16" or "int8".
+                Defaults to config.QUERY_EMBEDDING_CACHE_CONFIG["dtype"].
+        """
+        cache_config = config.QUERY_EMBEDDING_CACHE_CONFIG
+        self.max_entries = max_entries if max_entries is not None else cache_config["max_entries"]
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else cache_config["ttl_seconds"]
+        self.shared_path = shared_path if shared_path is not None else cache_config["shared_path"]
+        self.dtype = dtype or cache_config["dtype"]
+        if self.dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype: {self.dtype}")
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_lock = threading.Lock()
+        self._shared = None
+
+        if self.shared_path:
+            self._shared = sqlite3.connect(self.shared_path, check_same_thread=False, timeout=5)
+            self._shared.execute("PRAGMA journal_mode=WAL")
+            self._shared.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._shared.commit()
+
+    @staticmethod
+    def make_key(question):
+        """
+        Builds the cache key of a question for the configured embedding deployment.
+        """
+        return f"{config.ADA_CONFIG['deployment_name']}:{normalize_question(question)}"
+
+    def get(self, question):
+        """
+        Returns the cached embedding of a question from the in-process level, or None.
+
+        Returns:
+            numpy.ndarray or None: The float32 embedding.
+        """
+        key = self.make_key(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._decode(value)
+                del self._entries[key]
+        return None
+
+    def set(self, question, embedding):
+        """
+        Stores the embedding of a question in the in-process level.
+
+        Returns:
+            numpy.ndarray: The stored float32 embedding.
+        """
+        vector = to_vector(embedding)
+        self._put(self.make_key(question), self._encode(vector), time.time() + self.ttl_seconds)
+        return vector
+
+    async def aget(self, question):
+        """
+        Looks a question up in the in-process level and then in the shared level.
+
+        Returns:
+            numpy.ndarray or None: The float32 embedding.
+        """
+        vector = self.get(question)
+        if vector is not None:
+            return vector
+
+        if self._shared is not None:
+            key = self.make_key(question)
+            row = await asyncio.to_thread(self._shared_get, key)
+            if row is not None:
+                try:
+                    vector = dequantize(row[0])
+                except ValueError as e:
+                    config.app_logger.error(f"Error decoding shared embedding cache entry: {str(e)}")
+                    vector = None
+            if vector is not None:
+                self._put(key, self._encode(vector), row[1])
+                with self._lock:
+                    self.shared_hits += 1
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def aset(self, question, embedding):
+        """
+        Stores the embedding of a question in both levels.
+
+        Returns:
+            numpy.ndarray: The stored float32 embedding.
+        """
+        vector = to_vector(embedding)
+        expires_at = time.time() + self.ttl_seconds
+        key = self.make_key(question)
+        value = self._encode(vector)
+        self._put(key, value, expires_at)
+        if self._shared is not None:
+            await asyncio.to_thread(self._shared_set, key, value if isinstance(value, bytes) else value.tobytes(),
+                                    expires_at)
+        return vector
+
+    def stats(self):
+        """
+        Returns hit/miss counters and memory usage of the in-process level.
+
+        Returns:
+            dict: entries, hits, shared_hits, misses, hit_rate and memory_bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            memory_bytes = sum((len(value) if isinstance(value, bytes) else value.nbytes) + len(key)
+                               for key, (value, _) in self._entries.items())
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                "memory_bytes": memory_bytes
+            }
+
+    def close(self):
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _encode(self, vector):
+        # float32 girdiler dizi olarak saklanır, böylece önbellek isabetinde kopya gerekmez
+        return vector if self.dtype == "float32" else quantize(vector, self.dtype)
+
+    @staticmethod
+    def _decode(value):
+        return dequantize(value) if isinstance(value, bytes) else value
+
+    def _put(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _shared_get(self, key):
+        try:
+            with self._shared_lock:
+                return self._shared.execute(
+                    "SELECT vector, expires_at FROM query_embeddings WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            config.app_logger.error(f"Error reading shared embedding cache: {str(e)}")
+            return None
+
+    def _shared_set(self, key, vector_bytes, expires_at):
+        try:
+            with self._shared_lock:
+                self._shared.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, vector, expires_at) VALUES (?, ?, ?)",
+                    (key, vector_bytes, expires_at)
+                )
+                self._shared.execute("DELETE FROM query_embeddings WHERE expires_at <= ?", (time.time(),))
+                self._shared.commit()
+        except sqlite3.Error as e:
+            config.app_logger.error(f"Error writing shared embedding cache: {str(e)}")
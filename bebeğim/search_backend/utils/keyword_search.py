@@ -0,0 +1,116 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+import numpy as np
+
+import config
+
+# Türkçe'de "I" küçük harfte "ı", "İ" ise "i" olur
+TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text, prefix_length=None):
+    """
+    Splits text into Turkish-aware search terms.
+
+    Text is NFC normalized and lowercased with the Turkish dotted/dotless i rules. Alphabetic words are
+    cut to their first prefix_length characters, a simple stemmer that works well for agglutinative
+    Turkish ("faturanızın" and "faturalar" both become "fatur"); words containing digits, such as
+    product codes, are kept whole so they only match exactly.
+
+    Args:
+        text (str): The text to tokenize.
+        prefix_length (int, optional): Stem length. Defaults to config.HYBRID_SEARCH_CONFIG["prefix_length"].
+
+    Returns:
+        list: The terms of the text.
+    """
+    prefix_length = prefix_length or config.HYBRID_SEARCH_CONFIG["prefix_length"]
+    text = unicodedata.normalize("NFC", text).translate(TURKISH_LOWER).lower()
+    return [word if any(char.isdigit() for char in word) else word[:prefix_length]
+            for word in WORD_PATTERN.findall(text)]
+
+
+def reciprocal_rank_fusion(rankings, weights=None, k=None):
+    """
+    Fuses ranked lists with weighted reciprocal rank fusion: score(d) = sum_i w_i / (k + rank_i(d)).
+
+    Args:
+        rankings (list): Ranked lists of document keys, best first.
+        weights (list, optional): Weight of each list. Defaults to 1.0 for every list.
+        k (int, optional): Rank constant. Defaults to config.HYBRID_SEARCH_CONFIG["rrf_k"].
+
+    Returns:
+        list: (key, fused score) tuples, best first.
+    """
+    k = k if k is not None else config.HYBRID_SEARCH_CONFIG["rrf_k"]
+    weights = weights or [1.0] * len(rankings)
+    scores = defaultdict(float)
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """
+    An in-memory Okapi BM25 index over the page contents of the local vector store.
+
+    Postings are kept per term as NumPy arrays of rows and term frequencies, so a query accumulates
+    the scores of its terms with a few vectorized operations.
+    """
+
+    def __init__(self, texts, k1=1.2, b=0.75):
+        """
+        Args:
+            texts (list): Text of every document; the position is the document row.
+            k1 (float, optional): Term frequency saturation. Defaults to 1.2.
+            b (float, optional): Length normalization. Defaults to 0.75.
+        """
+        self.count = len(texts)
+        self.k1 = k1
+        self.b = b
+        self.lengths = np.zeros(self.count, dtype=np.float32)
+
+        postings = defaultdict(lambda: ([], []))
+        for row, text in enumerate(texts):
+            terms = Counter(tokenize(text or ""))
+            self.lengths[row] = sum(terms.values())
+            for term, frequency in terms.items():
+                rows, frequencies = postings[term]
+                rows.append(row)
+                frequencies.append(frequency)
+
+        self.average_length = float(self.lengths.mean()) if self.count else 0.0
+        self.postings = {
+            term: (np.asarray(rows, dtype=np.int64), np.asarray(frequencies, dtype=np.float32))
+            for term, (rows, frequencies) in postings.items()
+        }
+
+    def search(self, query, top_k=10):
+        """
+        Returns the rows and BM25 scores of the best matching documents.
+
+        Args:
+            query (str): The query text.
+            top_k (int, optional): The number of documents to return. Defaults to 10.
+
+        Returns:
+            tuple: (rows, scores) as NumPy arrays, best first; documents without a matching term are left out.
+        """
+        scores = np.zeros(self.count, dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * self.lengths / max(self.average_length, 1e-9))
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            rows, frequencies = self.postings[term]
+            idf = np.log(1 + (self.count - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + length_norm[rows])
+
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return matched, scores[matched]
+        top = matched[np.argsort(-scores[matched])[:top_k]]
+        return top, scores[top]
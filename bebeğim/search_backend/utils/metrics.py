@@ -0,0 +1,92 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Gömme ve arama için milisaniyeler, tamamlama için onlarca saniye
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+STAGE_LATENCY = Histogram(
+    "search_stage_duration_seconds",
+    "Latency of the stages of a request: query_embed, vector_search, prompt_build and completion.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+TOKENS = Counter(
+    "search_tokens_total",
+    "Tokens sent to (in) and received from (out) OpenAI per stage.",
+    ["stage", "direction"]
+)
+CACHE_LOOKUPS = Counter(
+    "search_cache_lookups_total",
+    "Cache lookups per cache (query_embedding, answer) and result (hit, miss).",
+    ["cache", "result"]
+)
+
+
+@contextmanager
+def track(stage):
+    """
+    Measures the duration of the enclosed block as one observation of the stage, also when it raises.
+
+    Works in synchronous and asynchronous code alike:
+
+        with track("vector_search"):
+            results = await ai_searcher.asearch_similar_pdf_pages(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def count_tokens(stage, tokens_in=0, tokens_out=0):
+    """
+    Adds prompt (in) and generated (out) tokens to the counters of a stage.
+    """
+    if tokens_in:
+        TOKENS.labels(stage, "in").inc(tokens_in)
+    if tokens_out:
+        TOKENS.labels(stage, "out").inc(tokens_out)
+
+
+def count_usage(stage, response):
+    """
+    Adds the token usage reported in an OpenAI response to the counters of a stage.
+    """
+    usage = response.get("usage") or {}
+    count_tokens(stage, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+
+def count_cache(cache, hit):
+    """
+    Counts a cache lookup as a hit or a miss.
+    """
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render_metrics():
+    """
+    Renders the metrics in the Prometheus text format.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (uvicorn with several workers), the values of all worker
+    processes are aggregated from that directory; otherwise the metrics of this process are returned.
+
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,5 +1,8 @@
 import openai
 import config
+from utils.metrics import count_tokens, count_usage
+
+ERROR_RESPONSE = "Üzgünüm, bir hata oluştu."
 
 
 class OpenAIClient:
@@ -126,7 +129,71 @@ class OpenAIClient:
                 max_tokens=2000,  # İhtiyaca göre ayarlayın
                 temperature=0.7,  # Yaratıcılığı kontrol eder
             )
+            count_usage("completion", response)
+            return response['choices'][0]['message']['content']
+        except Exception as e:
+            config.app_logger.error(f"Error generating response: {str(e)}")
+            return ERROR_RESPONSE
+
+    async def agenerate_response(self, system_message, user_message):
+        """
+        Asynchronous variant of generate_response that does not block the event loop.
+
+        Args:
+            system_message (str): The system-level instruction.
+            user_message (str): The user's input message.
+
+        Returns:
+            str: The generated response from GPT-4.
+        """
+        try:
+            response = await openai.ChatCompletion.acreate(
+                engine=self.engine,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=2000,  # İhtiyaca göre ayarlayın
+                temperature=0.7,  # Yaratıcılığı kontrol eder
+            )
+            count_usage("completion", response)
             return response['choices'][0]['message']['content']
         except Exception as e:
             config.app_logger.error(f"Error generating response: {str(e)}")
-            return "Üzgünüm, bir hata oluştu."
+            return ERROR_RESPONSE
+
+    async def astream_response(self, system_message, user_message):
+        """
+        Streams a response from GPT-4 chunk by chunk as it is generated.
+
+        Args:
+            system_message (str): The system-level instruction.
+            user_message (str): The user's input message.
+
+        Yields:
+            str: The next piece of generated text.
+        """
+        response = await openai.ChatCompletion.acreate(
+            engine=self.engine,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ],
+            max_tokens=2000,  # İhtiyaca göre ayarlayın
+            temperature=0.7,  # Yaratıcılığı kontrol eder
+            stream=True,
+        )
+        # Akışta kullanım bilgisi gelmez; jetonlar yerel olarak sayılır
+        generated = []
+        try:
+            async for chunk in response:
+                # Azure ilk parçada yalnızca içerik filtresi sonuçlarını gönderebilir
+                if not chunk['choices']:
+                    continue
+                content = chunk['choices'][0].get('delta', {}).get('content')
+                if content:
+                    generated.append(content)
+                    yield content
+        finally:
+            count_tokens("completion", len(config.encoding.encode(system_message + user_message)),
+                         len(config.encoding.encode("".join(generated))))
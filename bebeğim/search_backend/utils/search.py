@@ -1,7 +1,16 @@
+import asyncio
+
+import numpy as np
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
 import config
+from utils.keyword_search import reciprocal_rank_fusion
+from utils.vectors import to_list
+from utils.vector_store import LocalVectorStore, SEARCH_MODES, cosine_to_score
+
+HYBRID_MODE = "hybrid"
 
 class AISearcher:
     """
@@ -9,22 +18,53 @@ class AISearcher:
 
     This class connects to an Azure Cognitive Search index containing PDF page embeddings and provides
     functionality to search for the most similar PDF pages based on a provided question embedding vector.
+    With the "local" backend the same searches are served by an in-process LocalVectorStore loaded from
+    an export of the index (see export_index.py), without any request to Azure.
+
+    Every search runs in one of three modes: "exact" scans all pages, "approximate" uses the HNSW index
+    and "rerank" takes rerank_candidates pages from the HNSW index and rescores them exactly against the
+    question using their stored vectors; on an index with compressed, non-retrievable vectors (see
+    config.VECTOR_INDEX_CONFIG) the service rescores oversampled candidates instead. The "hybrid" mode
+    additionally ranks the pages by BM25 keyword relevance of the question text and fuses both rankings
+    with reciprocal rank fusion, so exact term and product code matches are not lost to embedding
+    similarity.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None):
         """
         Initializes the AISearcher by setting up the Azure SearchClient.
 
         The SearchClient is configured using the endpoint, index name, and API key provided
         in the configuration.
+
+        Args:
+            backend (str, optional): "azure" or "local". Defaults to config.SEARCH_BACKEND.
         """
+        self.backend = backend or config.SEARCH_BACKEND
+        self.local_store = None
+        if self.backend == "local":
+            self.local_store = LocalVectorStore()
+            if config.SEARCH_MODE_CONFIG["default_mode"] != "exact":
+                self.local_store.ensure_approximate_index()
+            self.search_client = None
+            self.async_search_client = None
+            return
+        if self.backend != "azure":
+            raise ValueError(f"Unknown search backend: {self.backend}")
+
         self.search_client = SearchClient(
             endpoint=config.COGNITIVE_SEARCH_CONFIG["endpoint"],
             index_name=config.COGNITIVE_SEARCH_CONFIG["index_name"],
             credential=AzureKeyCredential(config.COGNITIVE_SEARCH_CONFIG["api_key"])
         )
+        # Async istemci tek bir bağlantı havuzunu tüm isteklerle paylaşır
+        self.async_search_client = AsyncSearchClient(
+            endpoint=config.COGNITIVE_SEARCH_CONFIG["endpoint"],
+            index_name=config.COGNITIVE_SEARCH_CONFIG["index_name"],
+            credential=AzureKeyCredential(config.COGNITIVE_SEARCH_CONFIG["api_key"])
+        )
 
-    def search_similar_pdf_pages(self, question_embedding, top_k=10):
+    def search_similar_pdf_pages(self, question_embedding, top_k=10, mode=None, question=None):
         """
         Searches for the most similar PDF pages based on the provided question embedding.
 
@@ -32,43 +72,206 @@ class AISearcher:
         It retrieves the top_k PDF pages that are closest to the provided question embedding vector.
 
         Args:
-            question_embedding (list): The embedding vector for the question text.
+            question_embedding (numpy.ndarray): The embedding vector for the question text.
             top_k (int, optional): The number of top similar PDF pages to return. Defaults to 10.
+            mode (str, optional): "exact", "approximate", "rerank" or "hybrid". Defaults to config.SEARCH_MODE_CONFIG["default_mode"].
+            question (str, optional): The question text, required by the "hybrid" mode.
 
         Returns:
             list: A list of dictionaries, each containing the PDF name, page number, content, and similarity score.
                   Returns an empty list if an error occurs during the search.
         """
+        mode = self._resolve_mode(mode, question)
         try:
-            # Create a VectorizedQuery to search for similar vectors in the "pdf_vector" field
-            vector_query = VectorizedQuery(
-                vector=question_embedding,
-                k_nearest_neighbors=top_k,
-                fields="pdf_vector",
-                exhaustive=True  # Set to True for exact nearest neighbor search
-            )
+            if self.local_store is not None:
+                if mode == HYBRID_MODE:
+                    candidates = max(top_k, config.HYBRID_SEARCH_CONFIG["candidates"])
+                    return self._fuse(self.local_store.search(question_embedding, candidates, "exact"),
+                                      self.local_store.keyword_search(question, candidates), top_k)
+                return self.local_store.search(question_embedding, top_k, mode)
 
             # Perform the search on the indexed PDF page vectors
             search_results = self.search_client.search(
-                search_text="*",  # Wildcard to include all documents, prioritize vector search
-                vector_queries=[vector_query],
-                select=["pdf_name", "page_number", "content"],  # Include pdf_name, page_number, and content in the results
-                top=top_k
+                **self._build_search_kwargs(question_embedding, top_k, mode, question)
             )
 
             # Process the search results and compile the top PDF pages with their similarity scores
-            results = []
-            for result in search_results:
-                results.append({
-                    "pdf_name": result["pdf_name"],
-                    "page_number": result["page_number"],
-                    "content": result.get("content", "N/A"),  # Default to "N/A" if content is missing
-                    "similarity_score": result["@search.score"]  # Retrieve the similarity score from the search metadata
-                })
-
-            return results
+            return self._collect_results(question_embedding, list(search_results), top_k, mode)
 
         except Exception as e:
             # Log any exceptions that occur during the search process
             config.app_logger.error(f"Error during search for similar PDF pages: {str(e)}")
             return []
+
+    async def asearch_similar_pdf_pages(self, question_embedding, top_k=10, mode=None, question=None):
+        """
+        Asynchronous variant of search_similar_pdf_pages that does not block the event loop.
+
+        Args:
+            question_embedding (numpy.ndarray): The embedding vector for the question text.
+            top_k (int, optional): The number of top similar PDF pages to return. Defaults to 10.
+            mode (str, optional): "exact", "approximate", "rerank" or "hybrid". Defaults to config.SEARCH_MODE_CONFIG["default_mode"].
+            question (str, optional): The question text, required by the "hybrid" mode.
+
+        Returns:
+            list: A list of dictionaries, each containing the PDF name, page number, content, and similarity score.
+                  Returns an empty list if an error occurs during the search.
+        """
+        mode = self._resolve_mode(mode, question)
+        try:
+            if self.local_store is not None:
+                # NumPy matris çarpımı GIL'i bıraktığından arama bir iş parçacığında yapılır
+                if mode == HYBRID_MODE:
+                    # Vektör ve anahtar kelime aramaları eşzamanlı çalışır
+                    candidates = max(top_k, config.HYBRID_SEARCH_CONFIG["candidates"])
+                    vector_results, keyword_results = await asyncio.gather(
+                        asyncio.to_thread(self.local_store.search, question_embedding, candidates, "exact"),
+                        asyncio.to_thread(self.local_store.keyword_search, question, candidates)
+                    )
+                    return self._fuse(vector_results, keyword_results, top_k)
+                return await asyncio.to_thread(self.local_store.search, question_embedding, top_k, mode)
+
+            search_results = await self.async_search_client.search(
+                **self._build_search_kwargs(question_embedding, top_k, mode, question)
+            )
+            results = [result async for result in search_results]
+            return self._collect_results(question_embedding, results, top_k, mode)
+        except Exception as e:
+            config.app_logger.error(f"Error during search for similar PDF pages: {str(e)}")
+            return []
+
+    async def aget_document_count(self):
+        """
+        Returns the number of documents in the index, used to detect index changes.
+
+        Returns:
+            int or None: The document count, or None if it could not be retrieved.
+        """
+        try:
+            if self.local_store is not None:
+                return len(self.local_store)
+            return await self.async_search_client.get_document_count()
+        except Exception as e:
+            config.app_logger.error(f"Error retrieving document count: {str(e)}")
+            return None
+
+    async def aclose(self):
+        """
+        Closes the connection pool of the asynchronous search client.
+        """
+        if self.async_search_client is not None:
+            await self.async_search_client.close()
+
+    @staticmethod
+    def _resolve_mode(mode, question):
+        mode = mode or config.SEARCH_MODE_CONFIG["default_mode"]
+        if mode == HYBRID_MODE and not question:
+            config.app_logger.warning("Hybrid search needs the question text, falling back to exact vector search")
+            return "exact"
+        return mode
+
+    @staticmethod
+    def _build_search_kwargs(question_embedding, top_k, mode="exact", question=None):
+        """
+        Builds the vector search request shared by the synchronous and asynchronous search methods.
+        """
+        if mode == HYBRID_MODE:
+            # Azure AI Search metin ve vektör sorgularını aynı istekte çalıştırıp RRF ile birleştirir
+            hybrid_config = config.HYBRID_SEARCH_CONFIG
+            vector_query = VectorizedQuery(
+                vector=to_list(question_embedding),
+                k_nearest_neighbors=max(top_k, hybrid_config["candidates"]),
+                fields="pdf_vector",
+                exhaustive=True,
+                weight=hybrid_config["vector_weight"] / hybrid_config["keyword_weight"]
+            )
+            return {
+                "search_text": question,
+                "search_fields": ["content", "pdf_name"],
+                "vector_queries": [vector_query],
+                "select": ["id", "pdf_name", "page_number", "content"],
+                "top": top_k
+            }
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        vector_config = config.VECTOR_INDEX_CONFIG
+        candidates = max(top_k, config.SEARCH_MODE_CONFIG["rerank_candidates"])
+        oversampling = None
+        k = top_k
+        select = ["id", "pdf_name", "page_number", "content"]  # Include id, pdf_name, page_number, and content in the results
+        if mode == "rerank" and vector_config["stored"]:
+            # Yeniden sıralama modunda HNSW'den daha fazla aday ve vektörleri istenir
+            k = candidates
+            select.append("pdf_vector")
+        elif mode == "rerank" and vector_config["compression"] != "none" and vector_config["rescore"]:
+            # Vektörler döndürülemiyorsa adaylar servis tarafında tam hassasiyetli vektörlerle yeniden puanlanır
+            oversampling = max(vector_config["oversampling"], candidates / top_k)
+        elif mode == "rerank":
+            # Vektörler döndürülemiyor ve servis yeniden puanlamıyor; sonuçlar yeniden sıralanmamış olur
+            config.app_logger.warning("Rerank mode needs stored vectors or compression with rescoring "
+                                      "(VECTOR_STORED, VECTOR_COMPRESSION, VECTOR_RESCORE); "
+                                      "running a plain approximate search")
+
+        # Create a VectorizedQuery to search for similar vectors in the "pdf_vector" field
+        vector_query = VectorizedQuery(
+            vector=to_list(question_embedding),
+            k_nearest_neighbors=k,
+            fields="pdf_vector",
+            exhaustive=mode == "exact",  # True for exact nearest neighbor search, False to use the HNSW index
+            oversampling=oversampling
+        )
+        return {
+            "search_text": "*",  # Wildcard to include all documents, prioritize vector search
+            "vector_queries": [vector_query],
+            "select": select,
+            "top": k
+        }
+
+    @staticmethod
+    def _fuse(vector_results, keyword_results, top_k):
+        """
+        Fuses the vector and keyword rankings of the local backend; the fused RRF score becomes the similarity score.
+        """
+        hybrid_config = config.HYBRID_SEARCH_CONFIG
+        results_by_key, rankings = {}, []
+        for results in (vector_results, keyword_results):
+            ranking = []
+            for result in results:
+                key = result["id"] or (result["pdf_name"], result["page_number"])
+                results_by_key.setdefault(key, result)
+                ranking.append(key)
+            rankings.append(ranking)
+
+        fused = reciprocal_rank_fusion(rankings, [hybrid_config["vector_weight"], hybrid_config["keyword_weight"]])
+        return [{**results_by_key[key], "similarity_score": score} for key, score in fused[:top_k]]
+
+    @classmethod
+    def _collect_results(cls, question_embedding, results, top_k, mode):
+        """
+        Formats the raw search results; in "rerank" mode the candidates are rescored exactly and cut to top_k.
+        """
+        if mode != "rerank" or not results or "pdf_vector" not in results[0]:
+            return [cls._format_result(result) for result in results]
+
+        query = np.asarray(question_embedding, dtype=np.float32)
+        vectors = np.asarray([result["pdf_vector"] for result in results], dtype=np.float32)
+        similarities = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query) + 1e-12)
+        reranked = []
+        for position in np.argsort(-similarities)[:top_k]:
+            result = cls._format_result(results[position])
+            result["similarity_score"] = cosine_to_score(float(similarities[position]))
+            reranked.append(result)
+        return reranked
+
+    @staticmethod
+    def _format_result(result):
+        """
+        Converts a raw search result into the dictionary returned by the search methods.
+        """
+        return {
+            "id": result.get("id"),
+            "pdf_name": result["pdf_name"],
+            "page_number": result["page_number"],
+            "content": result.get("content", "N/A"),  # Default to "N/A" if content is missing
+            "similarity_score": result["@search.score"]  # Retrieve the similarity score from the search metadata
+        }
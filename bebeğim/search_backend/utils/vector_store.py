@@ -0,0 +1,365 @@
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+import config
+from utils.keyword_search import BM25Index
+from utils.vectors import VECTOR_DTYPES, quantize_int8, to_vector
+
+try:
+    import hnswlib
+except ImportError:  # HNSW modu isteğe bağlıdır
+    hnswlib = None
+
+VECTORS_FILE = "vectors.f32"
+SCALES_FILE = "scales.f32"  # int8 depolarında satır başına ölçek
+DOCUMENTS_FILE = "documents.jsonl"
+META_FILE = "meta.json"
+IVF_FILE = "ivf.npz"
+HNSW_FILE = "hnsw.bin"
+
+SEARCH_MODES = ("exact", "approximate", "rerank")
+APPROXIMATE_INDEXES = ("ivf", "hnsw")
+
+
+def cosine_to_score(similarity):
+    """
+    Converts a cosine similarity into the @search.score scale of Azure AI Search (1 / (1 + cosine distance)),
+    so scores from both retrieval backends are comparable.
+    """
+    return 1.0 / (2.0 - similarity)
+
+
+class LocalVectorStore:
+    """
+    An in-process vector store loaded from an export of the search index.
+
+    Normalized embeddings are kept in a memory-mapped matrix, so loading is instant and the operating
+    system shares the pages between worker processes. The matrix is float32, or float16 or int8 (with
+    one float32 scale per row) when the store was written with a quantized dtype, which halves or
+    quarters its memory. Exact search is a single matrix-vector product over all pages. Approximate
+    search uses an "ivf" index, which only scores the pages of the clusters closest to the question,
+    or an hnswlib graph ("hnsw") when the package is installed; the approximate index is built on
+    first use and saved next to the store.
+    """
+
+    def __init__(self, directory=None, approximate_index=None):
+        """
+        Args:
+            directory (str, optional): Directory written by LocalVectorStore.write.
+                Defaults to config.LOCAL_VECTOR_STORE_CONFIG["path"].
+            approximate_index (str, optional): "ivf" or "hnsw".
+                Defaults to config.LOCAL_VECTOR_STORE_CONFIG["approximate_index"].
+        """
+        store_config = config.LOCAL_VECTOR_STORE_CONFIG
+        self.directory = directory or store_config["path"]
+        self.approximate_index = approximate_index or store_config["approximate_index"]
+        if self.approximate_index not in APPROXIMATE_INDEXES:
+            raise ValueError(f"Unknown approximate index: {self.approximate_index}")
+        self.ef_search = config.HNSW_CONFIG["ef_search"]
+        self.ivf_probes = store_config["ivf_probes"]
+
+        with open(os.path.join(self.directory, META_FILE), "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.dimension = meta["dimension"]
+        self.count = meta["count"]
+        self.dtype = meta.get("dtype", "float32")  # dtype'ı olmayan eski depolar float32'dir
+
+        self.vectors = (np.memmap(os.path.join(self.directory, VECTORS_FILE), dtype=self.dtype, mode="r",
+                                  shape=(self.count, self.dimension))
+                        if self.count else np.zeros((0, self.dimension), dtype=self.dtype))
+        self.scales = None
+        if self.dtype == "int8":
+            self.scales = (np.memmap(os.path.join(self.directory, SCALES_FILE), dtype=np.float32, mode="r",
+                                     shape=(self.count,))
+                           if self.count else np.zeros(0, dtype=np.float32))
+        with open(os.path.join(self.directory, DOCUMENTS_FILE), "r", encoding="utf-8") as documents_file:
+            self.documents = [json.loads(line) for line in documents_file if line.strip()]
+
+        self._ivf = None
+        self._hnsw = None
+        self._keyword_index = None
+        self._lock = threading.Lock()
+
+        if self.approximate_index == "hnsw" and hnswlib is None:
+            config.app_logger.warning("hnswlib is not installed, using the IVF index for approximate search")
+            self.approximate_index = "ivf"
+
+        config.app_logger.info(f"Loaded local vector store with {self.count} pages")
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _normalize(vector):
+        vector = to_vector(vector)
+        norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+        return vector / np.where(norm == 0, 1, norm)
+
+    @classmethod
+    def write(cls, directory, documents, dimension=config.EMBEDDING_DIMENSION, dtype=None):
+        """
+        Writes documents of the search index into a vector store directory.
+
+        The files are written next to the existing ones and swapped in at the end, so a running
+        server never reads a half-written store.
+
+        Args:
+            directory (str): Target directory.
+            documents (iterable): Dictionaries with id, pdf_name, page_number, content and pdf_vector.
+            dimension (int, optional): Embedding dimension. Defaults to config.EMBEDDING_DIMENSION.
+            dtype (str, optional): Storage format of the vectors, "float32", "float16" or "int8".
+                Defaults to config.LOCAL_VECTOR_STORE_CONFIG["dtype"].
+
+        Returns:
+            int: The number of written documents.
+        """
+        dtype = dtype or config.LOCAL_VECTOR_STORE_CONFIG["dtype"]
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype: {dtype}")
+        os.makedirs(directory, exist_ok=True)
+        count = 0
+        with open(os.path.join(directory, VECTORS_FILE + ".tmp"), "wb") as vectors_file, \
+                open(os.path.join(directory, SCALES_FILE + ".tmp"), "wb") as scales_file, \
+                open(os.path.join(directory, DOCUMENTS_FILE + ".tmp"), "w", encoding="utf-8") as documents_file:
+            for document in documents:
+                vector = cls._normalize(document["pdf_vector"])
+                if vector.shape != (dimension,):
+                    config.app_logger.error(f"Skipping document {document.get('id')} with invalid vector shape {vector.shape}")
+                    continue
+                if dtype == "int8":
+                    scale, vector = quantize_int8(vector)
+                    scales_file.write(scale.tobytes())
+                vectors_file.write(vector.astype(dtype).tobytes())
+                documents_file.write(json.dumps({
+                    "id": document.get("id"),
+                    "pdf_name": document["pdf_name"],
+                    "page_number": document["page_number"],
+                    "content": document.get("content", "N/A")
+                }, ensure_ascii=False) + "\n")
+                count += 1
+
+        with open(os.path.join(directory, META_FILE + ".tmp"), "w", encoding="utf-8") as meta_file:
+            json.dump({"dimension": dimension, "count": count, "dtype": dtype}, meta_file)
+
+        for name in (VECTORS_FILE, SCALES_FILE, DOCUMENTS_FILE, META_FILE):
+            os.replace(os.path.join(directory, name + ".tmp"), os.path.join(directory, name))
+        # Eski yaklaşık arama indeksleri yeni veriyle uyumsuzdur
+        for name in (IVF_FILE, HNSW_FILE):
+            if os.path.exists(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+        return count
+
+    def ensure_approximate_index(self):
+        """
+        Loads or builds the approximate index, so the first approximate query does not pay for it.
+        """
+        with self._lock:
+            if not self.count or self._ivf is not None or self._hnsw is not None:
+                return
+            if self.approximate_index == "hnsw":
+                self._hnsw = self._load_or_build_hnsw()
+            else:
+                self._ivf = self._load_or_build_ivf()
+
+    def search(self, question_embedding, top_k=10, mode="exact", rerank_candidates=None):
+        """
+        Returns the top_k pages most similar to the question embedding.
+
+        Args:
+            question_embedding (list or numpy.ndarray): The embedding vector for the question text.
+            top_k (int, optional): The number of pages to return. Defaults to 10.
+            mode (str, optional): "exact" scores every page, "approximate" uses the approximate index and
+                "rerank" takes rerank_candidates pages from the approximate index and rescores them exactly.
+                Defaults to "exact".
+            rerank_candidates (int, optional): Candidates of the "rerank" mode.
+                Defaults to config.SEARCH_MODE_CONFIG["rerank_candidates"].
+
+        Returns:
+            list: Dictionaries with id, pdf_name, page_number, content and similarity_score, best first.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        if not self.count or top_k <= 0:
+            return []
+        query = self._normalize(question_embedding)
+
+        if mode == "exact":
+            rows, similarities = self._top_k(self._similarities(query), top_k)
+        else:
+            self.ensure_approximate_index()
+            if mode == "rerank":
+                candidates = max(top_k, rerank_candidates or config.SEARCH_MODE_CONFIG["rerank_candidates"])
+                rows, _ = self._approximate_search(query, candidates)
+                rows = np.sort(rows)  # memmap'ten sıralı okuma
+                top, similarities = self._top_k(self.vectors_at(rows) @ query, top_k)
+                rows = rows[top]
+            else:
+                rows, similarities = self._approximate_search(query, top_k)
+
+        return [self._format_result(int(row), float(similarity)) for row, similarity in zip(rows, similarities)]
+
+    def keyword_search(self, question, top_k=10):
+        """
+        Returns the top_k pages ranked by BM25 keyword relevance to the question.
+
+        The keyword index is built from the page contents on first use.
+
+        Args:
+            question (str): The question text.
+            top_k (int, optional): The number of pages to return. Defaults to 10.
+
+        Returns:
+            list: Dictionaries with id, pdf_name, page_number, content and the BM25 score as similarity_score.
+        """
+        with self._lock:
+            if self._keyword_index is None:
+                self._keyword_index = BM25Index([document.get("content") for document in self.documents])
+        rows, scores = self._keyword_index.search(question, top_k)
+        results = []
+        for row, score in zip(rows, scores):
+            result = self._format_result(int(row), 0.0)
+            result["similarity_score"] = float(score)
+            results.append(result)
+        return results
+
+    def vectors_at(self, rows):
+        """
+        Returns the normalized vectors of the given rows as float32, dequantizing quantized stores.
+
+        Args:
+            rows (int, slice or numpy.ndarray): Row index, slice or array of row indexes.
+
+        Returns:
+            numpy.ndarray: The float32 vector or matrix.
+        """
+        vectors = np.asarray(self.vectors[rows], dtype=np.float32)
+        if self.scales is not None:
+            vectors *= np.asarray(self.scales[rows])[..., None]
+        return vectors
+
+    def _similarities(self, query):
+        """
+        Returns the similarity of the query to every page.
+        """
+        if self.dtype == "float32":
+            return self.vectors @ query
+        # Nicelenmiş matris, belleği şişirmemek için parça parça float32'ye açılır
+        similarities = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, 4096):
+            similarities[start:start + 4096] = self.vectors_at(slice(start, start + 4096)) @ query
+        return similarities
+
+    @staticmethod
+    def _top_k(similarities, k):
+        """
+        Returns the positions and values of the k largest similarities, best first.
+        """
+        k = min(k, len(similarities))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), similarities[:0]
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return top, similarities[top]
+
+    def _approximate_search(self, query, k):
+        """
+        Returns the rows and similarities of the approximate k nearest pages, best first.
+        """
+        if self._hnsw is not None:
+            k = min(k, self.count)
+            with self._lock:
+                self._hnsw.set_ef(max(self.ef_search, k))
+                labels, distances = self._hnsw.knn_query(query, k=k)
+            return labels[0].astype(np.int64), 1.0 - distances[0]
+
+        candidates = self._ivf_candidates(query)
+        top, similarities = self._top_k(self.vectors_at(candidates) @ query, k)
+        return candidates[top], similarities
+
+    def _format_result(self, row, similarity):
+        document = self.documents[row]
+        return {
+            "id": document.get("id"),
+            "pdf_name": document["pdf_name"],
+            "page_number": document["page_number"],
+            "content": document.get("content", "N/A"),
+            "similarity_score": cosine_to_score(similarity)
+        }
+
+    def _ivf_candidates(self, query):
+        """
+        Returns the rows of the ivf_probes clusters whose centroids are closest to the query.
+        """
+        centroids, offsets, rows = self._ivf
+        probes = min(self.ivf_probes, len(centroids))
+        nearest = np.argpartition(-(centroids @ query), probes - 1)[:probes]
+        return np.concatenate([rows[offsets[cluster]:offsets[cluster + 1]] for cluster in nearest])
+
+    def _load_or_build_ivf(self):
+        """
+        Loads the cluster assignment of the store, building it with k-means if it is missing or stale.
+
+        Returns:
+            tuple: (centroids, offsets, rows) where the rows of cluster c are rows[offsets[c]:offsets[c + 1]].
+        """
+        path = os.path.join(self.directory, IVF_FILE)
+        lists = config.LOCAL_VECTOR_STORE_CONFIG["ivf_lists"] or int(math.sqrt(self.count))
+        lists = max(1, min(lists, self.count))
+
+        if os.path.exists(path):
+            data = np.load(path)
+            if int(data["count"]) == self.count and len(data["centroids"]) == lists:
+                return data["centroids"], data["offsets"], data["rows"]
+
+        config.app_logger.info(f"Building IVF index with {lists} clusters for {self.count} pages")
+        rng = np.random.default_rng(0)
+        sample_size = min(self.count, lists * 256)
+        sample = self.vectors_at(np.sort(rng.choice(self.count, sample_size, replace=False)))
+        centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+
+        # Küresel k-means: örnek üzerinde birkaç tur, ardından tüm satırlar en yakın merkeze atanır
+        for _ in range(10):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroids[cluster] = self._normalize(members.sum(axis=0))
+
+        assignment = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, 65536):
+            assignment[start:start + 65536] = np.argmax(self.vectors_at(slice(start, start + 65536)) @ centroids.T, axis=1)
+
+        rows = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))]).astype(np.int64)
+        np.savez(path, count=self.count, centroids=centroids, offsets=offsets, rows=rows)
+        return centroids, offsets, rows
+
+    def _load_or_build_hnsw(self):
+        """
+        Loads the hnswlib graph of the store, building it if it is missing or stale.
+        """
+        hnsw_config = config.HNSW_CONFIG
+        path = os.path.join(self.directory, HNSW_FILE)
+        index = hnswlib.Index(space="ip", dim=self.dimension)
+
+        if os.path.exists(path):
+            try:
+                index.load_index(path)
+                if index.get_current_count() == self.count:
+                    return index
+            except RuntimeError as e:
+                config.app_logger.error(f"Error loading HNSW index, rebuilding: {str(e)}")
+            index = hnswlib.Index(space="ip", dim=self.dimension)
+
+        config.app_logger.info(f"Building HNSW index for {self.count} pages")
+        index.init_index(max_elements=self.count, M=hnsw_config["m"],
+                         ef_construction=hnsw_config["ef_construction"])
+        for start in range(0, self.count, 65536):
+            end = min(start + 65536, self.count)
+            index.add_items(self.vectors_at(slice(start, end)), np.arange(start, end))
+        index.save_index(path)
+        return index
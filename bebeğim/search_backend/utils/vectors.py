@@ -0,0 +1,92 @@
+import numpy as np
+
+import config
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# JSON'da bir float32 değerinin kapladığı ortalama bayt (ör. "-0.012345678", ile)
+JSON_BYTES_PER_VALUE = 21
+
+
+def to_vector(embedding):
+    """
+    Converts an embedding (a list from the OpenAI API or an array) into a float32 NumPy array.
+
+    A 1,536-dimensional float32 array takes about 6 KB, while a list of Python floats takes about 50 KB.
+
+    Args:
+        embedding (list or numpy.ndarray): The embedding.
+
+    Returns:
+        numpy.ndarray: The float32 vector.
+    """
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def to_list(vector):
+    """
+    Converts a vector into a list of Python floats. Only used at the Azure SDK boundary, which
+    serializes documents and queries as JSON.
+    """
+    return vector.tolist() if isinstance(vector, np.ndarray) else list(vector)
+
+
+def quantize(vector, dtype="float32"):
+    """
+    Encodes a vector into bytes with optional scalar quantization.
+
+    float16 halves the size with a relative error of about 1e-3; int8 stores a float32 scale followed by
+    one signed byte per value (symmetric quantization, about a quarter of the float32 size).
+
+    Args:
+        vector (list or numpy.ndarray): The vector.
+        dtype (str, optional): "float32", "float16" or "int8". Defaults to "float32".
+
+    Returns:
+        bytes: The encoded vector.
+    """
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(f"Unknown vector dtype: {dtype}")
+    vector = to_vector(vector)
+    if dtype == "int8":
+        scale, values = quantize_int8(vector)
+        return np.float32(scale).tobytes() + values.tobytes()
+    return vector.astype(dtype).tobytes()
+
+
+def quantize_int8(vectors):
+    """
+    Symmetric int8 quantization of a vector or of every row of a matrix.
+
+    Args:
+        vectors (numpy.ndarray): A float32 vector or matrix.
+
+    Returns:
+        tuple: (scales, values) where vectors ~= values * scales[..., None]; scales is a float32 scalar
+               for a vector and a float32 array with one scale per row for a matrix.
+    """
+    scales = np.abs(vectors).max(axis=-1) / 127
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    values = np.clip(np.rint(vectors / scales[..., None]), -127, 127).astype(np.int8)
+    return scales, values
+
+
+def dequantize(data, dimension=config.EMBEDDING_DIMENSION):
+    """
+    Decodes bytes written by quantize into a float32 vector; the encoding is recognized by its length.
+
+    Args:
+        data (bytes): The encoded vector.
+        dimension (int, optional): The vector dimension. Defaults to config.EMBEDDING_DIMENSION.
+
+    Returns:
+        numpy.ndarray: The float32 vector.
+    """
+    if len(data) == 4 * dimension:
+        return np.frombuffer(data, dtype=np.float32).copy()
+    if len(data) == 2 * dimension:
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
+    if len(data) == dimension + 4:
+        scale = np.frombuffer(data[:4], dtype=np.float32)[0]
+        return np.frombuffer(data[4:], dtype=np.int8).astype(np.float32) * scale
+    raise ValueError(f"Cannot decode a {len(data)} byte vector of dimension {dimension}")